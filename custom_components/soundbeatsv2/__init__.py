@@ -7,13 +7,41 @@ from homeassistant.components import frontend
 from homeassistant.components.http import StaticPathConfig
 from homeassistant.components.websocket_api import async_register_command
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import ATTR_ENTITY_ID, Platform
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError, Unauthorized, UnknownUser
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN, CONF_MEDIA_PLAYER
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_MEDIA_CONTENT_ID,
+    ATTR_SAMPLES,
+    CALIBRATION_SAMPLES,
+    DOMAIN,
+    CONF_LOCAL_SNIPPETS,
+    CONF_MEDIA_PLAYER,
+    CONF_PLAYBACK_TIMEOUT,
+    CONF_SNIPPET_CACHE_SIZE,
+    DEFAULT_LOCAL_SNIPPETS,
+    DEFAULT_PLAYBACK_TIMEOUT,
+    DEFAULT_SNIPPET_CACHE_SIZE,
+    MAX_CALIBRATION_SAMPLES,
+    SERVICE_CALIBRATE_MEDIA_PLAYER,
+)
 from .game_manager import GameManager
+from .latency import LatencyProfiles
+from .media_controller import MediaController
+from .media_mirror import MediaMirror
+from .multiroom import MediaGroup, media_player_ids
+from .scoring import ScoringRules
+from .snippets import SnippetStore
+from .storage import storage_backend
 from .websocket_api import (
     websocket_get_game_state,
     websocket_new_game,
@@ -23,7 +51,14 @@ from .websocket_api import (
     websocket_update_team_name,
     websocket_get_highscores,
     websocket_assign_user_to_team,
+    websocket_round_stats,
+    websocket_leaderboard,
+    websocket_storage_benchmark,
+    websocket_export_history,
+    websocket_media_control,
+    websocket_auto_advance,
 )
+from .views import SoundbeatsHighscoresView, SoundbeatsSnippetView
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,12 +67,21 @@ PLATFORMS: list[Platform] = []
 CONFIG_SCHEMA = vol.Schema(
     {
         DOMAIN: vol.Schema({
-            vol.Optional(CONF_MEDIA_PLAYER): cv.entity_id,
+            vol.Optional(CONF_MEDIA_PLAYER): cv.entity_ids,
         })
     },
     extra=vol.ALLOW_EXTRA,
 )
 
+CALIBRATE_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    vol.Optional(ATTR_ENTITY_ID): cv.entity_id,
+    vol.Required(ATTR_MEDIA_CONTENT_ID): cv.string,
+    vol.Optional(ATTR_SAMPLES, default=CALIBRATION_SAMPLES): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=MAX_CALIBRATION_SAMPLES)
+    ),
+})
+
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the Soundbeats component."""
@@ -63,6 +107,67 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     async_register_command(hass, websocket_update_team_name)
     async_register_command(hass, websocket_get_highscores)
     async_register_command(hass, websocket_assign_user_to_team)
+    async_register_command(hass, websocket_round_stats)
+    async_register_command(hass, websocket_leaderboard)
+    async_register_command(hass, websocket_storage_benchmark)
+    async_register_command(hass, websocket_export_history)
+    async_register_command(hass, websocket_media_control)
+    async_register_command(hass, websocket_auto_advance)
+    
+    # Register HTTP views
+    hass.http.register_view(SoundbeatsHighscoresView())
+    hass.http.register_view(SoundbeatsSnippetView())
+    
+    async def async_calibrate_media_player(call: ServiceCall) -> ServiceResponse:
+        """Measure the media player's latency and store its profile.
+        
+        Admin-only, checked the way ``async_register_admin_service`` does;
+        that helper can't register a service returning a response.
+        """
+        if call.context.user_id:
+            user = await hass.auth.async_get_user(call.context.user_id)
+            if user is None:
+                raise UnknownUser(context=call.context)
+            if not user.is_admin:
+                raise Unauthorized(context=call.context)
+        
+        config_entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+        if not config_entry_id:
+            entries = hass.config_entries.async_entries(DOMAIN)
+            if not entries:
+                raise HomeAssistantError("No Soundbeats integration configured")
+            config_entry_id = entries[0].entry_id
+        
+        entry_data = hass.data[DOMAIN].get(config_entry_id)
+        if not entry_data:
+            raise HomeAssistantError("Configuration entry not found")
+        if not entry_data["media_controller"]:
+            raise HomeAssistantError("No media player configured")
+        
+        # Calibrating takes the player over for a while
+        game_manager: GameManager = entry_data["game_manager"]
+        if game_manager.round_active or game_manager.auto_advance:
+            raise HomeAssistantError("Can't calibrate while rounds are being played")
+        
+        # Calibrates the first media player unless another one is named
+        entity_id = call.data.get(ATTR_ENTITY_ID, entry_data["media_player"])
+        media_controller = entry_data["media_controllers"].get(entity_id)
+        if not media_controller:
+            raise HomeAssistantError(f"{entity_id} is not one of the game's media players")
+        
+        profile = await media_controller.async_calibrate(
+            call.data[ATTR_MEDIA_CONTENT_ID], call.data[ATTR_SAMPLES]
+        )
+        await entry_data["latency_profiles"].async_save_profile(profile)
+        return profile
+    
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CALIBRATE_MEDIA_PLAYER,
+        async_calibrate_media_player,
+        schema=CALIBRATE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
     
     return True
 
@@ -74,14 +179,60 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Initialize game manager
     game_manager = GameManager(hass, entry)
     
+    # One media controller per player and entry so auto-pause and queued
+    # commands survive between requests; several players play as a group.
+    # The first player's state is mirrored to the panel
+    media_players = _media_players(entry)
+    media_player = media_players[0] if media_players else None
+    media_controllers = {
+        entity_id: MediaController(
+            hass,
+            entity_id,
+            entry.options.get(CONF_PLAYBACK_TIMEOUT, DEFAULT_PLAYBACK_TIMEOUT),
+        )
+        for entity_id in media_players
+    }
+    media_controller = media_mirror = None
+    latency_profiles = LatencyProfiles(hass, f"{DOMAIN}.{entry.entry_id}")
+    if len(media_controllers) > 1:
+        media_controller = MediaGroup(hass, list(media_controllers.values()))
+    elif media_player:
+        media_controller = media_controllers[media_player]
+    if media_player:
+        media_mirror = MediaMirror(hass, media_player)
+        media_mirror.async_start()
+        entry.async_on_unload(media_mirror.async_stop)
+        entry.async_create_background_task(
+            hass,
+            _async_load_latency_profiles(latency_profiles, media_controllers),
+            f"{DOMAIN}_load_latency_{entry.entry_id}",
+        )
+    
+    # Optional local snippets for players that accept direct URLs
+    snippet_store = None
+    if entry.options.get(CONF_LOCAL_SNIPPETS, DEFAULT_LOCAL_SNIPPETS):
+        snippet_store = SnippetStore(hass, entry.entry_id, _snippet_cache_bytes(entry))
+        entry.async_create_background_task(
+            hass, snippet_store.async_setup(), f"{DOMAIN}_snippets_{entry.entry_id}"
+        )
+    
     # Store in hass data
     hass.data[DOMAIN][entry.entry_id] = {
         "game_manager": game_manager,
-        "media_player": entry.data.get(CONF_MEDIA_PLAYER),
+        "media_player": media_player,
+        "media_players": media_players,
+        "media_controller": media_controller,
+        "media_controllers": media_controllers,
+        "media_mirror": media_mirror,
+        "latency_profiles": latency_profiles,
+        "snippet_store": snippet_store,
     }
     
-    # Load stored state
-    await game_manager.load_state()
+    # Load stored state in the background so startup does not wait on it;
+    # websocket commands wait for it to finish
+    entry.async_create_background_task(
+        hass, game_manager.load_state(), f"{DOMAIN}_load_state_{entry.entry_id}"
+    )
     
     # Register custom panel with web component
     frontend.async_register_built_in_panel(
@@ -105,11 +256,74 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Set up platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     
+    # Apply option changes such as a new scoring profile
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+    
     _LOGGER.info("Soundbeats panel registered successfully")
     
     return True
 
 
+def _media_players(entry: ConfigEntry) -> list[str]:
+    """Get the entry's media players; the options flow can change them."""
+    return media_player_ids(
+        entry.options.get(CONF_MEDIA_PLAYER, entry.data.get(CONF_MEDIA_PLAYER))
+    )
+
+
+def _snippet_cache_bytes(entry: ConfigEntry) -> int:
+    """Get the snippet store's size limit in bytes."""
+    return int(
+        entry.options.get(CONF_SNIPPET_CACHE_SIZE, DEFAULT_SNIPPET_CACHE_SIZE) * 1024 * 1024
+    )
+
+
+async def _async_load_latency_profiles(
+    latency_profiles: LatencyProfiles,
+    media_controllers: dict[str, MediaController],
+) -> None:
+    """Hand each media player's calibrated profile to its controller."""
+    await latency_profiles.async_load()
+    for entity_id, media_controller in media_controllers.items():
+        media_controller.latency_profile = latency_profiles.get(entity_id)
+
+
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Handle options update."""
+    game_manager: GameManager = hass.data[DOMAIN][entry.entry_id]["game_manager"]
+    
+    # Switching storage backends needs a fresh game manager, and other
+    # media players new controllers
+    if (
+        storage_backend(entry.options) != game_manager.storage_backend
+        or _media_players(entry) != hass.data[DOMAIN][entry.entry_id]["media_players"]
+    ):
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    
+    # Turning local snippets on or off needs a reload too
+    snippet_store = hass.data[DOMAIN][entry.entry_id]["snippet_store"]
+    if (snippet_store is not None) != entry.options.get(
+        CONF_LOCAL_SNIPPETS, DEFAULT_LOCAL_SNIPPETS
+    ):
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    
+    media_controller = hass.data[DOMAIN][entry.entry_id]["media_controller"]
+    if media_controller:
+        media_controller.playback_timeout = entry.options.get(
+            CONF_PLAYBACK_TIMEOUT, DEFAULT_PLAYBACK_TIMEOUT
+        )
+    if snippet_store:
+        snippet_store.max_bytes = _snippet_cache_bytes(entry)
+    
+    # Re-scoring history runs in the executor; keep it off the options flow
+    hass.async_create_background_task(
+        game_manager.async_set_scoring_rules(ScoringRules.from_options(entry.options)),
+        f"{DOMAIN}_rescore_{entry.entry_id}",
+    )
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     _LOGGER.debug("Unloading Soundbeats config entry: %s", entry.entry_id)
@@ -117,6 +331,14 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Save state before unloading
     game_manager = hass.data[DOMAIN][entry.entry_id]["game_manager"]
     await game_manager.save_state()
+    await game_manager.async_close()
+    
+    if snippet_store := hass.data[DOMAIN][entry.entry_id]["snippet_store"]:
+        await snippet_store.async_close()
+    
+    # Drop queued media commands and any pending auto-pause
+    if media_controller := hass.data[DOMAIN][entry.entry_id]["media_controller"]:
+        await media_controller.async_shutdown()
     
     # Remove panel
     frontend.async_remove_panel(hass, "soundbeatsv2")
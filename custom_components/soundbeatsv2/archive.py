@@ -0,0 +1,255 @@
+"""Archive of completed Soundbeats games."""
+from __future__ import annotations
+
+import json
+import logging
+import lzma
+import os
+import struct
+import zlib
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import STORAGE_DIR
+from homeassistant.util import dt as dt_util
+from homeassistant.util.file import write_utf8_file_atomic
+
+from .codec import json_bytes, json_loads
+from .const import (
+    ARCHIVE_COMPRESSION_LZMA,
+    ARCHIVE_COMPRESSION_ZLIB,
+    ARCHIVE_MAX_AGE_DAYS,
+    ARCHIVE_MAX_GAMES,
+    ARCHIVE_SEGMENT_BYTES,
+    DEFAULT_ARCHIVE_COMPRESSION,
+)
+from .storage import in_period, parse_timestamp
+
+_LOGGER = logging.getLogger(__name__)
+
+INDEX_FILE = "index.json"
+SEGMENT_PREFIX = "segment-"
+
+# Record header: big-endian length of the compressed payload
+RECORD_HEADER = struct.Struct(">I")
+
+# File suffix, compressor and decompressor per compression format
+CODECS: Dict[str, Tuple[str, Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    ARCHIVE_COMPRESSION_ZLIB: (".zz", partial(zlib.compress, level=9), zlib.decompress),
+    ARCHIVE_COMPRESSION_LZMA: (".xz", lzma.compress, lzma.decompress),
+}
+
+
+def _winner(state: Dict[str, Any]) -> Optional[str]:
+    """Get the name of the highest-scoring team."""
+    if not state["teams"]:
+        return None
+    return max(state["teams"], key=lambda team: team["score"])["name"]
+
+
+def _decompressor(segment: str) -> Callable[[bytes], bytes]:
+    """Get the decompressor matching a segment's suffix."""
+    for suffix, _, decompress in CODECS.values():
+        if segment.endswith(suffix):
+            return decompress
+    raise ValueError(f"Unknown archive segment format: {segment}")
+
+
+class GameArchive:
+    """Keeps finished games in compressed, append-only segment files.
+    
+    Each game is compressed on its own and appended to the newest segment as
+    a length-prefixed record, so one game can be read back without touching
+    the rest. A new segment starts once the current one reaches
+    ``ARCHIVE_SEGMENT_BYTES``. A JSON index holds one row per game with its
+    ID, date, playlist, winner and record location. Retention drops the
+    oldest games from the index and deletes segments no game refers to.
+    All file I/O and compression runs in the executor.
+    """
+    
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        key: str,
+        compression: str = DEFAULT_ARCHIVE_COMPRESSION,
+        max_games: int = ARCHIVE_MAX_GAMES,
+        max_age_days: int = ARCHIVE_MAX_AGE_DAYS,
+    ) -> None:
+        """Initialize the archive."""
+        self.hass = hass
+        self.directory = hass.config.path(STORAGE_DIR, f"{key}.archive")
+        self.compression = compression
+        self.max_games = max_games
+        self.max_age_days = max_age_days
+        self._index: List[Dict[str, Any]] = []
+    
+    @property
+    def index_path(self) -> str:
+        """Get the path of the index file."""
+        return os.path.join(self.directory, INDEX_FILE)
+    
+    async def async_setup(self) -> None:
+        """Load the index."""
+        self._index = await self.hass.async_add_executor_job(self._load_index)
+    
+    async def async_archive(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Compress a finished game into the archive and index it."""
+        row = {
+            "game_id": state["game_id"],
+            "date": state["created_at"],
+            "archived_at": dt_util.now().isoformat(),
+            "playlist_id": state["playlist_id"],
+            "winner": _winner(state),
+            "teams": [team["name"] for team in state["teams"]],
+            "rounds": len(state["rounds_played"]),
+        }
+        # The executor job works on its own copy of the index
+        self._index = await self.hass.async_add_executor_job(
+            self._archive, list(self._index), state, row
+        )
+        _LOGGER.debug("Archived game %s (%d bytes)", row["game_id"], row["length"])
+        return row
+    
+    async def async_replace(self, state: Dict[str, Any]) -> None:
+        """Store a new version of an archived game, such as after re-scoring.
+        
+        The new record is appended and the game's index row pointed at it;
+        the old record is left behind until its segment is removed.
+        """
+        self._index = await self.hass.async_add_executor_job(
+            self._replace, list(self._index), state
+        )
+    
+    async def async_load_game(self, game_id: str) -> Optional[Dict[str, Any]]:
+        """Load an archived game."""
+        for row in self._index:
+            if row["game_id"] == game_id:
+                return await self.async_read(row)
+        return None
+    
+    async def async_read(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Load the game an index row points to."""
+        return await self.hass.async_add_executor_job(self._read, row)
+    
+    async def async_iter_games(self, **filters: Any) -> AsyncIterator[Dict[str, Any]]:
+        """Yield archived games matching the filters, newest first."""
+        for row in self.games(**filters):
+            yield await self.async_read(row)
+    
+    def games(
+        self,
+        playlist_id: Optional[str] = None,
+        team_name: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get index rows matching the filters, newest game first."""
+        rows = sorted(
+            (
+                row for row in reversed(self._index)
+                if (playlist_id is None or row["playlist_id"] == playlist_id)
+                and (team_name is None or team_name in row["teams"])
+                and in_period(row["date"], since, until)
+            ),
+            key=lambda row: parse_timestamp(row["date"]),
+            reverse=True,
+        )
+        return rows if limit is None else rows[:limit]
+    
+    def _load_index(self) -> List[Dict[str, Any]]:
+        """Read the index (executor)."""
+        if not os.path.exists(self.index_path):
+            return []
+        with open(self.index_path, encoding="utf-8") as file:
+            return json.load(file)
+    
+    def _archive(
+        self,
+        index: List[Dict[str, Any]],
+        state: Dict[str, Any],
+        row: Dict[str, Any],
+    ) -> List[Dict[str, Any]]:
+        """Append a game record and apply retention (executor)."""
+        self._append(state, row)
+        index = self._apply_retention([*index, row])
+        write_utf8_file_atomic(self.index_path, json.dumps(index))
+        self._remove_unused_segments(index)
+        return index
+    
+    def _replace(
+        self, index: List[Dict[str, Any]], state: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Append a game's new record and update its index row (executor)."""
+        for position, row in enumerate(index):
+            if row["game_id"] == state["game_id"]:
+                row = {**row, "winner": _winner(state)}
+                self._append(state, row)
+                index[position] = row
+                break
+        else:
+            return index
+        
+        write_utf8_file_atomic(self.index_path, json.dumps(index))
+        self._remove_unused_segments(index)
+        return index
+    
+    def _append(self, state: Dict[str, Any], row: Dict[str, Any]) -> None:
+        """Compress a game into the current segment and record where it went."""
+        os.makedirs(self.directory, exist_ok=True)
+        suffix, compress, _ = CODECS[self.compression]
+        payload = compress(json_bytes(state))
+        
+        segment = self._current_segment(suffix)
+        path = os.path.join(self.directory, segment)
+        with open(path, "ab") as file:
+            row["segment"] = segment
+            row["offset"] = file.tell()
+            row["length"] = len(payload)
+            file.write(RECORD_HEADER.pack(len(payload)) + payload)
+    
+    def _segments(self) -> List[str]:
+        """List segment files, oldest first."""
+        return sorted(
+            name for name in os.listdir(self.directory)
+            if name.startswith(SEGMENT_PREFIX)
+        )
+    
+    def _current_segment(self, suffix: str) -> str:
+        """Get the segment to append to, rotating when it is full."""
+        segments = self._segments()
+        if segments:
+            latest = segments[-1]
+            size = os.path.getsize(os.path.join(self.directory, latest))
+            if latest.endswith(suffix) and size < ARCHIVE_SEGMENT_BYTES:
+                return latest
+            number = int(latest[len(SEGMENT_PREFIX):].split(".")[0]) + 1
+        else:
+            number = 1
+        return f"{SEGMENT_PREFIX}{number:05d}{suffix}"
+    
+    def _apply_retention(self, index: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop games beyond the count and age limits."""
+        cutoff = dt_util.now() - timedelta(days=self.max_age_days)
+        index = [
+            row for row in index
+            if datetime.fromisoformat(row["archived_at"]) >= cutoff
+        ]
+        return index[-self.max_games:] if self.max_games else []
+    
+    def _remove_unused_segments(self, index: List[Dict[str, Any]]) -> None:
+        """Delete segments no index row refers to, except the newest."""
+        used = {row["segment"] for row in index}
+        for segment in self._segments()[:-1]:
+            if segment not in used:
+                os.remove(os.path.join(self.directory, segment))
+    
+    def _read(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Read and decompress one game record (executor)."""
+        with open(os.path.join(self.directory, row["segment"]), "rb") as file:
+            file.seek(row["offset"])
+            (length,) = RECORD_HEADER.unpack(file.read(RECORD_HEADER.size))
+            payload = file.read(length)
+        return json_loads(_decompressor(row["segment"])(payload))
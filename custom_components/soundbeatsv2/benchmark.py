@@ -0,0 +1,68 @@
+"""Storage backend benchmark for Soundbeats."""
+from __future__ import annotations
+
+import time
+from statistics import median
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from homeassistant.core import HomeAssistant
+
+from .storage import create_backend
+
+# Game state, finished round, its highscore entries and the full highscores
+BenchmarkUpdate = Tuple[
+    Dict[str, Any], Dict[str, Any], List[Dict[str, Any]], Dict[str, Any]
+]
+
+
+async def async_benchmark_backend(
+    hass: HomeAssistant,
+    kind: str,
+    key: str,
+    state: Dict[str, Any],
+    highscores: Optional[Dict[str, Any]],
+    updates: Sequence[BenchmarkUpdate],
+) -> Dict[str, Any]:
+    """Measure save latency, load time and disk usage of one backend.
+    
+    The backend is seeded with the snapshot, then each update is saved the
+    way the game manager saves a finished round. Save latency is the median
+    over the updates; load time covers opening a fresh backend and loading
+    the snapshot. Everything written is removed afterwards.
+    """
+    backend = create_backend(hass, kind, key)
+    reloaded = backend
+    try:
+        await backend.async_setup()
+        await backend.async_save_snapshot(state, highscores)
+        
+        timings = []
+        for update_state, round_data, entries, update_highscores in updates:
+            start = time.perf_counter()
+            if backend.incremental:
+                await backend.async_append_round(update_state["game_id"], round_data, entries)
+                await backend.async_save_game(update_state)
+            else:
+                await backend.async_save_snapshot(update_state, update_highscores)
+            timings.append(time.perf_counter() - start)
+        disk_bytes = await backend.async_disk_usage()
+        
+        # Backends without files can only be reloaded in place
+        if backend.paths:
+            await backend.async_close()
+            reloaded = create_backend(hass, kind, key)
+        start = time.perf_counter()
+        await reloaded.async_setup()
+        await reloaded.async_load_snapshot()
+        load_time = time.perf_counter() - start
+    finally:
+        await reloaded.async_remove()
+        await reloaded.async_close()
+    
+    return {
+        "backend": kind,
+        "rounds": len(state["rounds_played"]),
+        "save_ms": round(median(timings) * 1000, 3) if timings else None,
+        "load_ms": round(load_time * 1000, 3),
+        "disk_bytes": disk_bytes,
+    }
@@ -0,0 +1,81 @@
+"""Song catalog for Soundbeats."""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import random
+from typing import Any, Collection, Dict, List, Optional
+
+from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+# The song and playlist lists the panel ships with
+SONGS_PATH = os.path.join(os.path.dirname(__file__), "frontend", "src", "data", "songs.json")
+PLAYLISTS_PATH = os.path.join(
+    os.path.dirname(__file__), "frontend", "src", "data", "playlists.json"
+)
+
+DEFAULT_PLAYLIST = "default"
+
+
+class SongCatalog:
+    """Picks round songs from the panel's song list.
+    
+    The lists are read in the executor on first use and kept in memory.
+    Songs are picked the same way the panel picks them: at random from the
+    playlist, or from every song for the default or an unknown playlist,
+    skipping songs already played this game.
+    """
+    
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        path: str = SONGS_PATH,
+        playlists_path: str = PLAYLISTS_PATH,
+    ) -> None:
+        """Initialize the catalog."""
+        self.hass = hass
+        self.path = path
+        self.playlists_path = playlists_path
+        self._songs: Optional[List[Dict[str, Any]]] = None
+        self._playlists: Optional[Dict[str, Dict[str, Any]]] = None
+    
+    async def async_songs(self) -> List[Dict[str, Any]]:
+        """Get all songs, loading them on first use."""
+        if self._songs is None:
+            self._songs = await self.hass.async_add_executor_job(self._load, self.path, [])
+        return self._songs
+    
+    async def async_playlists(self) -> Dict[str, Dict[str, Any]]:
+        """Get the playlists by ID, loading them on first use."""
+        if self._playlists is None:
+            self._playlists = await self.hass.async_add_executor_job(
+                self._load, self.playlists_path, {}
+            )
+        return self._playlists
+    
+    async def async_pick(
+        self, playlist_id: str, played_song_ids: Collection[Any] = ()
+    ) -> Optional[Dict[str, Any]]:
+        """Pick a random song from a playlist that has not been played yet."""
+        played = set(played_song_ids)
+        all_songs = playlist_id == DEFAULT_PLAYLIST or (
+            playlist_id not in await self.async_playlists()
+        )
+        songs = [
+            song for song in await self.async_songs()
+            if song["id"] not in played
+            and (all_songs or playlist_id in song.get("playlist_ids", ()))
+        ]
+        return random.choice(songs) if songs else None
+    
+    def _load(self, path: str, default: Any) -> Any:
+        """Read a song or playlist list (executor)."""
+        try:
+            with open(path, encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError) as err:
+            _LOGGER.error("Error loading song catalog %s: %s", path, err)
+            return default
@@ -12,13 +12,45 @@ from homeassistant.helpers import selector
 from homeassistant.helpers.entity_registry import async_entries_for_config_entry, async_get
 
 from .const import (
+    CONF_LOCAL_SNIPPETS,
     CONF_MEDIA_PLAYER,
+    CONF_PLAYBACK_TIMEOUT,
+    CONF_REVEAL_SECONDS,
+    CONF_POINTS_EXACT_WITH_BET,
+    CONF_POINTS_EXACT_YEAR,
+    CONF_POINTS_WITHIN_3_YEARS,
+    CONF_POINTS_WITHIN_5_YEARS,
+    CONF_POINTS_WRONG_WITH_BET,
+    CONF_SCORING_PROFILE,
+    CONF_SNIPPET_CACHE_SIZE,
+    CONF_STORAGE_BACKEND,
+    CONF_TIMER_ON_AUDIO,
     CONF_TIMER_SECONDS,
+    DEFAULT_LOCAL_SNIPPETS,
+    DEFAULT_PLAYBACK_TIMEOUT,
+    DEFAULT_REVEAL_SECONDS,
+    DEFAULT_SCORING_PROFILE,
+    DEFAULT_SNIPPET_CACHE_SIZE,
+    DEFAULT_TIMER_ON_AUDIO,
     DEFAULT_TIMER_SECONDS,
     DOMAIN,
+    MAX_PLAYBACK_TIMEOUT,
+    MAX_POINTS,
+    MAX_REVEAL_SECONDS,
+    MAX_SNIPPET_CACHE_SIZE,
     MAX_TIMER_SECONDS,
+    MIN_PLAYBACK_TIMEOUT,
+    MIN_POINTS,
+    MIN_REVEAL_SECONDS,
+    MIN_SNIPPET_CACHE_SIZE,
     MIN_TIMER_SECONDS,
+    SCORING_PROFILE_CLASSIC,
+    SCORING_PROFILE_CUSTOM,
+    SCORING_PROFILES,
+    PERSISTENT_STORAGE_BACKENDS,
 )
+from .multiroom import media_player_ids
+from .storage import storage_backend
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,9 +59,8 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     """Validate the user input allows us to connect."""
     errors = {}
     
-    # Validate media player exists
-    if CONF_MEDIA_PLAYER in data:
-        media_player = data[CONF_MEDIA_PLAYER]
+    # Validate media players exist
+    for media_player in media_player_ids(data.get(CONF_MEDIA_PLAYER)):
         if not hass.states.get(media_player):
             errors[CONF_MEDIA_PLAYER] = "media_player_not_found"
     
@@ -71,6 +102,7 @@ class SoundbeatsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             vol.Optional(CONF_MEDIA_PLAYER): selector.EntitySelector(
                 selector.EntitySelectorConfig(
                     domain=MEDIA_PLAYER_DOMAIN,
+                    multiple=True,
                 )
             ),
             vol.Optional(
@@ -115,16 +147,27 @@ class SoundbeatsOptionsFlow(config_entries.OptionsFlow):
         if user_input is not None:
             return self.async_create_entry(title="", data=user_input)
         
+        options = self.config_entry.options
+        classic = SCORING_PROFILES[SCORING_PROFILE_CLASSIC]
+        points_selector = selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=MIN_POINTS,
+                max=MAX_POINTS,
+                mode=selector.NumberSelectorMode.BOX,
+            )
+        )
+        
         schema = vol.Schema({
             vol.Optional(
                 CONF_MEDIA_PLAYER,
-                default=self.config_entry.options.get(
+                default=media_player_ids(self.config_entry.options.get(
                     CONF_MEDIA_PLAYER,
-                    self.config_entry.data.get(CONF_MEDIA_PLAYER, "")
-                ),
+                    self.config_entry.data.get(CONF_MEDIA_PLAYER)
+                )),
             ): selector.EntitySelector(
                 selector.EntitySelectorConfig(
                     domain=MEDIA_PLAYER_DOMAIN,
+                    multiple=True,
                 )
             ),
             vol.Optional(
@@ -141,6 +184,77 @@ class SoundbeatsOptionsFlow(config_entries.OptionsFlow):
                     unit_of_measurement="seconds",
                 )
             ),
+            vol.Optional(
+                CONF_TIMER_ON_AUDIO,
+                default=options.get(CONF_TIMER_ON_AUDIO, DEFAULT_TIMER_ON_AUDIO),
+            ): selector.BooleanSelector(),
+            vol.Optional(
+                CONF_PLAYBACK_TIMEOUT,
+                default=options.get(CONF_PLAYBACK_TIMEOUT, DEFAULT_PLAYBACK_TIMEOUT),
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=MIN_PLAYBACK_TIMEOUT,
+                    max=MAX_PLAYBACK_TIMEOUT,
+                    mode=selector.NumberSelectorMode.SLIDER,
+                    unit_of_measurement="seconds",
+                )
+            ),
+            vol.Optional(
+                CONF_REVEAL_SECONDS,
+                default=options.get(CONF_REVEAL_SECONDS, DEFAULT_REVEAL_SECONDS),
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=MIN_REVEAL_SECONDS,
+                    max=MAX_REVEAL_SECONDS,
+                    mode=selector.NumberSelectorMode.SLIDER,
+                    unit_of_measurement="seconds",
+                )
+            ),
+            vol.Optional(
+                CONF_LOCAL_SNIPPETS,
+                default=options.get(CONF_LOCAL_SNIPPETS, DEFAULT_LOCAL_SNIPPETS),
+            ): selector.BooleanSelector(),
+            vol.Optional(
+                CONF_SNIPPET_CACHE_SIZE,
+                default=options.get(CONF_SNIPPET_CACHE_SIZE, DEFAULT_SNIPPET_CACHE_SIZE),
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=MIN_SNIPPET_CACHE_SIZE,
+                    max=MAX_SNIPPET_CACHE_SIZE,
+                    mode=selector.NumberSelectorMode.BOX,
+                    unit_of_measurement="MB",
+                )
+            ),
+            vol.Optional(
+                CONF_SCORING_PROFILE,
+                default=options.get(CONF_SCORING_PROFILE, DEFAULT_SCORING_PROFILE),
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=[*SCORING_PROFILES, SCORING_PROFILE_CUSTOM],
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                    translation_key=CONF_SCORING_PROFILE,
+                )
+            ),
+            **{
+                vol.Optional(key, default=options.get(key, classic[key])): points_selector
+                for key in (
+                    CONF_POINTS_EXACT_YEAR,
+                    CONF_POINTS_WITHIN_3_YEARS,
+                    CONF_POINTS_WITHIN_5_YEARS,
+                    CONF_POINTS_EXACT_WITH_BET,
+                    CONF_POINTS_WRONG_WITH_BET,
+                )
+            },
+            vol.Optional(
+                CONF_STORAGE_BACKEND,
+                default=storage_backend(options),
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=PERSISTENT_STORAGE_BACKENDS,
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                    translation_key=CONF_STORAGE_BACKEND,
+                )
+            ),
         })
         
         return self.async_show_form(
@@ -7,12 +7,52 @@ DOMAIN: Final = "soundbeatsv2"
 CONF_MEDIA_PLAYER: Final = "media_player"
 CONF_TIMER_SECONDS: Final = "timer_seconds"
 CONF_MAX_TEAMS: Final = "max_teams"
+CONF_SCORING_PROFILE: Final = "scoring_profile"
+CONF_STORAGE_BACKEND: Final = "storage_backend"
+CONF_PLAYBACK_TIMEOUT: Final = "playback_timeout"
+CONF_TIMER_ON_AUDIO: Final = "timer_on_audio"
+CONF_REVEAL_SECONDS: Final = "reveal_seconds"
+CONF_LOCAL_SNIPPETS: Final = "local_snippets"
+CONF_SNIPPET_CACHE_SIZE: Final = "snippet_cache_size"
+CONF_POINTS_EXACT_YEAR: Final = "points_exact_year"
+CONF_POINTS_WITHIN_3_YEARS: Final = "points_within_3_years"
+CONF_POINTS_WITHIN_5_YEARS: Final = "points_within_5_years"
+CONF_POINTS_EXACT_WITH_BET: Final = "points_exact_with_bet"
+CONF_POINTS_WRONG_WITH_BET: Final = "points_wrong_with_bet"
 
 # Defaults
 DEFAULT_TIMER_SECONDS: Final = 30
 DEFAULT_MAX_TEAMS: Final = 5
 MIN_TIMER_SECONDS: Final = 5
 MAX_TIMER_SECONDS: Final = 300
+# Seconds to wait for the media player to confirm a state change
+DEFAULT_PLAYBACK_TIMEOUT: Final = 10
+MIN_PLAYBACK_TIMEOUT: Final = 1
+MAX_PLAYBACK_TIMEOUT: Final = 60
+# Media player latency calibration
+CALIBRATION_SAMPLES: Final = 3
+MAX_CALIBRATION_SAMPLES: Final = 10
+# Calibrated timeouts allow this multiple of the measured 90th percentile
+LATENCY_TIMEOUT_FACTOR: Final = 3
+# Seconds a Spotify Connect device stays the known-good source once it
+# worked, and how often a running game re-checks it is still selected
+SPOTIFY_SOURCE_TTL: Final = 300
+SPOTIFY_KEEPALIVE_INTERVAL: Final = 60
+# Seconds without a new round before the keepalive stops until the next one
+SPOTIFY_KEEPALIVE_IDLE_TIMEOUT: Final = 900
+# Start the round timer once the snippet is heard instead of on round start
+DEFAULT_TIMER_ON_AUDIO: Final = False
+# Seconds auto-advance shows the answer before starting the next round
+DEFAULT_REVEAL_SECONDS: Final = 10
+MIN_REVEAL_SECONDS: Final = 3
+MAX_REVEAL_SECONDS: Final = 60
+# Serve pre-trimmed snippets from the config directory; size limit in MB
+DEFAULT_LOCAL_SNIPPETS: Final = False
+DEFAULT_SNIPPET_CACHE_SIZE: Final = 500
+MIN_SNIPPET_CACHE_SIZE: Final = 10
+MAX_SNIPPET_CACHE_SIZE: Final = 10000
+# Seconds a signed snippet URL stays valid
+SNIPPET_URL_EXPIRY: Final = 3600
 
 # Game constants
 POINTS_EXACT_YEAR: Final = 10
@@ -20,17 +60,172 @@ POINTS_WITHIN_3_YEARS: Final = 5
 POINTS_WITHIN_5_YEARS: Final = 2
 POINTS_EXACT_WITH_BET: Final = 20
 POINTS_WRONG_WITH_BET: Final = 0
+MAX_HIGHSCORES_PER_ROUND: Final = 10
+LEADERBOARD_TOP_K: Final = 25
+# Upper bounds (seconds) of the timer-length buckets leaderboards are split by
+TIMER_BUCKETS: Final = (15, 30, 60, 120, MAX_TIMER_SECONDS)
+MIN_POINTS: Final = -50
+MAX_POINTS: Final = 100
+
+# Scoring profiles selectable in the options flow
+SCORING_PROFILE_CLASSIC: Final = "classic"
+SCORING_PROFILE_GENEROUS: Final = "generous"
+SCORING_PROFILE_STRICT: Final = "strict"
+SCORING_PROFILE_CUSTOM: Final = "custom"
+DEFAULT_SCORING_PROFILE: Final = SCORING_PROFILE_CLASSIC
+SCORING_PROFILES: Final = {
+    SCORING_PROFILE_CLASSIC: {
+        CONF_POINTS_EXACT_YEAR: POINTS_EXACT_YEAR,
+        CONF_POINTS_WITHIN_3_YEARS: POINTS_WITHIN_3_YEARS,
+        CONF_POINTS_WITHIN_5_YEARS: POINTS_WITHIN_5_YEARS,
+        CONF_POINTS_EXACT_WITH_BET: POINTS_EXACT_WITH_BET,
+        CONF_POINTS_WRONG_WITH_BET: POINTS_WRONG_WITH_BET,
+    },
+    SCORING_PROFILE_GENEROUS: {
+        CONF_POINTS_EXACT_YEAR: 10,
+        CONF_POINTS_WITHIN_3_YEARS: 7,
+        CONF_POINTS_WITHIN_5_YEARS: 4,
+        CONF_POINTS_EXACT_WITH_BET: 20,
+        CONF_POINTS_WRONG_WITH_BET: 0,
+    },
+    SCORING_PROFILE_STRICT: {
+        CONF_POINTS_EXACT_YEAR: 10,
+        CONF_POINTS_WITHIN_3_YEARS: 3,
+        CONF_POINTS_WITHIN_5_YEARS: 0,
+        CONF_POINTS_EXACT_WITH_BET: 30,
+        CONF_POINTS_WRONG_WITH_BET: -10,
+    },
+}
+
+# Guess value stored for teams that did not answer a round
+NO_GUESS: Final = 0
 
 # Storage keys
 STORAGE_KEY_HIGHSCORES: Final = "highscores"
 STORAGE_KEY_GAME_STATE: Final = "game_state"
+STORAGE_KEY_LATENCY: Final = "latency"
 STORAGE_VERSION: Final = 1
 
+# Storage backends
+STORAGE_BACKEND_MEMORY: Final = "memory"
+STORAGE_BACKEND_JSON: Final = "json"
+STORAGE_BACKEND_JOURNAL: Final = "journal"
+STORAGE_BACKEND_SQLITE: Final = "sqlite"
+STORAGE_BACKENDS: Final = [
+    STORAGE_BACKEND_MEMORY,
+    STORAGE_BACKEND_JSON,
+    STORAGE_BACKEND_JOURNAL,
+    STORAGE_BACKEND_SQLITE,
+]
+# Backends offered in the options flow; the memory backend is for benchmarks
+PERSISTENT_STORAGE_BACKENDS: Final = [
+    STORAGE_BACKEND_JSON,
+    STORAGE_BACKEND_JOURNAL,
+    STORAGE_BACKEND_SQLITE,
+]
+DEFAULT_STORAGE_BACKEND: Final = STORAGE_BACKEND_JSON
+JOURNAL_COMPACT_RECORDS: Final = 200
+
+# Game archive
+ARCHIVE_COMPRESSION_ZLIB: Final = "zlib"
+ARCHIVE_COMPRESSION_LZMA: Final = "lzma"
+DEFAULT_ARCHIVE_COMPRESSION: Final = ARCHIVE_COMPRESSION_ZLIB
+ARCHIVE_SEGMENT_BYTES: Final = 256 * 1024
+ARCHIVE_MAX_GAMES: Final = 1000
+ARCHIVE_MAX_AGE_DAYS: Final = 365
+
+# History export
+EXPORT_FORMAT_CSV: Final = "csv"
+EXPORT_FORMAT_JSONL: Final = "jsonl"
+EXPORT_FORMATS: Final = [EXPORT_FORMAT_CSV, EXPORT_FORMAT_JSONL]
+EXPORT_CHUNK_SIZE: Final = 16 * 1024
+# Stored games read per query while streaming history
+HISTORY_PAGE_SIZE: Final = 50
+
+# Game state projections; "team" is the requesting user's own team
+STATE_FIELD_MEDIA_PLAYER: Final = "media_player"
+STATE_FIELDS: Final = [
+    "active",
+    "game_id",
+    "teams",
+    "team",
+    "current_round",
+    "round_active",
+    "timer_remaining",
+    "timer_seconds",
+    "playback_status",
+    "next_song_ready",
+    "auto_advance",
+    "playlist_id",
+    "current_song",
+    "highscore_current_round",
+    STATE_FIELD_MEDIA_PLAYER,
+]
+STATE_PROFILE_TIMER: Final = "timer"
+STATE_PROFILE_SCOREBOARD: Final = "scoreboard"
+STATE_PROFILE_PLAYER: Final = "player"
+STATE_PROFILE_ADMIN: Final = "admin"
+STATE_PROFILES: Final = {
+    STATE_PROFILE_TIMER: (
+        "active", "game_id", "current_round", "round_active",
+        "timer_remaining", "timer_seconds", "playback_status",
+    ),
+    STATE_PROFILE_SCOREBOARD: (
+        "active", "game_id", "teams", "current_round", "round_active",
+        "highscore_current_round",
+    ),
+    STATE_PROFILE_PLAYER: (
+        "active", "game_id", "team", "current_round", "round_active",
+        "timer_remaining", "timer_seconds", "playback_status",
+    ),
+    STATE_PROFILE_ADMIN: tuple(
+        name for name in STATE_FIELDS if name != "team"
+    ),
+}
+
+# Storage benchmark
+BENCHMARK_HISTORY_SIZES: Final = (10, 100, 1000)
+BENCHMARK_SAVES: Final = 20
+
+# Round playback progress, broadcast as game state change actions
+PLAYBACK_STARTING: Final = "playback_starting"
+PLAYBACK_STARTED: Final = "playback_started"
+PLAYBACK_FAILED: Final = "playback_failed"
+# Playing waits up to the playback timeout to turn the player on, switch
+# source and start playing, so the round gives up after that many timeouts,
+# plus one per media command queued ahead of it
+PLAYBACK_TIMEOUT_STEPS: Final = 3
+
+# Auto-advance pipeline states and the admin actions controlling it
+AUTO_ADVANCE_RUNNING: Final = "running"
+AUTO_ADVANCE_PAUSED: Final = "paused"
+AUTO_ADVANCE_START: Final = "start"
+AUTO_ADVANCE_PAUSE: Final = "pause"
+AUTO_ADVANCE_RESUME: Final = "resume"
+AUTO_ADVANCE_STOP: Final = "stop"
+AUTO_ADVANCE_ACTIONS: Final = [
+    AUTO_ADVANCE_START,
+    AUTO_ADVANCE_PAUSE,
+    AUTO_ADVANCE_RESUME,
+    AUTO_ADVANCE_STOP,
+]
+
+# Services
+SERVICE_CALIBRATE_MEDIA_PLAYER: Final = "calibrate_media_player"
+ATTR_CONFIG_ENTRY_ID: Final = "config_entry_id"
+ATTR_MEDIA_CONTENT_ID: Final = "media_content_id"
+ATTR_SAMPLES: Final = "samples"
+
+# HTTP API
+URL_HIGHSCORES: Final = f"/api/{DOMAIN}/highscores"
+URL_SNIPPETS: Final = f"/api/{DOMAIN}/snippets"
+
 # WebSocket event types
 EVENT_GAME_STATE_CHANGED: Final = f"{DOMAIN}_game_state_changed"
 EVENT_TIMER_UPDATE: Final = f"{DOMAIN}_timer_update"
 EVENT_ROUND_ENDED: Final = f"{DOMAIN}_round_ended"
 EVENT_GAME_ENDED: Final = f"{DOMAIN}_game_ended"
+EVENT_MEDIA_UPDATE: Final = f"{DOMAIN}_media_update"
 
 # Attributes
 ATTR_GAME_ID: Final = "game_id"
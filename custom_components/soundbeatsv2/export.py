@@ -0,0 +1,95 @@
+"""History export for Soundbeats."""
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterator, List
+
+from .const import EXPORT_CHUNK_SIZE, EXPORT_FORMAT_CSV
+
+CSV_COLUMNS = (
+    "game_id",
+    "game_date",
+    "playlist_id",
+    "round_number",
+    "song_id",
+    "actual_year",
+    "timestamp",
+    "team_id",
+    "team_name",
+    "guess",
+    "has_bet",
+    "score",
+)
+
+
+def _csv_rows(game: Dict[str, Any]) -> Iterator[List[Any]]:
+    """Get one CSV row per team that answered each round."""
+    names = {team["id"]: team["name"] for team in game["teams"]}
+    for round_data in game["rounds_played"]:
+        for team_id, guess in round_data["team_guesses"].items():
+            yield [
+                game["game_id"],
+                game["created_at"],
+                game["playlist_id"],
+                round_data["round_number"],
+                round_data["song_id"],
+                round_data["actual_year"],
+                round_data["timestamp"],
+                team_id,
+                names.get(team_id, team_id),
+                guess,
+                round_data["team_bets"].get(team_id, False),
+                round_data["team_scores"].get(team_id, 0),
+            ]
+
+
+def _jsonl_records(game: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Get a game record followed by one record per round."""
+    yield {
+        "type": "game",
+        **{key: value for key, value in game.items() if key != "rounds_played"},
+    }
+    for round_data in game["rounds_played"]:
+        yield {"type": "round", "game_id": game["game_id"], **round_data}
+
+
+async def async_export_games(
+    games: AsyncIterable[Dict[str, Any]],
+    export_format: str,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> AsyncIterator[str]:
+    """Encode games as CSV or JSON lines, yielding chunks of ``chunk_size`` characters.
+    
+    Only the last chunk may be shorter. Control returns to the event loop
+    after every game so a long export does not hold up a running game.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if export_format == EXPORT_FORMAT_CSV:
+        writer.writerow(CSV_COLUMNS)
+    pending = ""
+    
+    async for game in games:
+        if export_format == EXPORT_FORMAT_CSV:
+            writer.writerows(_csv_rows(game))
+        else:
+            for record in _jsonl_records(game):
+                buffer.write(json.dumps(record, separators=(",", ":")) + "\n")
+        
+        pending += buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        # Slicing the remainder once per game keeps long exports linear
+        start = 0
+        while len(pending) - start >= chunk_size:
+            yield pending[start:start + chunk_size]
+            start += chunk_size
+        pending = pending[start:]
+        await asyncio.sleep(0)
+    
+    pending += buffer.getvalue()
+    if pending:
+        yield pending
@@ -501,10 +501,46 @@ class AdminControls extends LitElement {
                         Round ${this.gameState.current_round} in progress...
                     </div>
                 ` : ''}
+                
+                ${this.renderAutoAdvanceControls()}
             </div>
         `;
     }
     
+    renderAutoAdvanceControls() {
+        const autoAdvance = this.gameState.auto_advance;
+        
+        return html`
+            ${autoAdvance === 'running' ? html`
+                <button 
+                    class="button button-secondary"
+                    @click=${() => this.autoAdvance('pause')}
+                    ?disabled=${this.loading}
+                >
+                    ⏸️ Pause Auto-Advance
+                </button>
+            ` : html`
+                <button 
+                    class="button button-secondary"
+                    @click=${() => this.autoAdvance(autoAdvance === 'paused' ? 'resume' : 'start')}
+                    ?disabled=${this.loading}
+                >
+                    🔁 ${autoAdvance === 'paused' ? 'Resume' : 'Start'} Auto-Advance
+                </button>
+            `}
+            
+            ${autoAdvance ? html`
+                <button 
+                    class="button button-secondary"
+                    @click=${() => this.autoAdvance('stop')}
+                    ?disabled=${this.loading}
+                >
+                    ⏹️ Stop Auto-Advance
+                </button>
+            ` : ''}
+        `;
+    }
+    
     renderMediaControls() {
         return html`
             <div class="media-controls">
@@ -629,9 +665,8 @@ class AdminControls extends LitElement {
         try {
             this.loading = true;
             
-            // Get a random song for the round
-            const song = await this.gameService.getRandomSong(this.selectedPlaylist);
-            await this.gameService.startRound(song);
+            // The server picks the song and prepared the player during the reveal
+            await this.gameService.startRound();
             
         } catch (error) {
             console.error('Failed to start round:', error);
@@ -655,6 +690,20 @@ class AdminControls extends LitElement {
         }
     }
     
+    async autoAdvance(action) {
+        if (!this.gameService || this.loading) return;
+        
+        try {
+            this.loading = true;
+            await this.gameService.autoAdvance(action);
+        } catch (error) {
+            console.error('Failed to control auto-advance:', error);
+            this.showError('Failed to control auto-advance: ' + error.message);
+        } finally {
+            this.loading = false;
+        }
+    }
+    
     async mediaControl(action, params = {}) {
         if (!this.gameService) return;
         
@@ -118,9 +118,10 @@ export class GameService extends EventTarget {
         }
     }
     
-    async startRound(song) {
+    async startRound(song = null) {
         try {
             const result = await this.ws.startRound(song);
+            song = song || result.song;
             
             // Update local state - immutable update
             if (this.gameState) {
@@ -174,6 +175,29 @@ export class GameService extends EventTarget {
         }
     }
     
+    async autoAdvance(action, revealSeconds = null) {
+        try {
+            const result = await this.ws.autoAdvance(action, revealSeconds);
+            
+            // Update local state - immutable update
+            if (this.gameState) {
+                this.gameState = {
+                    ...this.gameState,
+                    auto_advance: result.auto_advance
+                };
+                
+                this.dispatchEvent(new CustomEvent('stateChanged', {
+                    detail: this.gameState
+                }));
+            }
+            
+            return result;
+        } catch (error) {
+            console.error('Failed to control auto-advance:', error);
+            throw error;
+        }
+    }
+    
     async submitGuess(teamId, year, hasBet = false) {
         try {
             const result = await this.ws.submitGuess(teamId, year, hasBet);
@@ -111,6 +111,15 @@ export class WebSocketService extends EventTarget {
             'soundbeatsv2_round_ended'
         );
         this.subscriptions.set('round_end', unsubscribeRoundEnd);
+        
+        // Subscribe to media player changes
+        const unsubscribeMedia = this.connection.subscribeEvents(
+            (event) => {
+                this.handleMediaEvent(event);
+            },
+            'soundbeatsv2_media_update'
+        );
+        this.subscriptions.set('media', unsubscribeMedia);
     }
     
     handleGameStateEvent(event) {
@@ -140,6 +149,16 @@ export class WebSocketService extends EventTarget {
         }));
     }
     
+    handleMediaEvent(event) {
+        this.dispatchEvent(new CustomEvent('mediaUpdate', {
+            detail: {
+                entityId: event.data.entity_id,
+                version: event.data.version,
+                changes: event.data.changes
+            }
+        }));
+    }
+    
     scheduleReconnect() {
         if (this.reconnectAttempts >= this.maxReconnectAttempts) {
             this.dispatchEvent(new CustomEvent('error', {
@@ -181,16 +200,26 @@ export class WebSocketService extends EventTarget {
         });
     }
     
-    async startRound(song) {
-        return await this.sendCommand('soundbeatsv2/start_round', {
+    async startRound(song = null) {
+        // Without a song the server plays the one it prefetched
+        return await this.sendCommand('soundbeatsv2/start_round', song ? {
             song: song
-        });
+        } : {});
     }
     
     async nextRound() {
         return await this.sendCommand('soundbeatsv2/next_round');
     }
     
+    async autoAdvance(action, revealSeconds = null) {
+        return await this.sendCommand('soundbeatsv2/auto_advance', revealSeconds ? {
+            action: action,
+            reveal_seconds: revealSeconds
+        } : {
+            action: action
+        });
+    }
+    
     async updateTeamName(teamId, name) {
         return await this.sendCommand('soundbeatsv2/update_team_name', {
             team_id: teamId,
@@ -4,14 +4,27 @@ import json
 import logging
 import random
 import uuid
-from dataclasses import asdict, dataclass, field
+from array import array
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from operator import add
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import STATE_PAUSED, STATE_PLAYING
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.event import async_track_time_interval
-from homeassistant.helpers.storage import Store
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
 from homeassistant.util import dt as dt_util
 
 from .const import (
@@ -21,24 +34,51 @@ from .const import (
     ATTR_SCORES,
     ATTR_TEAMS,
     ATTR_TIMER_REMAINING,
+    AUTO_ADVANCE_PAUSED,
+    AUTO_ADVANCE_RUNNING,
+    BENCHMARK_HISTORY_SIZES,
+    BENCHMARK_SAVES,
+    CONF_REVEAL_SECONDS,
+    CONF_TIMER_ON_AUDIO,
+    DEFAULT_MAX_TEAMS,
+    DEFAULT_REVEAL_SECONDS,
+    DEFAULT_TIMER_ON_AUDIO,
     DOMAIN,
     EVENT_GAME_STATE_CHANGED,
     EVENT_ROUND_ENDED,
     EVENT_TIMER_UPDATE,
-    POINTS_EXACT_WITH_BET,
-    POINTS_EXACT_YEAR,
-    POINTS_WITHIN_3_YEARS,
-    POINTS_WITHIN_5_YEARS,
-    POINTS_WRONG_WITH_BET,
-    STORAGE_KEY_GAME_STATE,
-    STORAGE_KEY_HIGHSCORES,
-    STORAGE_VERSION,
+    HISTORY_PAGE_SIZE,
+    LEADERBOARD_TOP_K,
+    MAX_HIGHSCORES_PER_ROUND,
+    NO_GUESS,
+    PLAYBACK_FAILED,
+    PLAYBACK_STARTED,
+    PLAYBACK_STARTING,
+    PLAYBACK_TIMEOUT_STEPS,
+    SPOTIFY_KEEPALIVE_IDLE_TIMEOUT,
+    STORAGE_BACKEND_JSON,
+    STORAGE_BACKENDS,
+)
+from .archive import GameArchive
+from .benchmark import BenchmarkUpdate, async_benchmark_backend
+from .catalog import SongCatalog
+from .codec import json_bytes
+from .leaderboard import LeaderboardIndex, LeaderboardKey, TopK, timer_bucket
+from .media_controller import MediaController, PlaybackResult
+from .round_history import RoundHistory
+from .scoring import ScoringEngine, ScoringRules
+from .storage import (
+    JsonStoreBackend,
+    StorageBackend,
+    create_backend,
+    parse_timestamp,
+    storage_backend,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class Team:
     """Team data model."""
     
@@ -48,22 +88,131 @@ class Team:
     current_guess: Optional[int] = None
     has_bet: bool = False
     assigned_user: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a dict."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "score": self.score,
+            "current_guess": self.current_guess,
+            "has_bet": self.has_bet,
+            "assigned_user": self.assigned_user,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Team":
+        """Create a team from the layout returned by ``to_dict``."""
+        return cls(**data)
 
 
-@dataclass
+@dataclass(slots=True)
 class GameRound:
-    """Game round data model."""
+    """Game round data model.
+    
+    Per-team results are kept as parallel arrays indexed by team ordinal,
+    i.e. the team's position in ``GameState.teams``.
+    """
     
     round_number: int
     song_id: int
-    team_guesses: Dict[str, int] = field(default_factory=dict)
-    team_bets: Dict[str, bool] = field(default_factory=dict)
-    team_scores: Dict[str, int] = field(default_factory=dict)
+    guesses: array = field(default_factory=lambda: array("H"))
+    bets: array = field(default_factory=lambda: array("B"))
+    scores: array = field(default_factory=lambda: array("h"))
     actual_year: int = 0
     timestamp: datetime = field(default_factory=lambda: dt_util.now())
+    # ISO string of ``timestamp``, kept so repeated saves skip formatting it
+    _timestamp_iso: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    @classmethod
+    def for_teams(cls, team_count: int, **kwargs: Any) -> "GameRound":
+        """Create a round with empty result slots for every team."""
+        return cls(
+            guesses=array("H", bytes(2 * team_count)),
+            bets=array("B", bytes(team_count)),
+            scores=array("h", bytes(2 * team_count)),
+            **kwargs,
+        )
+    
+    def record(self, ordinal: int, guess: int, has_bet: bool, score: int) -> None:
+        """Record a team's guess, bet and score."""
+        self.guesses[ordinal] = guess
+        self.bets[ordinal] = has_bet
+        self.scores[ordinal] = score
+    
+    def team_guesses(self, team_ids: Sequence[str]) -> Dict[str, int]:
+        """Get guesses keyed by team ID for teams that answered."""
+        return {
+            team_id: guess
+            for team_id, guess in zip(team_ids, self.guesses)
+            if guess != NO_GUESS
+        }
+    
+    def team_bets(self, team_ids: Sequence[str]) -> Dict[str, bool]:
+        """Get bets keyed by team ID for teams that answered."""
+        return {
+            team_id: bool(bet)
+            for team_id, guess, bet in zip(team_ids, self.guesses, self.bets)
+            if guess != NO_GUESS
+        }
+    
+    def team_scores(self, team_ids: Sequence[str]) -> Dict[str, int]:
+        """Get scores keyed by team ID for teams that answered."""
+        return {
+            team_id: score
+            for team_id, guess, score in zip(team_ids, self.guesses, self.scores)
+            if guess != NO_GUESS
+        }
+    
+    def as_dict(self, team_ids: Sequence[str]) -> Dict[str, Any]:
+        """Convert to the dict layout produced by ``asdict`` on the old model."""
+        return {
+            "round_number": self.round_number,
+            "song_id": self.song_id,
+            "team_guesses": self.team_guesses(team_ids),
+            "team_bets": self.team_bets(team_ids),
+            "team_scores": self.team_scores(team_ids),
+            "actual_year": self.actual_year,
+            "timestamp": self.timestamp,
+        }
+    
+    def to_dict(self, team_ids: Sequence[str]) -> Dict[str, Any]:
+        """Convert to the stored layout, with the timestamp as an ISO string."""
+        if self._timestamp_iso is None:
+            self._timestamp_iso = self.timestamp.isoformat()
+        data = self.as_dict(team_ids)
+        data["timestamp"] = self._timestamp_iso
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], team_ids: Sequence[str]) -> "GameRound":
+        """Create a round from the layout returned by ``as_dict`` or ``to_dict``."""
+        timestamp = data["timestamp"]
+        round_data = cls.for_teams(
+            len(team_ids),
+            round_number=data["round_number"],
+            song_id=data["song_id"],
+            actual_year=data.get("actual_year", 0),
+            timestamp=datetime.fromisoformat(timestamp)
+                if isinstance(timestamp, str) else timestamp,
+        )
+        if isinstance(timestamp, str):
+            round_data._timestamp_iso = timestamp
+        guesses = data.get("team_guesses", {})
+        bets = data.get("team_bets", {})
+        scores = data.get("team_scores", {})
+        for ordinal, team_id in enumerate(team_ids):
+            if team_id in guesses:
+                round_data.record(
+                    ordinal,
+                    guesses[team_id],
+                    bets.get(team_id, False),
+                    scores.get(team_id, 0),
+                )
+        return round_data
 
 
-@dataclass
+@dataclass(slots=True)
 class GameState:
     """Game state data model."""
     
@@ -76,9 +225,51 @@ class GameState:
     timer_seconds: int = 30
     is_active: bool = True
     created_at: datetime = field(default_factory=lambda: dt_util.now())
+    
+    @property
+    def team_ids(self) -> List[str]:
+        """Get team IDs in ordinal order."""
+        return [team.id for team in self.teams]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the stored layout."""
+        team_ids = self.team_ids
+        return {
+            "game_id": self.game_id,
+            "teams": [team.to_dict() for team in self.teams],
+            "current_round": self.current_round,
+            "rounds_played": [
+                round_data.to_dict(team_ids) for round_data in self.rounds_played
+            ],
+            "playlist_id": self.playlist_id,
+            "played_song_ids": list(self.played_song_ids),
+            "timer_seconds": self.timer_seconds,
+            "is_active": self.is_active,
+            "created_at": self.created_at.isoformat(),
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "GameState":
+        """Create a game state from the layout returned by ``to_dict``."""
+        teams = [Team.from_dict(team_data) for team_data in data["teams"]]
+        team_ids = [team.id for team in teams]
+        return cls(
+            game_id=data["game_id"],
+            teams=teams,
+            current_round=data["current_round"],
+            rounds_played=[
+                GameRound.from_dict(round_data, team_ids)
+                for round_data in data["rounds_played"]
+            ],
+            playlist_id=data["playlist_id"],
+            played_song_ids=list(data["played_song_ids"]),
+            timer_seconds=data.get("timer_seconds", 30),
+            is_active=data.get("is_active", True),
+            created_at=datetime.fromisoformat(data["created_at"]),
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class HighscoreEntry:
     """Highscore entry data model."""
     
@@ -87,14 +278,157 @@ class HighscoreEntry:
     rounds_played: int
     date: datetime
     playlist_id: str
+    game_id: Optional[str] = None
+    timer_seconds: Optional[int] = None
+    team_count: Optional[int] = None
+    # ISO string of ``date``, kept so repeated serialization skips formatting it
+    _date_iso: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the stored layout, with the date as an ISO string."""
+        if self._date_iso is None:
+            self._date_iso = self.date.isoformat()
+        return {
+            "team_name": self.team_name,
+            "score_per_round": self.score_per_round,
+            "rounds_played": self.rounds_played,
+            "date": self._date_iso,
+            "playlist_id": self.playlist_id,
+            "game_id": self.game_id,
+            "timer_seconds": self.timer_seconds,
+            "team_count": self.team_count,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HighscoreEntry":
+        """Create an entry from the layout returned by ``to_dict``."""
+        entry = cls(
+            team_name=data["team_name"],
+            score_per_round=data["score_per_round"],
+            rounds_played=data["rounds_played"],
+            date=datetime.fromisoformat(data["date"]),
+            playlist_id=data["playlist_id"],
+            game_id=data.get("game_id"),
+            timer_seconds=data.get("timer_seconds"),
+            team_count=data.get("team_count"),
+        )
+        entry._date_iso = data["date"]
+        return entry
+
+
+def _score_per_round(entry: HighscoreEntry) -> float:
+    """Get the ranking key of a highscore entry."""
+    return entry.score_per_round
+
+
+def _leaderboard_key(entry: HighscoreEntry) -> LeaderboardKey:
+    """Get the leaderboard table a highscore entry belongs to."""
+    return LeaderboardKey(
+        entry.playlist_id,
+        entry.rounds_played,
+        timer_bucket(entry.timer_seconds),
+        entry.team_count or 0,
+    )
+
 
+def _new_leaderboard() -> LeaderboardIndex[HighscoreEntry]:
+    """Create an empty highscore leaderboard index."""
+    return LeaderboardIndex(LEADERBOARD_TOP_K, _leaderboard_key, _score_per_round)
 
-@dataclass  
+
+@dataclass(slots=True)
 class HighscoreTracker:
     """Highscore tracking data model."""
     
-    by_round: Dict[int, List[HighscoreEntry]] = field(default_factory=dict)
+    by_round: Dict[int, TopK[HighscoreEntry]] = field(default_factory=dict)
     all_time_best: Optional[HighscoreEntry] = None
+    leaderboard: LeaderboardIndex[HighscoreEntry] = field(default_factory=_new_leaderboard)
+    
+    def add(self, entry: HighscoreEntry) -> bool:
+        """Add an entry to the leaderboard and the per-round tables."""
+        self.leaderboard.add(entry)
+        return self.add_to_rounds(entry)
+    
+    def add_to_rounds(self, entry: HighscoreEntry) -> bool:
+        """Add an entry, keeping the best scores for its round count."""
+        round_scores = self.by_round.get(entry.rounds_played)
+        if round_scores is None:
+            round_scores = self.by_round[entry.rounds_played] = TopK(
+                MAX_HIGHSCORES_PER_ROUND, _score_per_round
+            )
+        if not round_scores.add(entry):
+            return False
+        
+        if (not self.all_time_best or
+            entry.score_per_round > self.all_time_best.score_per_round):
+            self.all_time_best = entry
+        return True
+
+
+def rescore_game(
+    engine: ScoringEngine, game: GameState
+) -> Tuple[List[array], List[HighscoreEntry]]:
+    """Score a game's rounds with new rules.
+    
+    Returns the new scores of each round and every highscore entry the game
+    produces with them; the game itself is left unchanged. Runs in the
+    executor.
+    """
+    scores: List[array] = []
+    entries: List[HighscoreEntry] = []
+    totals = [0] * len(game.teams)
+    for round_data in game.rounds_played:
+        points = engine.score_round(
+            round_data.guesses, round_data.bets, round_data.actual_year
+        )
+        scores.append(points)
+        totals = list(map(add, totals, points))
+        for team, total in zip(game.teams, totals):
+            entries.append(HighscoreEntry(
+                team_name=team.name,
+                score_per_round=total / round_data.round_number,
+                rounds_played=round_data.round_number,
+                date=round_data.timestamp,
+                playlist_id=game.playlist_id,
+                game_id=game.game_id,
+                timer_seconds=game.timer_seconds,
+                team_count=len(game.teams),
+            ))
+    return scores, entries
+
+
+def apply_scores(game: GameState, scores: Sequence[array]) -> None:
+    """Store re-scored round scores on a game and recompute the team totals."""
+    totals = [0] * len(game.teams)
+    for round_data, points in zip(game.rounds_played, scores):
+        round_data.scores = points
+        totals = list(map(add, totals, points))
+    for team, total in zip(game.teams, totals):
+        team.score = total
+
+
+def carry_over_highscores(
+    highscores: HighscoreTracker, tracker: HighscoreTracker, rescored_ids: Set[str]
+) -> None:
+    """Add the entries of games that were not re-scored to a rebuilt tracker.
+    
+    That covers entries whose game is no longer stored and entries saved
+    before highscores recorded their game. Runs in the executor.
+    """
+    for entries in highscores.by_round.values():
+        for entry in entries:
+            if entry.game_id not in rescored_ids:
+                tracker.add_to_rounds(entry)
+    for entry in highscores.leaderboard:
+        if entry.game_id not in rescored_ids:
+            tracker.leaderboard.add(entry)
+    
+    best = highscores.all_time_best
+    if best and best.game_id not in rescored_ids and (
+        not tracker.all_time_best
+        or best.score_per_round > tracker.all_time_best.score_per_round
+    ):
+        tracker.all_time_best = best
 
 
 class GameManager:
@@ -105,66 +439,326 @@ class GameManager:
         self.hass = hass
         self.entry = entry
         self._game_state: Optional[GameState] = None
-        self._highscores: HighscoreTracker = HighscoreTracker()
+        # Stored highscores are kept raw until first use; see _highscores
+        self._highscore_tracker: Optional[HighscoreTracker] = None
+        self._highscore_data: Optional[Dict[str, Any]] = None
+        # Encoded get_highscores response, cleared whenever highscores change
+        self._highscores_json: Optional[bytes] = None
+        self._ready = asyncio.Event()
+        self._history: RoundHistory = RoundHistory(0)
+        self._scoring = ScoringEngine(ScoringRules.from_options(entry.options))
         self._timer_task: Optional[asyncio.Task] = None
         self._timer_remaining: int = 0
         self._round_active: bool = False
         self._current_song: Optional[Dict[str, Any]] = None
+        self._playback_task: Optional[asyncio.Task] = None
+        self._playback_status: Optional[str] = None
+        # Song picked and prepared for the next round during the reveal
+        self._catalog = SongCatalog(hass)
+        self._next_song: Optional[Dict[str, Any]] = None
+        self._prefetch_task: Optional[asyncio.Task] = None
+        # Auto-advance pipeline; rounds start only while it is resumed
+        self._auto_advance_task: Optional[asyncio.Task] = None
+        self._auto_advance_resumed = asyncio.Event()
+        self._round_ended = asyncio.Event()
+        # Stops the Spotify keepalive once no round has started for a while
+        self._keepalive_idle_unsub: Optional[Callable[[], None]] = None
         self._lock = asyncio.Lock()
         
         # Storage
-        self._store_state = Store(
-            hass, 
-            STORAGE_VERSION, 
-            f"{DOMAIN}.{entry.entry_id}.{STORAGE_KEY_GAME_STATE}"
-        )
-        self._store_highscores = Store(
-            hass, 
-            STORAGE_VERSION, 
-            f"{DOMAIN}.{entry.entry_id}.{STORAGE_KEY_HIGHSCORES}"
+        self.storage_backend: str = storage_backend(entry.options)
+        self._storage: StorageBackend = create_backend(
+            hass, self.storage_backend, f"{DOMAIN}.{entry.entry_id}"
         )
+        # Set when rounds and highscores were rebuilt and must be rewritten
+        self._history_replaced = False
+        self._archive = GameArchive(hass, f"{DOMAIN}.{entry.entry_id}")
+    
+    @property
+    def ready(self) -> bool:
+        """Return whether stored state has been loaded."""
+        return self._ready.is_set()
+    
+    async def async_wait_ready(self) -> None:
+        """Wait until stored state has been loaded."""
+        await self._ready.wait()
+    
+    @property
+    def round_active(self) -> bool:
+        """Return whether a round is being played."""
+        return self._round_active
+    
+    @property
+    def timer_remaining(self) -> int:
+        """Get the seconds left in the current round."""
+        return self._timer_remaining
+    
+    @property
+    def playback_status(self) -> Optional[str]:
+        """Get how far the current round's snippet got in starting to play."""
+        return self._playback_status
+    
+    @property
+    def current_song(self) -> Optional[Dict[str, Any]]:
+        """Get the song of the current or just finished round."""
+        return self._current_song
+    
+    @property
+    def next_song_ready(self) -> bool:
+        """Return whether the next round's song has been picked."""
+        return self._next_song is not None
+    
+    @property
+    def _highscores(self) -> HighscoreTracker:
+        """Get the highscore tables, deserializing stored data on first access."""
+        if self._highscore_tracker is None:
+            data, self._highscore_data = self._highscore_data, None
+            self._highscore_tracker = (
+                self._deserialize_highscores(data) if data else HighscoreTracker()
+            )
+            _LOGGER.debug("Loaded highscores")
+        return self._highscore_tracker
+    
+    @_highscores.setter
+    def _highscores(self, tracker: HighscoreTracker) -> None:
+        """Replace the highscore tables."""
+        self._highscore_data = None
+        self._highscore_tracker = tracker
+        self._highscores_json = None
     
     async def load_state(self) -> None:
-        """Load game state from storage."""
+        """Load game state from storage.
+        
+        Runs as a background task during setup; ``async_wait_ready`` returns
+        once it finishes, whether or not loading succeeded. Highscores are
+        only deserialized when first used.
+        """
         try:
+            await self._storage.async_setup()
+            await self._archive.async_setup()
+            if (self.storage_backend != STORAGE_BACKEND_JSON and
+                await self._storage.async_is_empty()):
+                await self._migrate_from_json()
+            state_data, highscore_data = await self._storage.async_load_snapshot()
+            
             # Load game state
-            state_data = await self._store_state.async_load()
             if state_data:
                 self._game_state = self._deserialize_game_state(state_data)
+                self._history = RoundHistory.from_rounds(
+                    len(self._game_state.teams), self._game_state.rounds_played
+                )
                 _LOGGER.debug("Loaded game state: %s", self._game_state.game_id)
+                if self._game_state.is_active:
+                    self._start_keepalive()
             
-            # Load highscores
-            highscore_data = await self._store_highscores.async_load()
-            if highscore_data:
-                self._highscores = self._deserialize_highscores(highscore_data)
-                _LOGGER.debug("Loaded highscores")
+            # Keep highscores raw until they are needed
+            self._highscore_data = highscore_data
+            self._highscores_json = None
         except Exception as err:
             _LOGGER.error("Error loading state: %s", err)
+        finally:
+            self._ready.set()
     
     async def save_state(self) -> None:
         """Save game state to storage."""
+        if not self.ready:
+            # Saving now would overwrite state that has not been loaded yet
+            _LOGGER.debug("Skipping save before stored state is loaded")
+            return
+        
         try:
-            # Save game state
+            state_data = None
             if self._game_state:
-                await self._store_state.async_save(
-                    self._serialize_game_state(self._game_state)
-                )
+                state_data = self._serialize_game_state(self._game_state)
             
-            # Save highscores
-            await self._store_highscores.async_save(
-                self._serialize_highscores(self._highscores)
-            )
+            if self._storage.incremental and not self._history_replaced:
+                # Finished rounds and highscores were already appended by end_round
+                await self._storage.async_save_game(state_data)
+            else:
+                # Highscores nobody has touched yet are written back as loaded
+                highscore_data = self._highscore_data
+                if highscore_data is None:
+                    highscore_data = self._serialize_highscores(self._highscores)
+                await self._storage.async_save_snapshot(state_data, highscore_data)
+            self._history_replaced = False
         except Exception as err:
             _LOGGER.error("Error saving state: %s", err)
     
+    async def _migrate_from_json(self) -> None:
+        """Import the JSON stores into an empty storage backend."""
+        json_store = JsonStoreBackend(self.hass, f"{DOMAIN}.{self.entry.entry_id}")
+        state_data, highscore_data = await json_store.async_load_snapshot()
+        if state_data or highscore_data:
+            _LOGGER.info(
+                "Migrating Soundbeats history from JSON storage to %s", self.storage_backend
+            )
+            await self._storage.async_save_snapshot(state_data, highscore_data)
+    
+    async def async_close(self) -> None:
+        """Stop the keepalive and release storage resources."""
+        self._stop_keepalive()
+        await self._storage.async_close()
+    
+    async def async_query_history(self, **filters: Any) -> List[Dict[str, Any]]:
+        """Query stored and archived games, newest first."""
+        return [game async for game in self.async_iter_history(**filters)]
+    
+    async def async_iter_history(
+        self, limit: Optional[int] = None, **filters: Any
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield stored and archived games, newest first.
+        
+        Stored games are read a page at a time and archived games are only
+        read and decompressed when their turn comes. Games both stored and
+        archived are yielded once.
+        """
+        stored = self._async_iter_stored(**filters)
+        rows = iter(self._archive.games(**filters))
+        stored_ids: Set[str] = set()
+        count = 0
+        try:
+            game = await anext(stored, None)
+            row = next(rows, None)
+            while (game or row) and (limit is None or count < limit):
+                # On equal dates the stored copy goes first, so the archived
+                # copy of the same game can be recognized and skipped
+                if game and (
+                    row is None
+                    or parse_timestamp(game["created_at"]) >= parse_timestamp(row["date"])
+                ):
+                    stored_ids.add(game["game_id"])
+                    yield game
+                    count += 1
+                    if limit is None or count < limit:
+                        game = await anext(stored, None)
+                    continue
+                
+                if row["game_id"] not in stored_ids:
+                    yield await self._archive.async_read(row)
+                    count += 1
+                row = next(rows, None)
+        finally:
+            await stored.aclose()
+    
+    async def _async_iter_stored(self, **filters: Any) -> AsyncIterator[Dict[str, Any]]:
+        """Yield stored games newest first, one page at a time."""
+        after = None
+        while True:
+            games = await self._storage.async_query_history(
+                limit=HISTORY_PAGE_SIZE, after=after, **filters
+            )
+            for game in games:
+                yield game
+            if len(games) < HISTORY_PAGE_SIZE:
+                return
+            after = (games[-1]["created_at"], games[-1]["game_id"])
+    
+    async def async_benchmark_storage(
+        self,
+        history_sizes: Sequence[int] = BENCHMARK_HISTORY_SIZES,
+        backends: Sequence[str] = STORAGE_BACKENDS,
+    ) -> List[Dict[str, Any]]:
+        """Benchmark every storage backend on synthetic histories.
+        
+        The histories are built and serialized in the executor.
+        """
+        results = []
+        for size in history_sizes:
+            state, highscores, updates = await self.hass.async_add_executor_job(
+                self._benchmark_data, size
+            )
+            for kind in backends:
+                results.append(await async_benchmark_backend(
+                    self.hass,
+                    kind,
+                    f"{DOMAIN}.{self.entry.entry_id}.benchmark",
+                    state,
+                    highscores,
+                    updates,
+                ))
+        return results
+    
+    def _benchmark_data(self, size: int) -> Tuple[Dict, Dict, List[BenchmarkUpdate]]:
+        """Build a serialized game with ``size`` rounds plus rounds to save on top."""
+        teams = [
+            Team(id=f"team_{i}", name=f"Team {i + 1}") for i in range(DEFAULT_MAX_TEAMS)
+        ]
+        game = GameState(
+            game_id="benchmark",
+            teams=teams,
+            current_round=0,
+            rounds_played=[],
+            playlist_id="benchmark",
+            played_song_ids=[],
+        )
+        tracker = HighscoreTracker()
+        state_data = highscore_data = None
+        updates = []
+        
+        for number in range(1, size + BENCHMARK_SAVES + 1):
+            round_data = GameRound.for_teams(
+                len(teams),
+                round_number=number,
+                song_id=number,
+                actual_year=1950 + number * 7 % 70,
+            )
+            for ordinal in range(len(teams)):
+                round_data.guesses[ordinal] = round_data.actual_year + (number + ordinal) % 9 - 4
+                round_data.bets[ordinal] = (number + ordinal) % 5 == 0
+            round_data.scores = self._scoring.score_round(
+                round_data.guesses, round_data.bets, round_data.actual_year
+            )
+            game.rounds_played.append(round_data)
+            game.played_song_ids.append(number)
+            game.current_round = number
+            
+            entries = []
+            for team, score in zip(teams, round_data.scores):
+                team.score += score
+                entry = HighscoreEntry(
+                    team_name=team.name,
+                    score_per_round=team.score / number,
+                    rounds_played=number,
+                    date=round_data.timestamp,
+                    playlist_id=game.playlist_id,
+                    game_id=game.game_id,
+                    timer_seconds=game.timer_seconds,
+                    team_count=len(teams),
+                )
+                tracker.add(entry)
+                entries.append(self._serialize_entry(entry))
+            
+            if number == size:
+                state_data = self._serialize_game_state(game)
+                highscore_data = self._serialize_highscores(tracker)
+            elif number > size:
+                updates.append((
+                    self._serialize_game_state(game),
+                    self._serialize_round(round_data, game.team_ids),
+                    entries,
+                    self._serialize_highscores(tracker),
+                ))
+        
+        return state_data, highscore_data, updates
+    
     async def new_game(
         self, team_count: int, playlist_id: str, timer_seconds: int = 30
     ) -> GameState:
         """Start a new game."""
         async with self._lock:
-            # Stop any active timer
+            # Stop any active timer and the previous game's pipeline
             if self._timer_task:
                 self._timer_task.cancel()
+            self._cancel_auto_advance()
+            
+            # Archive the previous game before it is replaced
+            if self._game_state and self._game_state.rounds_played:
+                try:
+                    await self._archive.async_archive(
+                        self._serialize_game_state(self._game_state)
+                    )
+                except Exception as err:
+                    _LOGGER.error("Error archiving game: %s", err)
             
             # Create teams
             teams = [
@@ -184,6 +778,7 @@ class GameManager:
                 is_active=True,
             )
             
+            self._history = RoundHistory(team_count)
             self._round_active = False
             self._timer_remaining = 0
             
@@ -191,16 +786,35 @@ class GameManager:
             await self.save_state()
             await self._broadcast_state_change("game_started")
             
+            # Get the first song ready while teams are set up
+            self.start_prefetch()
+            self._start_keepalive()
+            
             return self._game_state
     
-    async def start_round(self, song: Dict[str, Any]) -> None:
-        """Start a new round."""
-        if not self._game_state or not self._game_state.is_active:
-            raise ValueError("No active game")
+    async def start_round(self, song: Dict[str, Any], with_playback: bool = False) -> None:
+        """Start a new round.
         
+        With ``with_playback`` and the timer-on-audio option enabled, the
+        countdown waits for the background playback job to report that the
+        snippet is playing; see ``_async_play``.
+        """
         async with self._lock:
+            if not self._game_state or not self._game_state.is_active:
+                raise ValueError("No active game")
+            if self._round_active:
+                raise ValueError("A round is already active")
+            
+            self._start_keepalive()
+            
+            # A prefetch still running would pick for a round already started
+            if self._prefetch_task and not self._prefetch_task.done():
+                self._prefetch_task.cancel()
+            self._next_song = None
+            
             # Increment round
             self._game_state.current_round += 1
+            self._round_ended.clear()
             
             # Reset team guesses
             for team in self._game_state.teams:
@@ -211,12 +825,146 @@ class GameManager:
             self._current_song = song
             self._game_state.played_song_ids.append(song["id"])
             
-            # Start timer
+            # Start timer, unless it waits for the audio
             self._round_active = True
             self._timer_remaining = self._game_state.timer_seconds
-            self._timer_task = asyncio.create_task(self._run_timer())
+            self._timer_task = None
+            wait_for_audio = with_playback and self.entry.options.get(
+                CONF_TIMER_ON_AUDIO, DEFAULT_TIMER_ON_AUDIO
+            )
+            if not wait_for_audio:
+                self._start_timer()
             
-            await self._broadcast_state_change("round_started")
+            await self._broadcast_state_change("round_started", {
+                "timer_started": not wait_for_audio,
+            })
+    
+    async def async_next_song(self) -> Dict[str, Any]:
+        """Get the song for the next round, picking one now if none was prefetched."""
+        if not self._game_state or not self._game_state.is_active:
+            raise ValueError("No active game")
+        
+        song = self._next_song or await self._catalog.async_pick(
+            self._game_state.playlist_id, self._game_state.played_song_ids
+        )
+        if song is None:
+            raise ValueError("No more songs available in this playlist")
+        return song
+    
+    def start_prefetch(self) -> None:
+        """Pick the next song and get the media player ready for it.
+        
+        Runs as a background job during the reveal, so the next round only
+        has to issue the play command. Broadcasts ``next_song_ready`` once
+        done; the song itself stays server-side until the round starts.
+        """
+        if self._prefetch_task and not self._prefetch_task.done():
+            self._prefetch_task.cancel()
+        
+        self._prefetch_task = self.entry.async_create_background_task(
+            self.hass,
+            self._async_prefetch(self._get_media_controller()),
+            f"{DOMAIN}_prefetch_{self.entry.entry_id}",
+        )
+    
+    async def _async_prefetch(self, media_controller: Optional[MediaController]) -> None:
+        """Pick the next song and prepare the player for it."""
+        self._next_song = song = await self._catalog.async_pick(
+            self._game_state.playlist_id, self._game_state.played_song_ids
+        )
+        if song is None:
+            return
+        
+        prepared = False
+        if media_controller:
+            result = await media_controller.prepare_snippet(
+                self.track_url(song, media_controller)
+            )
+            prepared = result.success
+            if not result.success:
+                _LOGGER.warning("Failed to prepare media player: %s", result.error)
+        
+        await self._broadcast_state_change("next_song_ready", {"prepared": prepared})
+    
+    def track_url(self, song: Dict[str, Any], media_controller: MediaController) -> str:
+        """Get the URL to play a song from.
+        
+        That is the song's local snippet when local snippets are enabled,
+        one exists and the player can fetch it directly, else the song's
+        own streaming URL.
+        """
+        entry_data = self.hass.data.get(DOMAIN, {}).get(self.entry.entry_id, {})
+        snippet_store = entry_data.get("snippet_store")
+        if snippet_store and not media_controller.supports_spotify():
+            return snippet_store.url(song["id"]) or song["url"]
+        return song["url"]
+    
+    def _start_timer(self, started_at: Optional[datetime] = None) -> None:
+        """Start the countdown, anchored to when the audio started if known."""
+        if started_at is not None:
+            # Time between the player starting and us hearing about it
+            elapsed = max(0.0, (dt_util.utcnow() - started_at).total_seconds())
+            self._timer_remaining = max(1, self._timer_remaining - round(elapsed))
+        self._timer_task = asyncio.create_task(self._run_timer())
+    
+    def start_playback(self, media_controller: MediaController, track_url: str) -> None:
+        """Play the round's snippet as a background job.
+        
+        Returns right away; progress is broadcast as ``playback_starting``,
+        then ``playback_started`` or ``playback_failed``. Starting playback
+        again abandons the previous job.
+        """
+        if self._playback_task and not self._playback_task.done():
+            self._playback_task.cancel()
+        
+        self._playback_task = self.entry.async_create_background_task(
+            self.hass,
+            self._async_play(media_controller, track_url),
+            f"{DOMAIN}_playback_{self.entry.entry_id}",
+        )
+    
+    async def _async_play(self, media_controller: MediaController, track_url: str) -> None:
+        """Play a snippet and broadcast its progress."""
+        self._playback_status = PLAYBACK_STARTING
+        await self._broadcast_state_change(PLAYBACK_STARTING)
+        
+        # A player stuck behind other media commands must not hold the round
+        timeout = media_controller.playback_timeout * (
+            PLAYBACK_TIMEOUT_STEPS + media_controller.queued_commands
+        )
+        try:
+            async with asyncio.timeout(timeout):
+                result = await media_controller.play_snippet(
+                    track_url=track_url,
+                    duration=self._game_state.timer_seconds,
+                )
+        except TimeoutError:
+            # The play command may still be queued or starting; stop it so
+            # the snippet can't be heard after the round gave up on it
+            self.entry.async_create_background_task(
+                self.hass,
+                media_controller.stop_playback(),
+                f"{DOMAIN}_stop_playback_{self.entry.entry_id}",
+            )
+            result = PlaybackResult(
+                success=False, error=f"Playback did not start within {timeout:g} seconds"
+            )
+        
+        # A round waiting for the audio starts its timer now; when playback
+        # failed or was never confirmed within the timeout, it starts anyway
+        if self._round_active and self._timer_task is None:
+            self._start_timer(result.started_at)
+            await self._broadcast_state_change("timer_started")
+        
+        if result.success:
+            self._playback_status = PLAYBACK_STARTED
+            await self._broadcast_state_change(PLAYBACK_STARTED, {
+                "media_player_state": result.media_player_state,
+            })
+        else:
+            _LOGGER.warning("Failed to start music playback: %s", result.error)
+            self._playback_status = PLAYBACK_FAILED
+            await self._broadcast_state_change(PLAYBACK_FAILED, {"error": result.error})
     
     async def submit_guess(self, team_id: str, year: int, has_bet: bool) -> None:
         """Submit a team's guess."""
@@ -274,49 +1022,53 @@ class GameManager:
         
         async with self._lock:
             self._round_active = False
+            self._round_ended.set()
             
-            # Cancel timer
-            if self._timer_task:
+            # Cancel timer, unless the round ended because it ran out
+            if self._timer_task and self._timer_task is not asyncio.current_task():
                 self._timer_task.cancel()
             
             # Create round record
-            round_data = GameRound(
+            round_data = GameRound.for_teams(
+                len(self._game_state.teams),
                 round_number=self._game_state.current_round,
                 song_id=self._current_song["id"],
                 actual_year=self._current_song["year"],
             )
             
-            # Calculate scores
-            for team in self._game_state.teams:
+            # Calculate all team scores in one pass
+            teams = self._game_state.teams
+            for ordinal, team in enumerate(teams):
                 if team.current_guess is not None:
-                    score = self.calculate_score(
-                        team.current_guess,
-                        self._current_song["year"],
-                        team.has_bet
-                    )
-                    team.score += score
-                    round_data.team_guesses[team.id] = team.current_guess
-                    round_data.team_bets[team.id] = team.has_bet
-                    round_data.team_scores[team.id] = score
+                    round_data.guesses[ordinal] = team.current_guess
+                    round_data.bets[ordinal] = team.has_bet
+            round_data.scores = self._scoring.score_round(
+                round_data.guesses, round_data.bets, round_data.actual_year
+            )
+            for team, score in zip(teams, round_data.scores):
+                team.score += score
             
             # Add round to history
             self._game_state.rounds_played.append(round_data)
+            self._history.append(round_data)
             
             # Update highscores after each round
-            await self._update_highscores()
+            entries = await self._update_highscores()
+            if self._storage.incremental:
+                await self._storage.async_append_round(
+                    self._game_state.game_id,
+                    self._serialize_round(round_data, self._game_state.team_ids),
+                    [self._serialize_entry(entry) for entry in entries],
+                )
             
             # Save state
             await self.save_state()
             
             # Fetch album art from media player
             album_art_url = None
-            domain_data = self.hass.data.get(DOMAIN, {})
-            entry_data = domain_data.get(self.entry.entry_id, {})
-            media_player_entity = entry_data.get("media_player")
+            media_controller = self._get_media_controller()
             
-            if media_player_entity:
-                from .media_controller import MediaController
-                media_controller = MediaController(self.hass, media_player_entity)
+            if media_controller:
                 try:
                     album_art_url = await media_controller.get_current_album_art()
                 except Exception as e:
@@ -331,93 +1083,298 @@ class GameManager:
                     **self._current_song,
                     "image_url": album_art_url  # Add fetched album art
                 },
-                "round_scores": round_data.team_scores,
+                "round_scores": round_data.team_scores(self._game_state.team_ids),
             })
             
             await self._broadcast_state_change("round_ended")
+            
+            # Prepare the next round while the answer is revealed
+            self.start_prefetch()
     
     async def next_round(self) -> None:
         """Prepare for next round (admin action)."""
         async with self._lock:
             self._current_song = None
             self._timer_remaining = 0
+            self._playback_status = None
+            
+            # The reveal is over; stop its track now rather than when the
+            # next round starts, so that round only has to press play
+            media_controller = self._get_media_controller()
+            if media_controller and media_controller.get_current_state().get("state") in (
+                STATE_PLAYING, STATE_PAUSED
+            ):
+                self.entry.async_create_background_task(
+                    self.hass,
+                    media_controller.stop_playback(),
+                    f"{DOMAIN}_stop_reveal_{self.entry.entry_id}",
+                )
+            
             await self._broadcast_state_change("ready_for_next_round")
     
-    def calculate_score(self, guess: int, actual: int, has_bet: bool) -> int:
-        """Calculate score based on guess accuracy and betting."""
-        diff = abs(guess - actual)
+    @property
+    def auto_advance(self) -> Optional[str]:
+        """Get whether the auto-advance pipeline is running, paused or off."""
+        if not self._auto_advance_task or self._auto_advance_task.done():
+            return None
+        if self._auto_advance_resumed.is_set():
+            return AUTO_ADVANCE_RUNNING
+        return AUTO_ADVANCE_PAUSED
+    
+    async def start_auto_advance(self, reveal_seconds: Optional[int] = None) -> None:
+        """Run rounds back to back until paused, stopped or out of songs.
         
-        if has_bet:
-            # With bet: exact or nothing
-            return POINTS_EXACT_WITH_BET if diff == 0 else POINTS_WRONG_WITH_BET
-        else:
-            # Without bet: graduated points
-            if diff == 0:
-                return POINTS_EXACT_YEAR
-            elif diff <= 3:
-                return POINTS_WITHIN_3_YEARS
-            elif diff <= 5:
-                return POINTS_WITHIN_5_YEARS
-            else:
-                return 0
+        Each round starts as soon as the previous reveal is over, with the
+        song picked and the player prepared during that reveal, and ends
+        when its timer runs out. The reveal lasts ``reveal_seconds``, by
+        default the reveal duration option. Starting an already running
+        pipeline resumes it.
+        """
+        if not self._game_state or not self._game_state.is_active:
+            raise ValueError("No active game")
+        
+        self._auto_advance_resumed.set()
+        if self.auto_advance is None:
+            if reveal_seconds is None:
+                reveal_seconds = self.entry.options.get(
+                    CONF_REVEAL_SECONDS, DEFAULT_REVEAL_SECONDS
+                )
+            self._auto_advance_task = self.entry.async_create_background_task(
+                self.hass,
+                self._async_auto_advance(reveal_seconds),
+                f"{DOMAIN}_auto_advance_{self.entry.entry_id}",
+            )
+        await self._broadcast_auto_advance()
     
-    def get_state(self) -> Dict[str, Any]:
-        """Get current game state."""
-        if not self._game_state:
-            return {
-                "active": False,
-                "game_id": None,
-            }
+    async def pause_auto_advance(self) -> None:
+        """Hold the pipeline once the current round and its reveal are done."""
+        if self.auto_advance is None:
+            return
+        self._auto_advance_resumed.clear()
+        await self._broadcast_auto_advance()
+    
+    async def stop_auto_advance(self) -> None:
+        """Stop the pipeline; a round in progress plays out as usual."""
+        self._cancel_auto_advance()
+        await self._broadcast_auto_advance()
+    
+    def _cancel_auto_advance(self) -> None:
+        """Cancel the auto-advance pipeline."""
+        if self._auto_advance_task and not self._auto_advance_task.done():
+            self._auto_advance_task.cancel()
+        self._auto_advance_task = None
+    
+    async def _async_auto_advance(self, reveal_seconds: int) -> None:
+        """Start, reveal and advance rounds on a fixed cadence."""
+        while self._game_state and self._game_state.is_active:
+            await self._auto_advance_resumed.wait()
+            
+            # A round started by hand is played out before the next one
+            if not self._round_active:
+                try:
+                    song = await self.async_next_song()
+                except ValueError:
+                    _LOGGER.info("Auto-advance stopped: no more songs in the playlist")
+                    break
+                media_controller = self._get_media_controller()
+                try:
+                    await self.start_round(song, with_playback=media_controller is not None)
+                except ValueError:
+                    # Lost the race to a round started by hand while picking
+                    if not self._round_active:
+                        break
+                else:
+                    if media_controller:
+                        self.start_playback(
+                            media_controller, self.track_url(song, media_controller)
+                        )
+            await self._round_ended.wait()
+            
+            # The next song is prefetched while the answer is shown
+            await asyncio.sleep(reveal_seconds)
+            await self.next_round()
         
-        return {
-            "active": self._game_state.is_active,
-            "game_id": self._game_state.game_id,
-            "teams": [asdict(team) for team in self._game_state.teams],
-            "current_round": self._game_state.current_round,
-            "round_active": self._round_active,
-            "timer_remaining": self._timer_remaining,
-            "timer_seconds": self._game_state.timer_seconds,
-            "playlist_id": self._game_state.playlist_id,
-            "current_song": self._current_song if not self._round_active else None,
-            "highscore_current_round": self._get_highscore_for_round(
-                self._game_state.current_round
-            ),
-        }
+        self._auto_advance_task = None
+        await self._broadcast_auto_advance()
+    
+    async def _broadcast_auto_advance(self) -> None:
+        """Broadcast the auto-advance pipeline's state."""
+        await self._broadcast_state_change("auto_advance_changed", {
+            "auto_advance": self.auto_advance,
+        })
+    
+    async def async_set_scoring_rules(self, rules: ScoringRules) -> None:
+        """Switch scoring rules, re-scoring the history and rebuilding highscores.
+        
+        The current game, the games the storage backend keeps and the
+        archived games are all re-scored and written back, one game at a
+        time, so the highscores never mix old and new rules. Entries whose
+        game is gone, or that predate game IDs, are carried over as they are.
+        """
+        await self.async_wait_ready()
+        if rules == self._scoring.rules:
+            return
+        
+        async with self._lock:
+            self._scoring = ScoringEngine(rules)
+            tracker = HighscoreTracker()
+            rescored_ids: Set[str] = set()
+            if self._game_state:
+                rescored_ids.add(self._game_state.game_id)
+            
+            async for data in self._async_iter_stored():
+                if data["game_id"] in rescored_ids:
+                    continue
+                data, entries = await self.hass.async_add_executor_job(
+                    self._rescore_game_data, data, tracker
+                )
+                await self._storage.async_replace_game(data, entries)
+                rescored_ids.add(data["game_id"])
+            
+            # Archived games also kept by the storage backend were counted above
+            for row in self._archive.games():
+                data = await self._archive.async_read(row)
+                data, _ = await self.hass.async_add_executor_job(
+                    self._rescore_game_data,
+                    data,
+                    None if row["game_id"] in rescored_ids else tracker,
+                )
+                await self._archive.async_replace(data)
+                rescored_ids.add(row["game_id"])
+            
+            if self._game_state:
+                scores, entries = await self.hass.async_add_executor_job(
+                    rescore_game, self._scoring, self._game_state
+                )
+                apply_scores(self._game_state, scores)
+                self._history = RoundHistory.from_rounds(
+                    len(self._game_state.teams), self._game_state.rounds_played
+                )
+                for entry in entries:
+                    tracker.add(entry)
+                await self._storage.async_replace_game(
+                    self._serialize_game_state(self._game_state),
+                    [self._serialize_entry(entry) for entry in entries],
+                )
+            
+            await self.hass.async_add_executor_job(
+                carry_over_highscores, self._highscores, tracker, rescored_ids
+            )
+            self._highscores = tracker
+            self._history_replaced = True
+            _LOGGER.info("Re-scored %d game(s) with new scoring rules", len(rescored_ids))
+            await self.save_state()
+            await self._broadcast_state_change("scores_recalculated")
+    
+    def _rescore_game_data(
+        self, data: Dict[str, Any], tracker: Optional[HighscoreTracker]
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Re-score a serialized game, adding its entries to ``tracker`` if given (executor)."""
+        game = self._deserialize_game_state(data)
+        scores, entries = rescore_game(self._scoring, game)
+        apply_scores(game, scores)
+        if tracker is not None:
+            for entry in entries:
+                tracker.add(entry)
+        return (
+            self._serialize_game_state(game),
+            [self._serialize_entry(entry) for entry in entries],
+        )
+    
+    def calculate_score(self, guess: int, actual: int, has_bet: bool) -> int:
+        """Calculate score based on guess accuracy and betting."""
+        return self._scoring.score(guess, actual, has_bet)
+    
+    def get_state(self, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Get current game state, optionally only the given fields."""
+        return self._project_state(fields, None)
     
-    def get_filtered_state(self, user_id: str) -> Dict[str, Any]:
+    def get_filtered_state(
+        self, user_id: str, fields: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
         """Get game state filtered for a specific user."""
-        state = self.get_state()
+        state = self._project_state(fields, user_id)
         
         if not state["active"]:
             return state
         
         # Find user's team
-        user_team_id = None
-        for team in self._game_state.teams:
-            if team.assigned_user == user_id:
-                user_team_id = team.id
-                break
+        user_team = self.get_user_team(user_id)
         
         # Filter teams to only show user's team controls
-        if user_team_id:
-            state["user_team_id"] = user_team_id
-            state["can_control_teams"] = [user_team_id]
+        if user_team:
+            state["user_team_id"] = user_team.id
+            state["can_control_teams"] = [user_team.id]
         else:
             state["can_control_teams"] = []
         
         return state
     
+    def _project_state(
+        self, fields: Optional[Sequence[str]], user_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """Build the game state from the serializer for the requested fields."""
+        if not self._game_state:
+            return {
+                "active": False,
+                "game_id": None,
+            }
+        
+        serializer = _state_serializer(None if fields is None else tuple(fields))
+        return {
+            name: getter(self, self._game_state, user_id)
+            for name, getter in serializer
+        }
+    
     def get_highscores(self) -> Dict[str, Any]:
         """Get highscore data."""
         return {
-            "all_time_best": asdict(self._highscores.all_time_best) 
+            "all_time_best": self._highscores.all_time_best.to_dict()
                 if self._highscores.all_time_best else None,
             "by_round": {
-                str(round_num): [asdict(entry) for entry in entries]
+                str(round_num): [entry.to_dict() for entry in entries]
                 for round_num, entries in self._highscores.by_round.items()
             },
         }
     
+    def get_highscores_json(self) -> bytes:
+        """Get the highscore response as encoded JSON.
+        
+        The payload is built once and reused until the highscores change, so
+        every client asking for it shares one serialization.
+        """
+        if self._highscores_json is None:
+            self._highscores_json = json_bytes(self.get_highscores())
+        return self._highscores_json
+    
+    def get_leaderboard(
+        self, offset: int = 0, limit: int = 10, **filters: Any
+    ) -> Dict[str, Any]:
+        """Get one page of the leaderboard matching the given dimensions."""
+        if filters.get("timer_seconds") is not None:
+            filters["timer_bucket"] = timer_bucket(filters["timer_seconds"])
+        filters.pop("timer_seconds", None)
+        
+        # Fetch one extra entry to tell whether another page exists
+        entries = self._highscores.leaderboard.query(
+            offset=offset, limit=limit + 1, **filters
+        )
+        return {
+            "entries": [
+                self._serialize_entry(entry) for entry in entries[:limit]
+            ],
+            "offset": offset,
+            "limit": limit,
+            "has_more": len(entries) > limit,
+        }
+    
+    def get_round_stats(self) -> Dict[str, Any]:
+        """Get analytical statistics over the rounds played this game."""
+        if not self._game_state:
+            return {"rounds": 0, "teams": {}, "by_decade": {}}
+        
+        return self._history.summary(self._game_state.team_ids)
+    
     async def _run_timer(self) -> None:
         """Run the countdown timer."""
         try:
@@ -437,12 +1394,13 @@ class GameManager:
         except asyncio.CancelledError:
             pass
     
-    async def _update_highscores(self) -> None:
+    async def _update_highscores(self) -> List[HighscoreEntry]:
         """Update highscores after a round."""
         if not self._game_state:
-            return
+            return []
         
         round_num = self._game_state.current_round
+        entries = []
         
         # Calculate score per round for each team
         for team in self._game_state.teams:
@@ -455,22 +1413,15 @@ class GameManager:
                     rounds_played=round_num,
                     date=dt_util.now(),
                     playlist_id=self._game_state.playlist_id,
+                    game_id=self._game_state.game_id,
+                    timer_seconds=self._game_state.timer_seconds,
+                    team_count=len(self._game_state.teams),
                 )
-                
-                # Update round-specific highscores
-                if round_num not in self._highscores.by_round:
-                    self._highscores.by_round[round_num] = []
-                
-                # Keep top 10 scores per round
-                round_scores = self._highscores.by_round[round_num]
-                round_scores.append(entry)
-                round_scores.sort(key=lambda x: x.score_per_round, reverse=True)
-                self._highscores.by_round[round_num] = round_scores[:10]
-                
-                # Update all-time best
-                if (not self._highscores.all_time_best or 
-                    score_per_round > self._highscores.all_time_best.score_per_round):
-                    self._highscores.all_time_best = entry
+                self._highscores.add(entry)
+                entries.append(entry)
+        
+        self._highscores_json = None
+        return entries
     
     def _get_team(self, team_id: str) -> Optional[Team]:
         """Get team by ID."""
@@ -482,11 +1433,52 @@ class GameManager:
                 return team
         return None
     
-    def _get_highscore_for_round(self, round_num: int) -> Optional[Dict[str, Any]]:
+    def _get_media_controller(self) -> Optional[MediaController]:
+        """Get the entry's media controller, if a media player is configured."""
+        entry_data = self.hass.data.get(DOMAIN, {}).get(self.entry.entry_id, {})
+        return entry_data.get("media_controller")
+    
+    def _start_keepalive(self) -> None:
+        """Keep the media player's Spotify device selected while rounds are played.
+        
+        Stops once no round has started for ``SPOTIFY_KEEPALIVE_IDLE_TIMEOUT``
+        seconds; the next round starts it again.
+        """
+        media_controller = self._get_media_controller()
+        if not media_controller:
+            return
+        
+        media_controller.start_keepalive()
+        if self._keepalive_idle_unsub:
+            self._keepalive_idle_unsub()
+        self._keepalive_idle_unsub = async_call_later(
+            self.hass, SPOTIFY_KEEPALIVE_IDLE_TIMEOUT, self._stop_keepalive
+        )
+    
+    @callback
+    def _stop_keepalive(self, now: Optional[datetime] = None) -> None:
+        """Stop keeping the media player's Spotify device selected."""
+        if self._keepalive_idle_unsub:
+            self._keepalive_idle_unsub()
+            self._keepalive_idle_unsub = None
+        if media_controller := self._get_media_controller():
+            media_controller.stop_keepalive()
+    
+    def get_user_team(self, user_id: Optional[str]) -> Optional[Team]:
+        """Get the team assigned to a user."""
+        if not self._game_state or user_id is None:
+            return None
+        
+        for team in self._game_state.teams:
+            if team.assigned_user == user_id:
+                return team
+        return None
+    
+    def get_highscore_for_round(self, round_num: int) -> Optional[Dict[str, Any]]:
         """Get best highscore for a specific round number."""
-        if round_num in self._highscores.by_round and self._highscores.by_round[round_num]:
-            best = self._highscores.by_round[round_num][0]
-            return asdict(best)
+        round_scores = self._highscores.by_round.get(round_num)
+        if round_scores and round_scores.best:
+            return round_scores.best.to_dict()
         return None
     
     @callback
@@ -503,67 +1495,107 @@ class GameManager:
     
     def _serialize_game_state(self, state: GameState) -> Dict[str, Any]:
         """Serialize game state for storage."""
-        data = asdict(state)
-        # Convert datetime objects to ISO format
-        data["created_at"] = state.created_at.isoformat()
-        for round_data in data["rounds_played"]:
-            round_data["timestamp"] = round_data["timestamp"].isoformat()
-        return data
+        return state.to_dict()
+    
+    def _serialize_round(self, round_data: GameRound, team_ids: Sequence[str]) -> Dict[str, Any]:
+        """Serialize a round for storage."""
+        return round_data.to_dict(team_ids)
     
     def _deserialize_game_state(self, data: Dict[str, Any]) -> GameState:
         """Deserialize game state from storage."""
-        # Convert ISO strings back to datetime
-        data["created_at"] = datetime.fromisoformat(data["created_at"])
-        
-        # Convert team dicts to Team objects
-        data["teams"] = [Team(**team_data) for team_data in data["teams"]]
-        
-        # Convert round dicts to GameRound objects
-        rounds = []
-        for round_data in data["rounds_played"]:
-            round_data["timestamp"] = datetime.fromisoformat(round_data["timestamp"])
-            rounds.append(GameRound(**round_data))
-        data["rounds_played"] = rounds
-        
-        return GameState(**data)
+        return GameState.from_dict(data)
+    
+    def _serialize_entry(self, entry: HighscoreEntry) -> Dict[str, Any]:
+        """Serialize a highscore entry."""
+        return entry.to_dict()
     
     def _serialize_highscores(self, highscores: HighscoreTracker) -> Dict[str, Any]:
         """Serialize highscores for storage."""
         data = {
-            "all_time_best": asdict(highscores.all_time_best) 
+            "all_time_best": self._serialize_entry(highscores.all_time_best)
                 if highscores.all_time_best else None,
-            "by_round": {},
+            "by_round": {
+                str(round_num): [self._serialize_entry(entry) for entry in entries]
+                for round_num, entries in highscores.by_round.items()
+            },
+            "leaderboard": [
+                self._serialize_entry(entry) for entry in highscores.leaderboard
+            ],
         }
         
-        # Convert datetime in all entries
-        if data["all_time_best"]:
-            data["all_time_best"]["date"] = data["all_time_best"]["date"].isoformat()
-        
-        for round_num, entries in highscores.by_round.items():
-            data["by_round"][str(round_num)] = []
-            for entry in entries:
-                entry_dict = asdict(entry)
-                entry_dict["date"] = entry.date.isoformat()
-                data["by_round"][str(round_num)].append(entry_dict)
-        
         return data
     
     def _deserialize_highscores(self, data: Dict[str, Any]) -> HighscoreTracker:
         """Deserialize highscores from storage."""
         highscores = HighscoreTracker()
         
-        # Deserialize all-time best
-        if data.get("all_time_best"):
-            best_data = data["all_time_best"]
-            best_data["date"] = datetime.fromisoformat(best_data["date"])
-            highscores.all_time_best = HighscoreEntry(**best_data)
-        
         # Deserialize by-round entries
-        for round_str, entries in data.get("by_round", {}).items():
-            round_num = int(round_str)
-            highscores.by_round[round_num] = []
+        for entries in data.get("by_round", {}).values():
             for entry_data in entries:
-                entry_data["date"] = datetime.fromisoformat(entry_data["date"])
-                highscores.by_round[round_num].append(HighscoreEntry(**entry_data))
+                highscores.add_to_rounds(HighscoreEntry.from_dict(entry_data))
+        
+        # Deserialize leaderboard, seeding it from the per-round tables
+        # for data saved before the leaderboard existed
+        if "leaderboard" in data:
+            for entry_data in data["leaderboard"]:
+                highscores.leaderboard.add(HighscoreEntry.from_dict(entry_data))
+        else:
+            for entries in highscores.by_round.values():
+                for entry in entries:
+                    highscores.leaderboard.add(entry)
         
-        return highscores
\ No newline at end of file
+        # Deserialize all-time best after the tables so the stored entry wins
+        if data.get("all_time_best"):
+            highscores.all_time_best = HighscoreEntry.from_dict(data["all_time_best"])
+        
+        return highscores
+
+
+def _user_team_dict(
+    manager: GameManager, game: GameState, user_id: Optional[str]
+) -> Optional[Dict[str, Any]]:
+    """Serialize the requesting user's team."""
+    team = manager.get_user_team(user_id)
+    return team.to_dict() if team else None
+
+
+# Getter per game state field, called with the manager, game and user ID
+StateGetter = Callable[[GameManager, GameState, Optional[str]], Any]
+STATE_GETTERS: Dict[str, StateGetter] = {
+    "active": lambda manager, game, user_id: game.is_active,
+    "game_id": lambda manager, game, user_id: game.game_id,
+    "teams": lambda manager, game, user_id: [team.to_dict() for team in game.teams],
+    "team": _user_team_dict,
+    "current_round": lambda manager, game, user_id: game.current_round,
+    "round_active": lambda manager, game, user_id: manager.round_active,
+    "timer_remaining": lambda manager, game, user_id: manager.timer_remaining,
+    "timer_seconds": lambda manager, game, user_id: game.timer_seconds,
+    "playback_status": lambda manager, game, user_id: manager.playback_status,
+    "next_song_ready": lambda manager, game, user_id: manager.next_song_ready,
+    "auto_advance": lambda manager, game, user_id: manager.auto_advance,
+    "playlist_id": lambda manager, game, user_id: game.playlist_id,
+    "current_song": lambda manager, game, user_id: (
+        manager.current_song if not manager.round_active else None
+    ),
+    "highscore_current_round": lambda manager, game, user_id: (
+        manager.get_highscore_for_round(game.current_round)
+    ),
+}
+# Fields of the unprojected game state
+DEFAULT_STATE_FIELDS = tuple(name for name in STATE_GETTERS if name != "team")
+
+
+@lru_cache(maxsize=64)
+def _state_serializer(
+    fields: Optional[Tuple[str, ...]]
+) -> Tuple[Tuple[str, StateGetter], ...]:
+    """Get the field getters for a projection, built once per field set.
+    
+    ``active`` is always included; fields without a getter, such as the
+    media player added by the websocket API, are skipped.
+    """
+    names = DEFAULT_STATE_FIELDS if fields is None else ("active", *fields)
+    return tuple(
+        (name, STATE_GETTERS[name]) for name in dict.fromkeys(names)
+        if name in STATE_GETTERS
+    )
\ No newline at end of file
@@ -0,0 +1,72 @@
+"""Media player latency profiles for Soundbeats."""
+from __future__ import annotations
+
+import math
+from statistics import median
+from typing import Any, Dict, Optional, Sequence
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    LATENCY_TIMEOUT_FACTOR,
+    MIN_PLAYBACK_TIMEOUT,
+    STORAGE_KEY_LATENCY,
+    STORAGE_VERSION,
+)
+
+
+def latency_stats(samples: Sequence[float]) -> Optional[Dict[str, float]]:
+    """Summarize latency samples in seconds."""
+    if not samples:
+        return None
+    
+    ordered = sorted(samples)
+    return {
+        "min": round(ordered[0], 3),
+        "median": round(median(ordered), 3),
+        "p90": round(ordered[math.ceil(0.9 * len(ordered)) - 1], 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def profile_timeout(
+    profile: Optional[Dict[str, Any]], operation: str, fallback: float
+) -> float:
+    """Get how long to wait for an operation given a player's profile.
+    
+    Uses a multiple of the measured 90th percentile, never more than the
+    configured fallback and never less than the minimum timeout.
+    """
+    stats = profile.get(operation) if profile else None
+    if not stats:
+        return fallback
+    return min(fallback, max(MIN_PLAYBACK_TIMEOUT, LATENCY_TIMEOUT_FACTOR * stats["p90"]))
+
+
+def expected_latency(profile: Optional[Dict[str, Any]], operation: str) -> Optional[float]:
+    """Get the typical latency of an operation, if it was measured."""
+    stats = profile.get(operation) if profile else None
+    return stats["median"] if stats else None
+
+
+class LatencyProfiles:
+    """Stored latency profiles of a config entry's media players, by entity ID."""
+    
+    def __init__(self, hass: HomeAssistant, key: str) -> None:
+        """Initialize the profiles."""
+        self._store = Store(hass, STORAGE_VERSION, f"{key}.{STORAGE_KEY_LATENCY}")
+        self._profiles: Dict[str, Dict[str, Any]] = {}
+    
+    async def async_load(self) -> None:
+        """Load stored profiles."""
+        self._profiles = await self._store.async_load() or {}
+    
+    def get(self, entity_id: str) -> Optional[Dict[str, Any]]:
+        """Get the profile of a media player."""
+        return self._profiles.get(entity_id)
+    
+    async def async_save_profile(self, profile: Dict[str, Any]) -> None:
+        """Store a media player's profile, replacing any earlier one."""
+        self._profiles[profile["entity_id"]] = profile
+        await self._store.async_save(self._profiles)
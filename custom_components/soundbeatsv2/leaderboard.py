@@ -0,0 +1,166 @@
+"""Leaderboard structures for Soundbeats."""
+from __future__ import annotations
+
+from bisect import bisect_left, insort_left
+from heapq import merge
+from itertools import islice
+from typing import (
+    Callable,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+from .const import TIMER_BUCKETS
+
+T = TypeVar("T")
+
+
+class LeaderboardKey(NamedTuple):
+    """Dimensions a leaderboard table is keyed on."""
+    
+    playlist_id: str
+    rounds: int
+    timer_bucket: int
+    team_count: int
+
+
+def timer_bucket(timer_seconds: Optional[int]) -> int:
+    """Map a timer length to the upper bound of its bucket (0 if unknown)."""
+    if not timer_seconds:
+        return 0
+    index = bisect_left(TIMER_BUCKETS, timer_seconds)
+    return TIMER_BUCKETS[min(index, len(TIMER_BUCKETS) - 1)]
+
+
+class TopK(Generic[T]):
+    """Bounded table holding the ``limit`` highest-scoring items.
+    
+    Items are kept in ascending score order so the lowest score (the floor)
+    sits at index 0. Items that do not beat the floor of a full table are
+    rejected in O(1); others are inserted with a binary search. Among equal
+    scores, earlier items rank higher.
+    """
+    
+    __slots__ = ("limit", "_key", "_items")
+    
+    def __init__(self, limit: int, key: Callable[[T], float]) -> None:
+        """Initialize an empty table."""
+        self.limit = limit
+        self._key = key
+        self._items: List[T] = []
+    
+    def __len__(self) -> int:
+        """Return the number of items held."""
+        return len(self._items)
+    
+    def __iter__(self) -> Iterator[T]:
+        """Iterate items from best to worst."""
+        return reversed(self._items)
+    
+    @property
+    def best(self) -> Optional[T]:
+        """Get the highest-scoring item."""
+        return self._items[-1] if self._items else None
+    
+    @property
+    def floor(self) -> Optional[float]:
+        """Get the score an item must beat once the table is full."""
+        if len(self._items) < self.limit:
+            return None
+        return self._key(self._items[0])
+    
+    def add(self, item: T) -> bool:
+        """Add an item, returning whether it made the table."""
+        floor = self.floor
+        if floor is not None and self._key(item) <= floor:
+            return False
+        
+        insort_left(self._items, item, key=self._key)
+        if len(self._items) > self.limit:
+            del self._items[0]
+        return True
+    
+    def as_list(self) -> List[T]:
+        """Get items from best to worst."""
+        return self._items[::-1]
+
+
+class LeaderboardIndex(Generic[T]):
+    """Bounded top-K tables keyed by playlist, rounds, timer bucket and team count.
+    
+    Each dimension keeps a value-to-keys index so a query only visits the
+    tables it matches; the matching tables are merged lazily, best first.
+    """
+    
+    def __init__(
+        self,
+        limit: int,
+        key: Callable[[T], LeaderboardKey],
+        score: Callable[[T], float],
+    ) -> None:
+        """Initialize an empty index."""
+        self.limit = limit
+        self._key = key
+        self._score = score
+        self._tables: Dict[LeaderboardKey, TopK[T]] = {}
+        self._dimensions: Tuple[Dict[object, Set[LeaderboardKey]], ...] = tuple(
+            {} for _ in LeaderboardKey._fields
+        )
+    
+    def __len__(self) -> int:
+        """Return the number of items held across all tables."""
+        return sum(len(table) for table in self._tables.values())
+    
+    def __iter__(self) -> Iterator[T]:
+        """Iterate every item, table by table."""
+        for table in self._tables.values():
+            yield from table
+    
+    def add(self, item: T) -> bool:
+        """Add an item to the table for its key."""
+        key = self._key(item)
+        table = self._tables.get(key)
+        if table is None:
+            table = self._tables[key] = TopK(self.limit, self._score)
+            for index, value in zip(self._dimensions, key):
+                index.setdefault(value, set()).add(key)
+        return table.add(item)
+    
+    def keys(
+        self,
+        playlist_id: Optional[str] = None,
+        rounds: Optional[int] = None,
+        timer_bucket: Optional[int] = None,
+        team_count: Optional[int] = None,
+        min_rounds: Optional[int] = None,
+        max_rounds: Optional[int] = None,
+    ) -> List[LeaderboardKey]:
+        """Get the table keys matching the given dimension values."""
+        keys: Optional[Set[LeaderboardKey]] = None
+        for index, value in zip(
+            self._dimensions, (playlist_id, rounds, timer_bucket, team_count)
+        ):
+            if value is None:
+                continue
+            matches = index.get(value, set())
+            keys = matches if keys is None else keys & matches
+        
+        candidates = self._tables.keys() if keys is None else keys
+        return [
+            key for key in candidates
+            if (min_rounds is None or key.rounds >= min_rounds)
+            and (max_rounds is None or key.rounds <= max_rounds)
+        ]
+    
+    def query(self, offset: int = 0, limit: int = 10, **filters: Optional[int | str]) -> List[T]:
+        """Get one page of the best items across the matching tables."""
+        tables = [self._tables[key] for key in self.keys(**filters)]
+        ranked = merge(*tables, key=self._score, reverse=True)
+        return list(islice(ranked, offset, offset + limit))
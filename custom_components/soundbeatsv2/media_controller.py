@@ -1,8 +1,11 @@
 """Media player controller for Soundbeats."""
 import asyncio
 import logging
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 
 from homeassistant.components.media_player import (
     DOMAIN as MEDIA_PLAYER_DOMAIN,
@@ -23,10 +26,23 @@ from homeassistant.const import (
     STATE_PLAYING,
     STATE_UNAVAILABLE,
 )
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import Event, HomeAssistant, ServiceCall, State, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import (
+    async_track_state_change_event,
+    async_track_time_interval,
+)
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .const import (
+    CALIBRATION_SAMPLES,
+    DEFAULT_PLAYBACK_TIMEOUT,
+    DOMAIN,
+    SPOTIFY_KEEPALIVE_INTERVAL,
+    SPOTIFY_SOURCE_TTL,
+)
+from .latency import expected_latency, latency_stats, profile_timeout
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -38,18 +54,133 @@ class PlaybackResult:
     success: bool
     error: Optional[str] = None
     media_player_state: Optional[str] = None
+    # When the player reported it started playing, if it was observed
+    started_at: Optional[datetime] = None
+
+
+# Queued media commands
+COMMAND_PLAY = "play"
+COMMAND_PAUSE = "pause"
+COMMAND_RESUME = "resume"
+COMMAND_STOP = "stop"
+COMMAND_VOLUME = "volume"
+COMMAND_CALIBRATE = "calibrate"
+COMMAND_PREPARE = "prepare"
+COMMAND_KEEPALIVE = "keepalive"
+
+# Pending commands a newly queued command makes redundant. Callers of a
+# dropped command of the same kind get the new command's result; the others
+# are told their command was superseded, as it never ran
+COMMAND_SUPERSEDES: Dict[str, frozenset] = {
+    COMMAND_PLAY: frozenset({
+        COMMAND_PLAY, COMMAND_PAUSE, COMMAND_RESUME, COMMAND_STOP, COMMAND_PREPARE,
+    }),
+    COMMAND_STOP: frozenset({COMMAND_PLAY, COMMAND_PAUSE, COMMAND_RESUME, COMMAND_STOP}),
+    COMMAND_PAUSE: frozenset({COMMAND_PAUSE, COMMAND_RESUME}),
+    COMMAND_RESUME: frozenset({COMMAND_PAUSE, COMMAND_RESUME}),
+    COMMAND_VOLUME: frozenset({COMMAND_VOLUME}),
+    COMMAND_CALIBRATE: frozenset(),
+    COMMAND_PREPARE: frozenset({COMMAND_PREPARE}),
+    COMMAND_KEEPALIVE: frozenset({COMMAND_KEEPALIVE}),
+}
+# Commands that abort a snippet still waiting for the player to start
+COMMANDS_CANCELLING_PLAY = frozenset({COMMAND_PLAY, COMMAND_PAUSE, COMMAND_STOP})
+
+
+@dataclass
+class MediaCommand:
+    """A queued media command and the callers waiting for its result."""
+    
+    action: str
+    kwargs: Dict[str, Any]
+    futures: List[asyncio.Future] = field(default_factory=list)
+    
+    def resolve(self, result: PlaybackResult) -> None:
+        """Hand the result to every waiting caller."""
+        for future in self.futures:
+            if not future.done():
+                future.set_result(result)
+
+
+def media_state_snapshot(entity_id: str, state: Optional[State]) -> Dict[str, Any]:
+    """Build the media player dict the game state reports."""
+    if not state:
+        return {
+            "available": False,
+            "entity_id": entity_id,
+            "error": "Entity not found",
+        }
+    
+    return {
+        "available": state.state != STATE_UNAVAILABLE,
+        "entity_id": entity_id,
+        "state": state.state,
+        "is_playing": state.state == STATE_PLAYING,
+        "media_title": state.attributes.get("media_title"),
+        "media_artist": state.attributes.get("media_artist"),
+        "media_album": state.attributes.get("media_album_name"),
+        "media_image_url": state.attributes.get("entity_picture"),
+        "volume_level": state.attributes.get("volume_level"),
+        "source": state.attributes.get("source"),
+        "source_list": state.attributes.get("source_list", []),
+    }
 
 
 class MediaController:
-    """Controls media playback for the game."""
+    """Controls media playback for the game.
+    
+    One controller lives as long as its config entry. Playback commands go
+    through a queue and run one at a time, so overlapping rounds and
+    buttons can't interleave service calls. Queuing a command drops pending
+    ones it makes redundant, such as a stop followed by a new snippet or a
+    second pause, and a new snippet, pause or stop cancels a snippet that
+    is still waiting for the player to start.
+    """
     
-    def __init__(self, hass: HomeAssistant, media_player_entity_id: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        media_player_entity_id: Optional[str] = None,
+        playback_timeout: float = DEFAULT_PLAYBACK_TIMEOUT,
+    ) -> None:
         """Initialize the media controller."""
         self.hass = hass
         self._media_player_entity_id = media_player_entity_id
+        self._playback_timeout = playback_timeout
         self._play_task: Optional[asyncio.Task] = None
         self._current_track_url: Optional[str] = None
+        # Track the player was last made ready for; see prepare_snippet
+        self._prepared_track_url: Optional[str] = None
         self._auto_pause_timer: Optional[asyncio.Task] = None
+        self._pending: Deque[MediaCommand] = deque()
+        self._running: Optional[MediaCommand] = None
+        self._running_task: Optional[asyncio.Task] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Measured latencies of the player; see async_calibrate
+        self.latency_profile: Optional[Dict[str, Any]] = None
+        # Known-good Spotify source per entity, with when it expires
+        self._spotify_sources: Dict[str, Tuple[str, float]] = {}
+        self._keepalive_unsub: Optional[Callable[[], None]] = None
+    
+    @property
+    def media_player_entity_id(self) -> Optional[str]:
+        """Get the media player entity the controller plays on."""
+        return self._media_player_entity_id
+    
+    @property
+    def playback_timeout(self) -> float:
+        """Get how long to wait for the player to confirm a state change."""
+        return self._playback_timeout
+    
+    @playback_timeout.setter
+    def playback_timeout(self, timeout: float) -> None:
+        """Set how long to wait for the player to confirm a state change."""
+        self._playback_timeout = timeout
+    
+    @property
+    def queued_commands(self) -> int:
+        """Get how many media commands are queued or running."""
+        return len(self._pending) + (self._running is not None)
     
     async def set_media_player(self, entity_id: str) -> None:
         """Set the media player entity to use."""
@@ -88,23 +219,229 @@ class MediaController:
         start_position: int = 0
     ) -> PlaybackResult:
         """Play a music snippet for the specified duration."""
+        return await self._async_submit(
+            COMMAND_PLAY,
+            track_url=track_url,
+            duration=duration,
+            start_position=start_position,
+        )
+    
+    async def prepare_snippet(self, track_url: str) -> PlaybackResult:
+        """Get the player ready for the next snippet without playing it.
+        
+        Turns the player on and selects a Spotify source now, so playing
+        ``track_url`` next only needs the play command. A playing track is
+        left alone; a snippet for a different track prepares from scratch.
+        """
+        return await self._async_submit(COMMAND_PREPARE, track_url=track_url)
+    
+    async def pause_playback(self) -> PlaybackResult:
+        """Pause current playback."""
+        return await self._async_submit(COMMAND_PAUSE)
+    
+    async def resume_playback(self) -> PlaybackResult:
+        """Resume paused playback."""
+        return await self._async_submit(COMMAND_RESUME)
+    
+    async def stop_playback(self) -> PlaybackResult:
+        """Stop current playback."""
+        return await self._async_submit(COMMAND_STOP)
+    
+    async def set_volume(self, volume_level: float) -> PlaybackResult:
+        """Set media player volume (0.0 to 1.0)."""
+        return await self._async_submit(COMMAND_VOLUME, volume_level=volume_level)
+    
+    async def async_calibrate(
+        self, media_content_id: str, samples: int = CALIBRATION_SAMPLES
+    ) -> Dict[str, Any]:
+        """Measure how long the player takes to start playing.
+        
+        Plays and stops the given media ``samples`` times and times how long
+        the player takes to report that it is playing. The result
+        becomes the controller's latency profile, which then sets the
+        playback timeout and the assumed start of unconfirmed playback.
+        """
+        result = await self._async_submit(
+            COMMAND_CALIBRATE, media_content_id=media_content_id, samples=samples
+        )
+        if not result.success:
+            raise HomeAssistantError(result.error)
+        return self.latency_profile
+    
+    @callback
+    def start_keepalive(self) -> None:
+        """Keep the Spotify Connect device selected while a game runs.
+        
+        Checks the source right away and then every
+        ``SPOTIFY_KEEPALIVE_INTERVAL`` seconds, reselecting the known-good
+        device when Spotify has dropped it. Rounds then skip source
+        selection as long as that device is known. Does nothing for other
+        players or when already running.
+        """
+        if not self.supports_spotify() or self._keepalive_unsub:
+            return
+        
+        self._keepalive_unsub = async_track_time_interval(
+            self.hass,
+            self._async_keepalive_tick,
+            timedelta(seconds=SPOTIFY_KEEPALIVE_INTERVAL),
+        )
+        self.hass.async_create_background_task(
+            self._async_keepalive_tick(), f"{DOMAIN}_spotify_keepalive"
+        )
+    
+    @callback
+    def stop_keepalive(self) -> None:
+        """Stop keeping the Spotify Connect device selected."""
+        if self._keepalive_unsub:
+            self._keepalive_unsub()
+            self._keepalive_unsub = None
+    
+    async def _async_keepalive_tick(self, now: Optional[datetime] = None) -> None:
+        """Queue a Spotify source check."""
+        result = await self._async_submit(COMMAND_KEEPALIVE)
+        if not result.success:
+            _LOGGER.warning("Spotify keepalive failed: %s", result.error)
+    
+    @property
+    def player_type(self) -> str:
+        """Get the kind of player, as far as it can be told from the entity ID."""
+        if self.supports_spotify():
+            return "spotify"
+        if self.supports_apple_music():
+            return "apple_music"
+        return "generic"
+    
+    async def async_shutdown(self) -> None:
+        """Drop queued commands and cancel the running one and any auto-pause."""
+        self._cancel_auto_pause()
+        self.stop_keepalive()
+        cancelled = PlaybackResult(success=False, error="Media controller shut down")
+        while self._pending:
+            self._pending.popleft().resolve(cancelled)
+        if self._worker and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+    
+    async def _async_submit(self, action: str, **kwargs: Any) -> PlaybackResult:
+        """Queue a command and wait for its result."""
+        future: asyncio.Future[PlaybackResult] = self.hass.loop.create_future()
+        command = MediaCommand(action, kwargs, [future])
+        
+        # Fold redundant pending commands into the new one
+        superseded = COMMAND_SUPERSEDES[action]
+        kept: Deque[MediaCommand] = deque()
+        for pending in self._pending:
+            if pending.action not in superseded:
+                kept.append(pending)
+                continue
+            _LOGGER.debug("Dropping queued %s, superseded by %s", pending.action, action)
+            if pending.action == action:
+                command.futures.extend(pending.futures)
+            else:
+                pending.resolve(
+                    PlaybackResult(success=False, error="Superseded by a later command")
+                )
+        kept.append(command)
+        self._pending = kept
+        
+        # A snippet waiting for the player to start is no longer wanted
+        if (
+            action in COMMANDS_CANCELLING_PLAY
+            and self._running is not None
+            and self._running.action == COMMAND_PLAY
+        ):
+            self._running_task.cancel()
+        
+        if self._worker is None or self._worker.done():
+            self._worker = self.hass.async_create_background_task(
+                self._async_process_commands(), f"{DOMAIN}_media_commands"
+            )
+        return await future
+    
+    async def _async_process_commands(self) -> None:
+        """Run queued commands one at a time."""
+        handlers: Dict[str, Callable[..., Any]] = {
+            COMMAND_PLAY: self._async_play_snippet,
+            COMMAND_PAUSE: self._async_pause_playback,
+            COMMAND_RESUME: self._async_resume_playback,
+            COMMAND_STOP: self._async_stop_playback,
+            COMMAND_VOLUME: self._async_set_volume,
+            COMMAND_CALIBRATE: self._async_calibrate,
+            COMMAND_PREPARE: self._async_prepare_snippet,
+            COMMAND_KEEPALIVE: self._async_keepalive_source,
+        }
+        while self._pending:
+            command = self._running = self._pending.popleft()
+            task = self._running_task = asyncio.create_task(
+                handlers[command.action](**command.kwargs)
+            )
+            try:
+                await asyncio.wait({task})
+            except asyncio.CancelledError:
+                task.cancel()
+                command.resolve(
+                    PlaybackResult(success=False, error="Media controller shut down")
+                )
+                raise
+            finally:
+                self._running = self._running_task = None
+            
+            if task.cancelled():
+                _LOGGER.debug("Cancelled %s, superseded by a later command", command.action)
+                command.resolve(
+                    PlaybackResult(success=False, error="Superseded by a later command")
+                )
+            else:
+                command.resolve(task.result())
+    
+    def _cancel_auto_pause(self) -> None:
+        """Cancel a scheduled auto-pause."""
+        if self._auto_pause_timer:
+            self._auto_pause_timer.cancel()
+            self._auto_pause_timer = None
+    
+    async def _async_play_snippet(
+        self,
+        track_url: str,
+        duration: int,
+        start_position: int,
+    ) -> PlaybackResult:
+        """Play a music snippet (queued)."""
         if not self._media_player_entity_id:
             return PlaybackResult(
                 success=False,
                 error="No media player configured"
             )
         
-        # Cancel any existing playback
-        await self.stop_playback()
+        # Stop the previous track; an idle player has nothing to stop
+        self._cancel_auto_pause()
+        state = self.hass.states.get(self._media_player_entity_id)
+        prepared = self._is_prepared(track_url, state)
+        self._prepared_track_url = None
+        if prepared:
+            _LOGGER.debug("Media player already prepared for %s", track_url)
+        elif state and state.state in (STATE_PLAYING, STATE_PAUSED):
+            await self._async_stop_playback()
         
         # Check media player availability
-        ready, error = await self._ensure_media_player_ready()
-        if not ready:
-            return PlaybackResult(success=False, error=error)
+        if not prepared:
+            ready, error = await self._ensure_media_player_ready()
+            if not ready:
+                return PlaybackResult(success=False, error=error)
         
         try:
-            # For Spotify, ensure a source is selected
-            if "spotify" in self._media_player_entity_id.lower():
+            # For Spotify, ensure a source is selected unless the keepalive
+            # or an earlier round already found a working one
+            if (
+                not prepared
+                and self.supports_spotify()
+                and self._known_spotify_source() is None
+            ):
                 source_selected = await self._ensure_spotify_source()
                 if not source_selected:
                     return PlaybackResult(
@@ -113,6 +450,7 @@ class MediaController:
                     )
             
             # Play the track
+            requested = dt_util.utcnow()
             await self.hass.services.async_call(
                 MEDIA_PLAYER_DOMAIN,
                 SERVICE_PLAY_MEDIA,
@@ -126,11 +464,21 @@ class MediaController:
             
             self._current_track_url = track_url
             
-            # Wait a moment for playback to start
-            await asyncio.sleep(2)
-            
-            # Verify playback started
-            state = self.hass.states.get(self._media_player_entity_id)
+            # Wait for the player to report playback of the new track
+            state = await self._async_wait_for_state(
+                lambda state: state.state == STATE_PLAYING
+                and state.last_updated >= requested,
+                profile_timeout(self.latency_profile, "play", self._playback_timeout),
+            )
+            playing = state is not None and state.state == STATE_PLAYING
+            if playing:
+                started_at = state.last_updated
+            else:
+                # Assume the player's usual latency if it was calibrated
+                latency = expected_latency(self.latency_profile, "play")
+                started_at = (
+                    requested + timedelta(seconds=latency) if latency is not None else None
+                )
             if state and state.state != STATE_PLAYING:
                 _LOGGER.warning(
                     "Media player not playing after play command. State: %s", 
@@ -145,26 +493,54 @@ class MediaController:
             
             return PlaybackResult(
                 success=True,
-                media_player_state=state.state if state else None
+                media_player_state=state.state if state else None,
+                started_at=started_at,
             )
             
         except Exception as err:
             _LOGGER.error("Error playing media: %s", err)
+            # The known Spotify device may be gone; check it next round
+            self._spotify_sources.pop(self._media_player_entity_id, None)
             return PlaybackResult(
                 success=False,
                 error=f"Playback failed: {str(err)}"
             )
     
-    async def pause_playback(self) -> PlaybackResult:
-        """Pause current playback."""
+    async def _async_prepare_snippet(self, track_url: str) -> PlaybackResult:
+        """Turn the player on and select a source ahead of a snippet (queued)."""
+        self._prepared_track_url = None
+        if not self._media_player_entity_id:
+            return PlaybackResult(success=False, error="No media player configured")
+        
+        ready, error = await self._ensure_media_player_ready()
+        if not ready:
+            return PlaybackResult(success=False, error=error)
+        
+        if self.supports_spotify() and not await self._ensure_spotify_source():
+            return PlaybackResult(success=False, error="No Spotify device available")
+        
+        self._prepared_track_url = track_url
+        state = self.hass.states.get(self._media_player_entity_id)
+        return PlaybackResult(
+            success=True, media_player_state=state.state if state else None
+        )
+    
+    def _is_prepared(self, track_url: str, state: Optional[State]) -> bool:
+        """Check the player is still ready to play a prepared snippet right away."""
+        if self._prepared_track_url != track_url or not state:
+            return False
+        if state.state in (STATE_OFF, STATE_UNAVAILABLE, STATE_PLAYING, STATE_PAUSED):
+            return False
+        return not self.supports_spotify() or bool(state.attributes.get("source"))
+    
+    async def _async_pause_playback(self) -> PlaybackResult:
+        """Pause current playback (queued)."""
         if not self._media_player_entity_id:
             return PlaybackResult(success=False, error="No media player configured")
         
         try:
             # Cancel auto-pause timer
-            if self._auto_pause_timer:
-                self._auto_pause_timer.cancel()
-                self._auto_pause_timer = None
+            self._cancel_auto_pause()
             
             await self.hass.services.async_call(
                 MEDIA_PLAYER_DOMAIN,
@@ -182,8 +558,8 @@ class MediaController:
                 error=f"Pause failed: {str(err)}"
             )
     
-    async def resume_playback(self) -> PlaybackResult:
-        """Resume paused playback."""
+    async def _async_resume_playback(self) -> PlaybackResult:
+        """Resume paused playback (queued)."""
         if not self._media_player_entity_id:
             return PlaybackResult(success=False, error="No media player configured")
         
@@ -204,16 +580,14 @@ class MediaController:
                 error=f"Resume failed: {str(err)}"
             )
     
-    async def stop_playback(self) -> PlaybackResult:
-        """Stop current playback."""
+    async def _async_stop_playback(self) -> PlaybackResult:
+        """Stop current playback (queued)."""
         if not self._media_player_entity_id:
             return PlaybackResult(success=True)
         
         try:
             # Cancel auto-pause timer
-            if self._auto_pause_timer:
-                self._auto_pause_timer.cancel()
-                self._auto_pause_timer = None
+            self._cancel_auto_pause()
             
             # Stop playback
             await self.hass.services.async_call(
@@ -233,8 +607,8 @@ class MediaController:
                 error=f"Stop failed: {str(err)}"
             )
     
-    async def set_volume(self, volume_level: float) -> PlaybackResult:
-        """Set media player volume (0.0 to 1.0)."""
+    async def _async_set_volume(self, volume_level: float) -> PlaybackResult:
+        """Set media player volume (queued)."""
         if not self._media_player_entity_id:
             return PlaybackResult(success=False, error="No media player configured")
         
@@ -269,27 +643,10 @@ class MediaController:
                 "entity_id": None,
             }
         
-        state = self.hass.states.get(self._media_player_entity_id)
-        if not state:
-            return {
-                "available": False,
-                "entity_id": self._media_player_entity_id,
-                "error": "Entity not found",
-            }
-        
-        return {
-            "available": state.state != STATE_UNAVAILABLE,
-            "entity_id": self._media_player_entity_id,
-            "state": state.state,
-            "is_playing": state.state == STATE_PLAYING,
-            "media_title": state.attributes.get("media_title"),
-            "media_artist": state.attributes.get("media_artist"),
-            "media_album": state.attributes.get("media_album_name"),
-            "media_image_url": state.attributes.get("entity_picture"),
-            "volume_level": state.attributes.get("volume_level"),
-            "source": state.attributes.get("source"),
-            "source_list": state.attributes.get("source_list", []),
-        }
+        return media_state_snapshot(
+            self._media_player_entity_id,
+            self.hass.states.get(self._media_player_entity_id),
+        )
     
     async def _ensure_media_player_ready(self) -> tuple[bool, Optional[str]]:
         """Ensure media player is available and ready."""
@@ -311,7 +668,9 @@ class MediaController:
                     blocking=True,
                 )
                 # Wait for it to turn on
-                await asyncio.sleep(2)
+                await self._async_wait_for_state(
+                    lambda state: state.state != STATE_OFF
+                )
             except Exception as err:
                 _LOGGER.warning("Could not turn on media player: %s", err)
         
@@ -326,6 +685,7 @@ class MediaController:
         # Check if source is already selected
         current_source = state.attributes.get("source")
         if current_source:
+            self._remember_spotify_source(current_source)
             return True
         
         # Get available sources
@@ -334,30 +694,162 @@ class MediaController:
             _LOGGER.warning("No Spotify sources available")
             return False
         
-        # Select first available source
+        # Reselect the device that worked before, else the first one
+        source = self._known_spotify_source(expired=True)
+        if source not in source_list:
+            source = source_list[0]
         try:
             await self.hass.services.async_call(
                 MEDIA_PLAYER_DOMAIN,
                 SERVICE_SELECT_SOURCE,
                 {
                     ATTR_ENTITY_ID: self._media_player_entity_id,
-                    "source": source_list[0],
+                    "source": source,
                 },
                 blocking=True,
             )
             
             # Wait for source selection
-            await asyncio.sleep(1)
+            state = await self._async_wait_for_state(
+                lambda state: state.attributes.get("source") == source
+            )
+            if state and state.attributes.get("source") == source:
+                self._remember_spotify_source(source)
             return True
             
         except Exception as err:
             _LOGGER.error("Error selecting Spotify source: %s", err)
             return False
     
+    def _known_spotify_source(self, expired: bool = False) -> Optional[str]:
+        """Get the source that last worked for the player, if not expired."""
+        source, expires = self._spotify_sources.get(
+            self._media_player_entity_id, (None, 0.0)
+        )
+        return source if expired or time.monotonic() < expires else None
+    
+    def _remember_spotify_source(self, source: str) -> None:
+        """Mark a source as working for the next ``SPOTIFY_SOURCE_TTL`` seconds."""
+        self._spotify_sources[self._media_player_entity_id] = (
+            source, time.monotonic() + SPOTIFY_SOURCE_TTL
+        )
+    
+    async def _async_keepalive_source(self) -> PlaybackResult:
+        """Make sure the known Spotify device is still selected (queued)."""
+        if not self._media_player_entity_id or not self.supports_spotify():
+            return PlaybackResult(success=True)
+        
+        if not await self._ensure_spotify_source():
+            self._spotify_sources.pop(self._media_player_entity_id, None)
+            return PlaybackResult(success=False, error="No Spotify device available")
+        return PlaybackResult(success=True)
+    
+    async def _async_calibrate(self, media_content_id: str, samples: int) -> PlaybackResult:
+        """Measure the play command's latency (queued)."""
+        if not self._media_player_entity_id:
+            return PlaybackResult(success=False, error="No media player configured")
+        
+        self._cancel_auto_pause()
+        # Only starting is timed; stopping resets the player for the next sample
+        steps = (
+            (True, SERVICE_PLAY_MEDIA, {
+                "media_content_type": MediaType.MUSIC,
+                "media_content_id": media_content_id,
+            }, (STATE_PLAYING,)),
+            (False, SERVICE_MEDIA_STOP, {}, (STATE_IDLE, STATE_OFF)),
+        )
+        latencies: List[float] = []
+        timeouts = 0
+        
+        try:
+            for _ in range(samples):
+                for timed, service, data, states in steps:
+                    requested = dt_util.utcnow()
+                    start = time.monotonic()
+                    await self.hass.services.async_call(
+                        MEDIA_PLAYER_DOMAIN,
+                        service,
+                        {ATTR_ENTITY_ID: self._media_player_entity_id, **data},
+                        blocking=True,
+                    )
+                    state = await self._async_wait_for_state(
+                        lambda state, states=states, requested=requested: (
+                            state.state in states and state.last_updated >= requested
+                        )
+                    )
+                    if not state or state.state not in states:
+                        timeouts += 1
+                    elif timed:
+                        latencies.append(time.monotonic() - start)
+        except Exception as err:
+            _LOGGER.error("Error calibrating media player: %s", err)
+            return PlaybackResult(success=False, error=f"Calibration failed: {str(err)}")
+        
+        if not latencies:
+            return PlaybackResult(
+                success=False, error="Media player never reported playing"
+            )
+        
+        self.latency_profile = {
+            "entity_id": self._media_player_entity_id,
+            "player_type": self.player_type,
+            "calibrated_at": dt_util.utcnow().isoformat(),
+            "samples": samples,
+            "timeouts": timeouts,
+            "play": latency_stats(latencies),
+        }
+        _LOGGER.info(
+            "Calibrated %s: play %s s (median)",
+            self._media_player_entity_id,
+            self.latency_profile["play"]["median"],
+        )
+        return PlaybackResult(success=True)
+    
+    async def _async_wait_for_state(
+        self, predicate: Callable[[State], bool], timeout: Optional[float] = None
+    ) -> Optional[State]:
+        """Wait until the media player state matches, up to a timeout.
+        
+        Returns as soon as a matching state is reported, or the latest state
+        once the timeout, by default the playback timeout, expires.
+        """
+        if timeout is None:
+            timeout = self._playback_timeout
+        entity_id = self._media_player_entity_id
+        state = self.hass.states.get(entity_id)
+        if state and predicate(state):
+            return state
+        
+        matched: asyncio.Future[State] = self.hass.loop.create_future()
+        
+        @callback
+        def _async_state_changed(event: Event) -> None:
+            new_state = event.data.get("new_state")
+            if new_state and predicate(new_state) and not matched.done():
+                matched.set_result(new_state)
+        
+        unsub = async_track_state_change_event(
+            self.hass, [entity_id], _async_state_changed
+        )
+        try:
+            async with asyncio.timeout(timeout):
+                return await matched
+        except TimeoutError:
+            _LOGGER.debug(
+                "Media player %s did not reach the expected state within %s seconds",
+                entity_id,
+                timeout,
+            )
+            return self.hass.states.get(entity_id)
+        finally:
+            unsub()
+    
     async def _auto_pause_after(self, duration: int) -> None:
         """Auto-pause playback after specified duration."""
         try:
             await asyncio.sleep(duration)
+            # Clear the timer first so the queued pause doesn't cancel this task
+            self._auto_pause_timer = None
             await self.pause_playback()
             _LOGGER.debug("Auto-paused after %d seconds", duration)
         except asyncio.CancelledError:
@@ -0,0 +1,89 @@
+"""Media player state mirror for Soundbeats."""
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from homeassistant.core import Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import EVENT_MEDIA_UPDATE
+from .media_controller import media_state_snapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MediaMirror:
+    """Keeps a copy of the media player state for one config entry.
+    
+    The snapshot is rebuilt from state change events instead of being read
+    from the state machine on every request. It carries a version that goes
+    up whenever a reported value changes, such as the playing state, track
+    or volume. Each change fires ``EVENT_MEDIA_UPDATE`` with only the
+    changed keys; updates that touch nothing reported, like the media
+    position, are ignored.
+    """
+    
+    def __init__(self, hass: HomeAssistant, entity_id: str) -> None:
+        """Initialize the mirror."""
+        self.hass = hass
+        self.entity_id = entity_id
+        self._snapshot: Dict[str, Any] = {"version": 0}
+        self._unsub: Optional[Callable[[], None]] = None
+    
+    @property
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the current media player snapshot. Do not modify it."""
+        return self._snapshot
+    
+    @property
+    def version(self) -> int:
+        """Get the version of the current snapshot."""
+        return self._snapshot["version"]
+    
+    @callback
+    def async_start(self) -> None:
+        """Take the initial snapshot and start tracking state changes."""
+        self._update(self.hass.states.get(self.entity_id))
+        self._unsub = async_track_state_change_event(
+            self.hass, [self.entity_id], self._async_state_changed
+        )
+    
+    @callback
+    def async_stop(self) -> None:
+        """Stop tracking state changes."""
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+    
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Update the snapshot and push the changed keys."""
+        changes = self._update(event.data.get("new_state"))
+        if changes:
+            self.hass.bus.async_fire(EVENT_MEDIA_UPDATE, {
+                "entity_id": self.entity_id,
+                "version": self.version,
+                "changes": changes,
+            })
+    
+    def _update(self, state: Optional[State]) -> Dict[str, Any]:
+        """Rebuild the snapshot and return the keys that changed."""
+        snapshot = media_state_snapshot(self.entity_id, state)
+        previous = self._snapshot
+        changes = {
+            key: value for key, value in snapshot.items()
+            if key not in previous or previous[key] != value
+        }
+        # Keys the new snapshot no longer reports, such as a cleared error
+        changes.update(
+            (key, None) for key in previous
+            if key != "version" and key not in snapshot
+        )
+        if changes:
+            snapshot["version"] = previous["version"] + 1
+            self._snapshot = snapshot
+            _LOGGER.debug(
+                "Media player %s changed: %s", self.entity_id, ", ".join(changes)
+            )
+        return changes
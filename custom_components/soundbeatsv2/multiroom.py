@@ -0,0 +1,231 @@
+"""Synchronized playback across several media players."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .latency import expected_latency
+from .media_controller import MediaController, PlaybackResult
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def media_player_ids(value: Union[str, Sequence[str], None]) -> List[str]:
+    """Get the configured media players; older entries hold a single entity ID."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return list(dict.fromkeys(value))
+
+
+def _combine(results: Sequence[PlaybackResult]) -> PlaybackResult:
+    """Merge per-player results; the group only succeeds if every player did."""
+    errors = [result.error for result in results if not result.success]
+    return PlaybackResult(
+        success=not errors,
+        error="; ".join(error or "Unknown error" for error in errors) or None,
+        media_player_state=results[0].media_player_state if results else None,
+    )
+
+
+class MediaGroup:
+    """Plays the game's snippets on several media players at once.
+    
+    Offers the ``MediaController`` methods the game uses and passes each
+    on to one controller per player, concurrently. Snippets are lined up by
+    each player's expected start latency: its calibrated median, or the
+    delay measured on the previous snippet. Faster players are held back by
+    the difference so the rooms start together. State and album art come
+    from the first player.
+    """
+    
+    def __init__(self, hass: HomeAssistant, controllers: Sequence[MediaController]) -> None:
+        """Initialize the group."""
+        self.hass = hass
+        self.controllers = list(controllers)
+        self.primary = self.controllers[0]
+        # Start delay last observed per uncalibrated player
+        self._measured_latency: Dict[str, float] = {}
+        # Seconds each player started after the first one, last snippet
+        self.last_skew: Dict[str, float] = {}
+        self._skew_task: Optional[asyncio.Task] = None
+        # Bumped by each snippet and stop, so players still held back for
+        # an older snippet don't start it
+        self._generation = 0
+    
+    @property
+    def playback_timeout(self) -> float:
+        """Get how long to wait for a player to confirm a state change."""
+        return self.primary.playback_timeout
+    
+    @playback_timeout.setter
+    def playback_timeout(self, timeout: float) -> None:
+        """Set how long to wait for the players to confirm a state change."""
+        for controller in self.controllers:
+            controller.playback_timeout = timeout
+    
+    @property
+    def queued_commands(self) -> int:
+        """Get the most media commands queued or running on any player."""
+        return max(controller.queued_commands for controller in self.controllers)
+    
+    def expected_latency(self, controller: MediaController) -> float:
+        """Get how long a player is expected to take to start playing."""
+        latency = expected_latency(controller.latency_profile, "play")
+        if latency is None:
+            latency = self._measured_latency.get(controller.media_player_entity_id, 0.0)
+        return latency
+    
+    async def play_snippet(
+        self,
+        track_url: str,
+        duration: int = 30,
+        start_position: int = 0
+    ) -> PlaybackResult:
+        """Play a snippet on every player, lined up by their latency.
+        
+        Returns as soon as one player is playing, or all of them failed, so
+        a slow speaker neither holds up the others nor the round timer. The
+        rest keep starting in the background; their skew is measured once
+        all players have reported.
+        """
+        latencies = {
+            controller.media_player_entity_id: self.expected_latency(controller)
+            for controller in self.controllers
+        }
+        slowest = max(latencies.values())
+        delays = {entity_id: slowest - latency for entity_id, latency in latencies.items()}
+        requested = dt_util.utcnow()
+        
+        self._generation += 1
+        tasks = [
+            asyncio.create_task(
+                self._async_play_member(
+                    controller,
+                    delays[controller.media_player_entity_id],
+                    self._generation,
+                    track_url=track_url,
+                    duration=duration,
+                    start_position=start_position,
+                )
+            )
+            for controller in self.controllers
+        ]
+        if self._skew_task and not self._skew_task.done():
+            self._skew_task.cancel()
+        self._skew_task = self.hass.async_create_background_task(
+            self._async_measure_skew(asyncio.gather(*tasks), requested, delays),
+            f"{DOMAIN}_playback_skew",
+        )
+        
+        failures: List[PlaybackResult] = []
+        for next_result in asyncio.as_completed(tasks):
+            result = await next_result
+            if result.success:
+                return result
+            failures.append(result)
+        return _combine(failures)
+    
+    async def prepare_snippet(self, track_url: str) -> PlaybackResult:
+        """Get every player ready for the next snippet."""
+        return await self._async_all("prepare_snippet", track_url)
+    
+    async def pause_playback(self) -> PlaybackResult:
+        """Pause playback on every player."""
+        return await self._async_all("pause_playback")
+    
+    async def resume_playback(self) -> PlaybackResult:
+        """Resume playback on every player."""
+        return await self._async_all("resume_playback")
+    
+    async def stop_playback(self) -> PlaybackResult:
+        """Stop playback on every player, including players still held back."""
+        self._generation += 1
+        return await self._async_all("stop_playback")
+    
+    async def set_volume(self, volume_level: float) -> PlaybackResult:
+        """Set the volume of every player (0.0 to 1.0)."""
+        return await self._async_all("set_volume", volume_level)
+    
+    async def get_current_album_art(self) -> Optional[str]:
+        """Get album art URL from the first player."""
+        return await self.primary.get_current_album_art()
+    
+    def get_current_state(self) -> Dict[str, Any]:
+        """Get the first player's state and attributes."""
+        return self.primary.get_current_state()
+    
+    def supports_spotify(self) -> bool:
+        """Check if any of the players is a Spotify player."""
+        return any(controller.supports_spotify() for controller in self.controllers)
+    
+    def start_keepalive(self) -> None:
+        """Keep every Spotify player's device selected while a game runs."""
+        for controller in self.controllers:
+            controller.start_keepalive()
+    
+    def stop_keepalive(self) -> None:
+        """Stop the Spotify keepalives."""
+        for controller in self.controllers:
+            controller.stop_keepalive()
+    
+    async def async_shutdown(self) -> None:
+        """Shut down every player's controller."""
+        if self._skew_task and not self._skew_task.done():
+            self._skew_task.cancel()
+        await asyncio.gather(
+            *(controller.async_shutdown() for controller in self.controllers)
+        )
+    
+    async def _async_all(self, method: str, *args: Any) -> PlaybackResult:
+        """Run a controller method on every player at once."""
+        return _combine(await asyncio.gather(
+            *(getattr(controller, method)(*args) for controller in self.controllers)
+        ))
+    
+    async def _async_play_member(
+        self, controller: MediaController, delay: float, generation: int, **kwargs: Any
+    ) -> PlaybackResult:
+        """Play a snippet on one player after its offset."""
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if generation != self._generation:
+            return PlaybackResult(success=False, error="Superseded by a later command")
+        return await controller.play_snippet(**kwargs)
+    
+    async def _async_measure_skew(
+        self,
+        fanout: asyncio.Future,
+        requested: datetime,
+        delays: Dict[str, float],
+    ) -> None:
+        """Record how far apart the players started once all have reported."""
+        results: List[PlaybackResult] = await fanout
+        started = {
+            controller.media_player_entity_id: result.started_at
+            for controller, result in zip(self.controllers, results)
+            if result.success and result.started_at is not None
+        }
+        if not started:
+            return
+        
+        earliest = min(started.values())
+        self.last_skew = {
+            entity_id: (started_at - earliest).total_seconds()
+            for entity_id, started_at in started.items()
+        }
+        # Players without a profile are lined up by what they just took
+        for controller in self.controllers:
+            entity_id = controller.media_player_entity_id
+            if entity_id in started and controller.latency_profile is None:
+                self._measured_latency[entity_id] = max(0.0, (
+                    started[entity_id] - requested
+                ).total_seconds() - delays[entity_id])
+        _LOGGER.debug("Playback start skew per player (seconds): %s", self.last_skew)
@@ -0,0 +1,151 @@
+"""Columnar round history for Soundbeats."""
+from __future__ import annotations
+
+from array import array
+from itertools import compress, repeat
+from operator import eq, ne, sub
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence
+
+from .const import NO_GUESS
+
+if TYPE_CHECKING:
+    from .game_manager import GameRound
+
+
+def _ratio(numerator: float, denominator: int) -> Optional[float]:
+    """Divide, returning None when there is nothing to divide by."""
+    return numerator / denominator if denominator else None
+
+
+class RoundHistory:
+    """Round history stored as typed columns.
+
+    Per-round values live in one array each. Per-team values are stored
+    row-major with ``team_count`` slots per round, so the column for one team
+    is a strided slice of the array.
+    """
+
+    def __init__(self, team_count: int) -> None:
+        """Initialize an empty history."""
+        self.team_count = team_count
+        self.round_number = array("H")
+        self.song_id = array("l")
+        self.actual_year = array("H")
+        self.guesses = array("H")
+        self.bets = array("B")
+        self.scores = array("h")
+
+    @classmethod
+    def from_rounds(cls, team_count: int, rounds: Iterable[GameRound]) -> RoundHistory:
+        """Build a history from round records."""
+        history = cls(team_count)
+        for round_data in rounds:
+            history.append(round_data)
+        return history
+
+    def __len__(self) -> int:
+        """Return the number of rounds stored."""
+        return len(self.round_number)
+
+    def append(self, round_data: GameRound) -> None:
+        """Append a round record."""
+        self.round_number.append(round_data.round_number)
+        self.song_id.append(round_data.song_id)
+        self.actual_year.append(round_data.actual_year)
+        self.guesses.extend(round_data.guesses)
+        self.bets.extend(round_data.bets)
+        self.scores.extend(round_data.scores)
+
+    def team_column(self, column: array, ordinal: int) -> array:
+        """Get one team's slice of a per-team column."""
+        return column[ordinal::self.team_count]
+
+    def _answered(self, ordinal: int) -> List[bool]:
+        """Get the mask of rounds the team answered."""
+        return list(map(ne, self.team_column(self.guesses, ordinal), repeat(NO_GUESS)))
+
+    def _errors(self, ordinal: int) -> List[int]:
+        """Get signed year errors for every round, answered or not."""
+        return list(map(sub, self.team_column(self.guesses, ordinal), self.actual_year))
+
+    def accuracy(self) -> List[Optional[float]]:
+        """Get the share of answered rounds each team guessed exactly."""
+        results = []
+        for ordinal in range(self.team_count):
+            answered = self._answered(ordinal)
+            exact = sum(compress(map(eq, self._errors(ordinal), repeat(0)), answered))
+            results.append(_ratio(exact, sum(answered)))
+        return results
+
+    def mean_abs_error(self) -> List[Optional[float]]:
+        """Get the mean absolute year error of each team's answers."""
+        results = []
+        for ordinal in range(self.team_count):
+            answered = self._answered(ordinal)
+            total = sum(compress(map(abs, self._errors(ordinal)), answered))
+            results.append(_ratio(total, sum(answered)))
+        return results
+
+    def bet_success_rate(self) -> List[Optional[float]]:
+        """Get the share of each team's bets that hit the exact year."""
+        results = []
+        for ordinal in range(self.team_count):
+            bets = list(self.team_column(self.bets, ordinal))
+            exact = map(eq, self._errors(ordinal), repeat(0))
+            hits = sum(compress(exact, bets))
+            results.append(_ratio(hits, sum(bets)))
+        return results
+
+    def total_scores(self) -> List[int]:
+        """Get each team's summed round scores."""
+        return [
+            sum(self.team_column(self.scores, ordinal))
+            for ordinal in range(self.team_count)
+        ]
+
+    def decade_performance(self) -> Dict[int, Dict[str, Any]]:
+        """Get per-team averages grouped by the decade of the song."""
+        decades = [year // 10 * 10 for year in self.actual_year]
+        results: Dict[int, Dict[str, Any]] = {}
+        for decade in sorted(set(decades)):
+            in_decade = list(map(eq, decades, repeat(decade)))
+            rounds = sum(in_decade)
+            teams = []
+            for ordinal in range(self.team_count):
+                answered = list(compress(self._answered(ordinal), in_decade))
+                errors = compress(self._errors(ordinal), in_decade)
+                scores = compress(self.team_column(self.scores, ordinal), in_decade)
+                teams.append({
+                    "mean_abs_error": _ratio(
+                        sum(compress(map(abs, errors), answered)), sum(answered)
+                    ),
+                    "average_score": _ratio(sum(scores), rounds),
+                })
+            results[decade] = {"rounds": rounds, "teams": teams}
+        return results
+
+    def summary(self, team_ids: Sequence[str]) -> Dict[str, Any]:
+        """Get all statistics keyed by team ID."""
+        accuracy = self.accuracy()
+        mean_abs_error = self.mean_abs_error()
+        bet_success_rate = self.bet_success_rate()
+        total_scores = self.total_scores()
+        return {
+            "rounds": len(self),
+            "teams": {
+                team_id: {
+                    "accuracy": accuracy[ordinal],
+                    "mean_abs_error": mean_abs_error[ordinal],
+                    "bet_success_rate": bet_success_rate[ordinal],
+                    "total_score": total_scores[ordinal],
+                }
+                for ordinal, team_id in enumerate(team_ids)
+            },
+            "by_decade": {
+                str(decade): {
+                    "rounds": stats["rounds"],
+                    "teams": dict(zip(team_ids, stats["teams"])),
+                }
+                for decade, stats in self.decade_performance().items()
+            },
+        }
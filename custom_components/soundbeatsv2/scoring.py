@@ -0,0 +1,103 @@
+"""Scoring engine for Soundbeats."""
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from itertools import repeat
+from operator import add, mul, ne, sub
+from typing import Any, Iterable, Mapping, Sequence
+
+from .const import (
+    CONF_POINTS_EXACT_WITH_BET,
+    CONF_POINTS_EXACT_YEAR,
+    CONF_POINTS_WITHIN_3_YEARS,
+    CONF_POINTS_WITHIN_5_YEARS,
+    CONF_POINTS_WRONG_WITH_BET,
+    CONF_SCORING_PROFILE,
+    DEFAULT_SCORING_PROFILE,
+    NO_GUESS,
+    POINTS_EXACT_WITH_BET,
+    POINTS_EXACT_YEAR,
+    POINTS_WITHIN_3_YEARS,
+    POINTS_WITHIN_5_YEARS,
+    POINTS_WRONG_WITH_BET,
+    SCORING_PROFILES,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ScoringRules:
+    """Point values awarded for a guess."""
+
+    exact_year: int = POINTS_EXACT_YEAR
+    within_3_years: int = POINTS_WITHIN_3_YEARS
+    within_5_years: int = POINTS_WITHIN_5_YEARS
+    exact_with_bet: int = POINTS_EXACT_WITH_BET
+    wrong_with_bet: int = POINTS_WRONG_WITH_BET
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> ScoringRules:
+        """Create rules from config entry options.
+
+        Named profiles use their preset values; the custom profile reads the
+        individual point options, falling back to the defaults.
+        """
+        profile = options.get(CONF_SCORING_PROFILE, DEFAULT_SCORING_PROFILE)
+        values = SCORING_PROFILES.get(profile, options)
+        return cls(
+            exact_year=int(values.get(CONF_POINTS_EXACT_YEAR, POINTS_EXACT_YEAR)),
+            within_3_years=int(values.get(CONF_POINTS_WITHIN_3_YEARS, POINTS_WITHIN_3_YEARS)),
+            within_5_years=int(values.get(CONF_POINTS_WITHIN_5_YEARS, POINTS_WITHIN_5_YEARS)),
+            exact_with_bet=int(values.get(CONF_POINTS_EXACT_WITH_BET, POINTS_EXACT_WITH_BET)),
+            wrong_with_bet=int(values.get(CONF_POINTS_WRONG_WITH_BET, POINTS_WRONG_WITH_BET)),
+        )
+
+
+class ScoringEngine:
+    """Scores guesses from a lookup table compiled from scoring rules.
+
+    The table holds one row per bet flag and one column per absolute year
+    difference up to the widest scoring band; the final column covers every
+    larger difference. A guess is scored by indexing the table with
+    ``bet * width + min(diff, width - 1)``.
+    """
+
+    def __init__(self, rules: ScoringRules | None = None) -> None:
+        """Initialize the engine and compile the rules."""
+        self.rules = rules or ScoringRules()
+        self._width, self._table = self._compile(self.rules)
+
+    @staticmethod
+    def _compile(rules: ScoringRules) -> tuple[int, array]:
+        """Compile rules into a flat lookup table."""
+        bands = ((0, rules.exact_year), (3, rules.within_3_years), (5, rules.within_5_years))
+        width = bands[-1][0] + 2
+        without_bet = [
+            next((points for limit, points in bands if diff <= limit), 0)
+            for diff in range(width)
+        ]
+        with_bet = [rules.exact_with_bet] + [rules.wrong_with_bet] * (width - 1)
+        return width, array("h", without_bet + with_bet)
+
+    def score(self, guess: int, actual: int, has_bet: bool) -> int:
+        """Score a single guess."""
+        diff = min(abs(guess - actual), self._width - 1)
+        return self._table[has_bet * self._width + diff]
+
+    def score_many(
+        self,
+        guesses: Sequence[int],
+        bets: Sequence[int],
+        actual_years: Iterable[int],
+    ) -> array:
+        """Score guesses in one pass; ``NO_GUESS`` entries score zero."""
+        cap = repeat(self._width - 1)
+        diffs = map(min, map(abs, map(sub, guesses, actual_years)), cap)
+        offsets = map(mul, bets, repeat(self._width))
+        points = map(self._table.__getitem__, map(add, offsets, diffs))
+        answered = map(ne, guesses, repeat(NO_GUESS))
+        return array("h", map(mul, points, answered))
+
+    def score_round(self, guesses: Sequence[int], bets: Sequence[int], actual: int) -> array:
+        """Score every team's guess for one round."""
+        return self.score_many(guesses, bets, repeat(actual))
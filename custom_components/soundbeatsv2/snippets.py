@@ -0,0 +1,187 @@
+"""Local snippet store for Soundbeats."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from homeassistant.components.http.auth import async_sign_path
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.network import NoURLAvailableError, get_url
+from homeassistant.util.file import write_utf8_file_atomic
+
+from .const import DOMAIN, SNIPPET_URL_EXPIRY, URL_SNIPPETS
+
+_LOGGER = logging.getLogger(__name__)
+
+# Audio formats served from the store
+SNIPPET_SUFFIXES = (".mp3", ".m4a", ".ogg", ".flac", ".wav")
+
+
+class SnippetStore:
+    """Pre-trimmed audio snippets kept under the config directory.
+    
+    Each config entry has its own directory, ``soundbeatsv2/snippets/<entry
+    ID>``, so entries never evict each other's snippets. Each file is named
+    after the catalog song it belongs to, such as ``42.mp3``, and is served
+    by ``SoundbeatsSnippetView`` so media players that accept direct URLs
+    can start from the local network. Files can be dropped into the
+    directory or added with ``async_add``; of several files for the same
+    song, the most recent one is kept. Once the store grows beyond
+    ``max_bytes``, the least recently played snippets are deleted; file
+    modification times keep that order across restarts.
+    """
+    
+    def __init__(self, hass: HomeAssistant, entry_id: str, max_bytes: int) -> None:
+        """Initialize the store."""
+        self.hass = hass
+        self.entry_id = entry_id
+        self.max_bytes = max_bytes
+        self.directory = hass.config.path(DOMAIN, "snippets", entry_id)
+        # Song ID to file name and size, least recently played first
+        self._files: OrderedDict[str, Tuple[str, int]] = OrderedDict()
+        # Signed URL per song ID and when it stops being handed out
+        self._urls: Dict[str, Tuple[str, float]] = {}
+        # Modification time updates still running in the executor
+        self._touches: Set[asyncio.Future] = set()
+    
+    @property
+    def size(self) -> int:
+        """Get the total size of the stored snippets in bytes."""
+        return sum(size for _, size in self._files.values())
+    
+    def __contains__(self, song_id: Any) -> bool:
+        """Return whether a song has a local snippet."""
+        return str(song_id) in self._files
+    
+    async def async_setup(self) -> None:
+        """Index the snippets on disk and apply the size limit."""
+        self._files = OrderedDict(
+            await self.hass.async_add_executor_job(self._scan)
+        )
+        _LOGGER.debug("Found %d snippets in %s", len(self._files), self.directory)
+        await self._async_evict()
+    
+    async def async_close(self) -> None:
+        """Wait for played snippets to be recorded on disk."""
+        if self._touches:
+            await asyncio.gather(*self._touches)
+    
+    async def async_add(self, song_id: Any, data: bytes, suffix: str) -> None:
+        """Store a snippet for a song, replacing any previous one."""
+        if suffix not in SNIPPET_SUFFIXES:
+            raise ValueError(f"Unsupported snippet format: {suffix}")
+        song_id = str(song_id)
+        filename = f"{song_id}{suffix}"
+        previous = self._files.pop(song_id, None)
+        await self.hass.async_add_executor_job(self._write, filename, data, previous)
+        self._files[song_id] = (filename, len(data))
+        self._urls.pop(song_id, None)
+        await self._async_evict()
+    
+    def url(self, song_id: Any) -> Optional[str]:
+        """Get a signed URL media players can fetch a song's snippet from.
+        
+        Marks the snippet as recently played. The same URL is handed out
+        until half its lifetime has passed, so a snippet prepared during
+        the reveal is recognized when it is played.
+        """
+        song_id = str(song_id)
+        if song_id not in self._files:
+            return None
+        
+        filename, _ = self._files[song_id]
+        self._files.move_to_end(song_id)
+        touch = self.hass.async_add_executor_job(self._touch, filename)
+        self._touches.add(touch)
+        touch.add_done_callback(self._touches.discard)
+        
+        cached = self._urls.get(song_id)
+        if cached and time.monotonic() < cached[1]:
+            return cached[0]
+        try:
+            base_url = get_url(self.hass, allow_cloud=False)
+        except NoURLAvailableError:
+            _LOGGER.warning("No Home Assistant URL to serve snippets from")
+            return None
+        
+        url = base_url + async_sign_path(
+            self.hass,
+            f"{URL_SNIPPETS}/{self.entry_id}/{filename}",
+            timedelta(seconds=SNIPPET_URL_EXPIRY),
+        )
+        self._urls[song_id] = (url, time.monotonic() + SNIPPET_URL_EXPIRY / 2)
+        return url
+    
+    def path(self, filename: str) -> Optional[str]:
+        """Get the file path of a stored snippet, or None for any other name."""
+        stored = self._files.get(os.path.splitext(filename)[0])
+        if not stored or stored[0] != filename:
+            return None
+        return os.path.join(self.directory, filename)
+    
+    async def _async_evict(self) -> None:
+        """Delete the least recently played snippets beyond the size limit."""
+        evicted: List[str] = []
+        size = self.size
+        while size > self.max_bytes and self._files:
+            song_id, (filename, file_size) = self._files.popitem(last=False)
+            self._urls.pop(song_id, None)
+            evicted.append(filename)
+            size -= file_size
+        if evicted:
+            _LOGGER.debug("Evicting snippets over the size limit: %s", evicted)
+            await self.hass.async_add_executor_job(self._remove, evicted)
+    
+    def _scan(self) -> List[Tuple[str, Tuple[str, int]]]:
+        """List snippets on disk, least recently played first (executor).
+        
+        Files shadowed by a more recent one for the same song are deleted.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        files = []
+        for entry in os.scandir(self.directory):
+            song_id, suffix = os.path.splitext(entry.name)
+            if entry.is_file() and suffix in SNIPPET_SUFFIXES:
+                stat = entry.stat()
+                files.append((stat.st_mtime, song_id, entry.name, stat.st_size))
+        files.sort()
+        
+        indexed: Dict[str, Tuple[str, int]] = {}
+        shadowed: List[str] = []
+        for _, song_id, name, size in files:
+            if song_id in indexed:
+                shadowed.append(indexed.pop(song_id)[0])
+            indexed[song_id] = (name, size)
+        if shadowed:
+            _LOGGER.debug("Deleting snippets replaced by newer files: %s", shadowed)
+            self._remove(shadowed)
+        return list(indexed.items())
+    
+    def _write(
+        self, filename: str, data: bytes, previous: Optional[Tuple[str, int]]
+    ) -> None:
+        """Write a snippet and drop the one it replaces (executor)."""
+        os.makedirs(self.directory, exist_ok=True)
+        write_utf8_file_atomic(os.path.join(self.directory, filename), data, mode="wb")
+        if previous and previous[0] != filename:
+            self._remove([previous[0]])
+    
+    def _touch(self, filename: str) -> None:
+        """Record that a snippet was played (executor)."""
+        try:
+            os.utime(os.path.join(self.directory, filename))
+        except OSError:
+            pass
+    
+    def _remove(self, filenames: List[str]) -> None:
+        """Delete snippet files (executor)."""
+        for filename in filenames:
+            try:
+                os.remove(os.path.join(self.directory, filename))
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,458 @@
+"""SQLite storage for Soundbeats game history and highscores."""
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import STORAGE_DIR
+
+from .const import LEADERBOARD_TOP_K, MAX_HIGHSCORES_PER_ROUND, STORAGE_BACKEND_SQLITE
+from .storage import HistoryCursor, Snapshot, StorageBackend
+
+_LOGGER = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS games (
+    game_id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    playlist_id TEXT NOT NULL,
+    timer_seconds INTEGER NOT NULL,
+    current_round INTEGER NOT NULL,
+    is_active INTEGER NOT NULL,
+    teams TEXT NOT NULL,
+    played_song_ids TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_playlist ON games (playlist_id);
+CREATE INDEX IF NOT EXISTS games_created ON games (julianday(created_at), game_id);
+CREATE TABLE IF NOT EXISTS rounds (
+    game_id TEXT NOT NULL,
+    round_number INTEGER NOT NULL,
+    song_id INTEGER NOT NULL,
+    actual_year INTEGER NOT NULL,
+    timestamp TEXT NOT NULL,
+    team_guesses TEXT NOT NULL,
+    team_bets TEXT NOT NULL,
+    team_scores TEXT NOT NULL,
+    PRIMARY KEY (game_id, round_number)
+);
+CREATE TABLE IF NOT EXISTS highscores (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    game_id TEXT,
+    team_name TEXT NOT NULL,
+    score_per_round REAL NOT NULL,
+    rounds_played INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    playlist_id TEXT NOT NULL,
+    timer_seconds INTEGER,
+    team_count INTEGER
+);
+CREATE INDEX IF NOT EXISTS highscores_rounds ON highscores (rounds_played, score_per_round DESC);
+CREATE INDEX IF NOT EXISTS highscores_playlist ON highscores (playlist_id);
+CREATE INDEX IF NOT EXISTS highscores_date ON highscores (date);
+CREATE INDEX IF NOT EXISTS highscores_team_name ON highscores (team_name);
+"""
+
+# Schema changes applied to databases created by older versions, by
+# PRAGMA user_version. Version 1 identifies entries by an index that treats
+# a missing game ID as a value, since a UNIQUE constraint lets rows whose
+# game_id is NULL repeat; duplicates stored before that are dropped first.
+# Version 2 drops the text index on creation times, which history pages
+# replaced with one on the parsed time.
+MIGRATIONS = (
+    """
+    DELETE FROM highscores WHERE id NOT IN (
+        SELECT MIN(id) FROM highscores
+        GROUP BY COALESCE(game_id, ''), team_name, rounds_played, date
+    );
+    CREATE UNIQUE INDEX IF NOT EXISTS highscores_entry
+        ON highscores (COALESCE(game_id, ''), team_name, rounds_played, date);
+    """,
+    "DROP INDEX IF EXISTS games_created_at;",
+)
+
+HIGHSCORE_COLUMNS = (
+    "team_name",
+    "score_per_round",
+    "rounds_played",
+    "date",
+    "playlist_id",
+    "game_id",
+    "timer_seconds",
+    "team_count",
+)
+
+ROUND_COLUMNS = (
+    "round_number",
+    "song_id",
+    "actual_year",
+    "timestamp",
+    "team_guesses",
+    "team_bets",
+    "team_scores",
+)
+
+
+class SQLiteStore(StorageBackend):
+    """Stores games, rounds and highscores in a SQLite database.
+    
+    The database runs in WAL mode. Every query runs in the executor; a lock
+    serializes access to the shared connection across executor threads.
+    Data goes in and out in the same dict layouts the JSON stores use.
+    """
+    
+    name = STORAGE_BACKEND_SQLITE
+    incremental = True
+    
+    def __init__(self, hass: HomeAssistant, key: str) -> None:
+        """Initialize the store."""
+        super().__init__(hass, key)
+        self.path = hass.config.path(STORAGE_DIR, f"{key}.db")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def paths(self) -> List[str]:
+        """Get the database file and its WAL files."""
+        return [self.path, f"{self.path}-wal", f"{self.path}-shm"]
+    
+    async def async_setup(self) -> None:
+        """Open the database and create the schema."""
+        await self.hass.async_add_executor_job(self._setup)
+    
+    async def async_close(self) -> None:
+        """Close the database."""
+        if self._conn:
+            await self.hass.async_add_executor_job(self._close)
+    
+    async def async_remove(self) -> None:
+        """Close and delete the database."""
+        await self.async_close()
+        await super().async_remove()
+    
+    async def async_is_empty(self) -> bool:
+        """Check whether nothing has been stored yet."""
+        return await self.hass.async_add_executor_job(self._is_empty)
+    
+    async def async_load_snapshot(self) -> Snapshot:
+        """Load the current game state and the highscore tables."""
+        return await self.hass.async_add_executor_job(self._load_snapshot)
+    
+    async def async_save_snapshot(
+        self,
+        state: Optional[Dict[str, Any]],
+        highscores: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Save the current game and, if given, the highscores.
+        
+        Rounds are written only if the state contains ``rounds_played``;
+        rounds normally arrive one at a time through ``async_append_round``.
+        Highscore entries are upserted; stored entries beyond the tables
+        passed in are kept.
+        """
+        await self.hass.async_add_executor_job(self._save_snapshot, state, highscores)
+    
+    async def async_save_game(self, state: Optional[Dict[str, Any]]) -> None:
+        """Save the current game row, leaving its stored rounds alone."""
+        if state:
+            state = {key: value for key, value in state.items() if key != "rounds_played"}
+        await self.async_save_snapshot(state)
+    
+    async def async_append_round(
+        self,
+        game_id: str,
+        round_data: Dict[str, Any],
+        highscore_entries: List[Dict[str, Any]],
+    ) -> None:
+        """Store a finished round and the highscore entries it produced."""
+        await self.hass.async_add_executor_job(
+            self._append_round, game_id, round_data, highscore_entries
+        )
+    
+    async def async_replace_game(
+        self, state: Dict[str, Any], highscore_entries: List[Dict[str, Any]]
+    ) -> None:
+        """Rewrite a past game and replace its highscore entries."""
+        await self.hass.async_add_executor_job(
+            self._replace_game, state, highscore_entries
+        )
+    
+    async def async_query_history(
+        self,
+        playlist_id: Optional[str] = None,
+        team_name: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[HistoryCursor] = None,
+    ) -> List[Dict[str, Any]]:
+        """Query stored games, newest first.
+        
+        ``after`` continues from the last game of the previous page.
+        """
+        return await self.hass.async_add_executor_job(
+            self._query_history, playlist_id, team_name, since, until, limit, after
+        )
+    
+    def _setup(self) -> None:
+        """Open the connection (executor)."""
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for number, migration in enumerate(MIGRATIONS[version:], version + 1):
+            conn.executescript(
+                f"BEGIN; {migration} PRAGMA user_version = {number}; COMMIT;"
+            )
+        self._conn = conn
+    
+    def _close(self) -> None:
+        """Close the connection (executor)."""
+        with self._lock:
+            self._conn.close()
+            self._conn = None
+    
+    def _is_empty(self) -> bool:
+        """Check for stored data (executor)."""
+        with self._lock:
+            return not self._conn.execute(
+                "SELECT EXISTS (SELECT 1 FROM games) OR EXISTS (SELECT 1 FROM highscores)"
+            ).fetchone()[0]
+    
+    def _load_snapshot(self) -> Snapshot:
+        """Load the snapshot (executor)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM meta WHERE key = 'current_game_id'"
+            ).fetchone()
+            state = self._load_game(row["value"]) if row else None
+            return state, self._load_highscores()
+    
+    def _load_game(self, game_id: str) -> Optional[Dict[str, Any]]:
+        """Load one game with its rounds."""
+        game = self._conn.execute(
+            "SELECT * FROM games WHERE game_id = ?", (game_id,)
+        ).fetchone()
+        if not game:
+            return None
+        
+        rounds = self._conn.execute(
+            f"SELECT {', '.join(ROUND_COLUMNS)} FROM rounds "
+            "WHERE game_id = ? ORDER BY round_number",
+            (game_id,),
+        ).fetchall()
+        return {
+            "game_id": game["game_id"],
+            "teams": json.loads(game["teams"]),
+            "current_round": game["current_round"],
+            "rounds_played": [_round_from_row(row) for row in rounds],
+            "playlist_id": game["playlist_id"],
+            "played_song_ids": json.loads(game["played_song_ids"]),
+            "timer_seconds": game["timer_seconds"],
+            "is_active": bool(game["is_active"]),
+            "created_at": game["created_at"],
+        }
+    
+    def _load_highscores(self) -> Optional[Dict[str, Any]]:
+        """Load the top entries per round count and per leaderboard key."""
+        columns = ", ".join(HIGHSCORE_COLUMNS)
+        best = self._conn.execute(
+            f"SELECT {columns} FROM highscores ORDER BY score_per_round DESC, id LIMIT 1"
+        ).fetchone()
+        if not best:
+            return None
+        
+        by_round: Dict[str, List[Dict[str, Any]]] = {}
+        for row in self._conn.execute(
+            f"SELECT {columns} FROM ("
+            f"  SELECT *, ROW_NUMBER() OVER ("
+            f"    PARTITION BY rounds_played ORDER BY score_per_round DESC, id"
+            f"  ) AS rank FROM highscores"
+            f") WHERE rank <= ? ORDER BY rounds_played, rank",
+            (MAX_HIGHSCORES_PER_ROUND,),
+        ):
+            by_round.setdefault(str(row["rounds_played"]), []).append(dict(row))
+        
+        # Timer lengths are bucketed in Python, so this may return a few
+        # more rows per bucket than the leaderboard keeps
+        leaderboard = [
+            dict(row) for row in self._conn.execute(
+                f"SELECT {columns} FROM ("
+                f"  SELECT *, ROW_NUMBER() OVER ("
+                f"    PARTITION BY playlist_id, rounds_played, timer_seconds, team_count"
+                f"    ORDER BY score_per_round DESC, id"
+                f"  ) AS rank FROM highscores"
+                f") WHERE rank <= ? ORDER BY score_per_round DESC, id",
+                (LEADERBOARD_TOP_K,),
+            )
+        ]
+        
+        return {
+            "all_time_best": dict(best),
+            "by_round": by_round,
+            "leaderboard": leaderboard,
+        }
+    
+    def _save_snapshot(
+        self,
+        state: Optional[Dict[str, Any]],
+        highscores: Optional[Dict[str, Any]],
+    ) -> None:
+        """Save the snapshot (executor)."""
+        with self._lock, self._conn:
+            if state:
+                self._insert_game(state)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('current_game_id', ?)",
+                    (state["game_id"],),
+                )
+            
+            if highscores is not None:
+                entries = [
+                    *([highscores["all_time_best"]] if highscores.get("all_time_best") else []),
+                    *(
+                        entry
+                        for entries in highscores.get("by_round", {}).values()
+                        for entry in entries
+                    ),
+                    *highscores.get("leaderboard", []),
+                ]
+                self._upsert_highscores(entries)
+    
+    def _replace_game(
+        self, state: Dict[str, Any], highscore_entries: List[Dict[str, Any]]
+    ) -> None:
+        """Rewrite a game (executor).
+        
+        The game's old entries are deleted rather than upserted, as their
+        dates and team names need not match the re-scored ones.
+        """
+        with self._lock, self._conn:
+            self._insert_game(state)
+            self._conn.execute(
+                "DELETE FROM highscores WHERE game_id = ?", (state["game_id"],)
+            )
+            self._upsert_highscores(highscore_entries)
+    
+    def _append_round(
+        self,
+        game_id: str,
+        round_data: Dict[str, Any],
+        highscore_entries: List[Dict[str, Any]],
+    ) -> None:
+        """Append a round (executor)."""
+        with self._lock, self._conn:
+            self._insert_rounds(game_id, [round_data])
+            self._upsert_highscores(highscore_entries)
+    
+    def _insert_game(self, state: Dict[str, Any]) -> None:
+        """Insert or update a game row and the rounds it contains."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO games VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                state["game_id"],
+                state["created_at"],
+                state["playlist_id"],
+                state["timer_seconds"],
+                state["current_round"],
+                state["is_active"],
+                json.dumps(state["teams"]),
+                json.dumps(state["played_song_ids"]),
+            ),
+        )
+        self._insert_rounds(state["game_id"], state.get("rounds_played", []))
+    
+    def _insert_rounds(self, game_id: str, rounds: Iterable[Dict[str, Any]]) -> None:
+        """Insert or update round rows."""
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO rounds VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    game_id,
+                    round_data["round_number"],
+                    round_data["song_id"],
+                    round_data["actual_year"],
+                    round_data["timestamp"],
+                    json.dumps(round_data["team_guesses"]),
+                    json.dumps(round_data["team_bets"]),
+                    json.dumps(round_data["team_scores"]),
+                )
+                for round_data in rounds
+            ],
+        )
+    
+    def _upsert_highscores(self, entries: Iterable[Dict[str, Any]]) -> None:
+        """Insert highscore rows, updating the scores of entries already stored."""
+        self._conn.executemany(
+            f"INSERT INTO highscores ({', '.join(HIGHSCORE_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(HIGHSCORE_COLUMNS))}) "
+            "ON CONFLICT (COALESCE(game_id, ''), team_name, rounds_played, date) "
+            "DO UPDATE SET score_per_round = excluded.score_per_round, "
+            "playlist_id = excluded.playlist_id, "
+            "timer_seconds = excluded.timer_seconds, "
+            "team_count = excluded.team_count",
+            [
+                tuple(entry.get(column) for column in HIGHSCORE_COLUMNS)
+                for entry in entries
+            ],
+        )
+    
+    def _query_history(
+        self,
+        playlist_id: Optional[str],
+        team_name: Optional[str],
+        since: Optional[str],
+        until: Optional[str],
+        limit: Optional[int],
+        after: Optional[HistoryCursor],
+    ) -> List[Dict[str, Any]]:
+        """Query games (executor)."""
+        # Creation times are compared as parsed times, as their offsets vary
+        clauses = []
+        params: List[Any] = []
+        if playlist_id is not None:
+            clauses.append("playlist_id = ?")
+            params.append(playlist_id)
+        if since is not None:
+            clauses.append("julianday(created_at) >= julianday(?)")
+            params.append(since)
+        if until is not None:
+            clauses.append("julianday(created_at) < julianday(?)")
+            params.append(until)
+        if after is not None:
+            clauses.append("(julianday(created_at), game_id) < (julianday(?), ?)")
+            params.extend(after)
+        if team_name is not None:
+            clauses.append(
+                "game_id IN (SELECT game_id FROM highscores WHERE team_name = ?)"
+            )
+            params.append(team_name)
+        
+        query = "SELECT game_id FROM games"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY julianday(created_at) DESC, game_id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        
+        with self._lock:
+            game_ids = [row["game_id"] for row in self._conn.execute(query, params)]
+            return [self._load_game(game_id) for game_id in game_ids]
+
+
+def _round_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+    """Convert a round row to the stored round dict layout."""
+    data = dict(row)
+    for key in ("team_guesses", "team_bets", "team_scores"):
+        data[key] = json.loads(data[key])
+    return data
@@ -0,0 +1,458 @@
+"""Storage backends for Soundbeats game state and highscores."""
+from __future__ import annotations
+
+import copy
+import logging
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import STORAGE_DIR, Store
+from homeassistant.util import dt as dt_util
+from homeassistant.util.file import write_utf8_file_atomic
+
+from .codec import json_bytes, json_loads
+from .const import (
+    CONF_STORAGE_BACKEND,
+    DEFAULT_STORAGE_BACKEND,
+    JOURNAL_COMPACT_RECORDS,
+    LEADERBOARD_TOP_K,
+    MAX_HIGHSCORES_PER_ROUND,
+    PERSISTENT_STORAGE_BACKENDS,
+    STORAGE_BACKEND_JOURNAL,
+    STORAGE_BACKEND_JSON,
+    STORAGE_BACKEND_MEMORY,
+    STORAGE_KEY_GAME_STATE,
+    STORAGE_KEY_HIGHSCORES,
+    STORAGE_VERSION,
+)
+from .leaderboard import timer_bucket
+
+_LOGGER = logging.getLogger(__name__)
+
+Snapshot = Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+# Creation time and game ID of the last game on a page of history
+HistoryCursor = Tuple[str, str]
+
+
+class StorageBackend(ABC):
+    """Persists the current game, its rounds and the highscore tables.
+    
+    Data goes in and out in the dict layouts produced by the game manager's
+    serializers. Backends that set ``incremental`` store each finished round
+    through ``async_append_round`` and ignore the rounds passed to
+    ``async_save_game``; the others persist everything on
+    ``async_save_snapshot``.
+    """
+    
+    name: str = ""
+    incremental: bool = False
+    
+    def __init__(self, hass: HomeAssistant, key: str) -> None:
+        """Initialize the backend."""
+        self.hass = hass
+        self.key = key
+    
+    @property
+    def paths(self) -> List[str]:
+        """Get the files the backend writes to."""
+        return []
+    
+    async def async_setup(self) -> None:
+        """Prepare the backend for use."""
+    
+    async def async_close(self) -> None:
+        """Release resources held by the backend."""
+    
+    async def async_remove(self) -> None:
+        """Delete everything the backend stored."""
+        await self.hass.async_add_executor_job(_remove_files, self.paths)
+    
+    async def async_is_empty(self) -> bool:
+        """Check whether nothing has been stored yet."""
+        state, highscores = await self.async_load_snapshot()
+        return not state and not highscores
+    
+    async def async_disk_usage(self) -> int:
+        """Get the number of bytes the backend occupies on disk."""
+        return await self.hass.async_add_executor_job(_file_sizes, self.paths)
+    
+    @abstractmethod
+    async def async_load_snapshot(self) -> Snapshot:
+        """Load the current game state and the highscore tables."""
+    
+    @abstractmethod
+    async def async_save_snapshot(
+        self,
+        state: Optional[Dict[str, Any]],
+        highscores: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Save the current game with its rounds and, if given, the highscores."""
+    
+    async def async_save_game(self, state: Optional[Dict[str, Any]]) -> None:
+        """Save the current game whose rounds were already appended."""
+        await self.async_save_snapshot(state)
+    
+    async def async_append_round(
+        self,
+        game_id: str,
+        round_data: Dict[str, Any],
+        highscore_entries: List[Dict[str, Any]],
+    ) -> None:
+        """Store a finished round and the highscore entries it produced."""
+    
+    async def async_replace_game(
+        self, state: Dict[str, Any], highscore_entries: List[Dict[str, Any]]
+    ) -> None:
+        """Rewrite a past game and its highscore entries, such as after re-scoring.
+        
+        Snapshot backends only keep the current game, which is saved with
+        ``async_save_snapshot``, so there is nothing to rewrite.
+        """
+    
+    async def async_query_history(
+        self,
+        playlist_id: Optional[str] = None,
+        team_name: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[HistoryCursor] = None,
+    ) -> List[Dict[str, Any]]:
+        """Query stored games, newest first.
+        
+        ``after`` continues from the last game of the previous page.
+        Snapshot backends only keep the current game, so at most that game
+        is returned.
+        """
+        state, _ = await self.async_load_snapshot()
+        if not state or limit == 0:
+            return []
+        if playlist_id is not None and state["playlist_id"] != playlist_id:
+            return []
+        if not in_period(state["created_at"], since, until):
+            return []
+        if after is not None and (
+            parse_timestamp(state["created_at"]), state["game_id"]
+        ) >= (parse_timestamp(after[0]), after[1]):
+            return []
+        if team_name is not None and team_name not in [
+            team["name"] for team in state["teams"]
+        ]:
+            return []
+        return [state]
+
+
+class MemoryBackend(StorageBackend):
+    """Keeps snapshots in memory only; nothing survives a restart."""
+    
+    name = STORAGE_BACKEND_MEMORY
+    
+    def __init__(self, hass: HomeAssistant, key: str) -> None:
+        """Initialize the backend."""
+        super().__init__(hass, key)
+        self._state: Optional[Dict[str, Any]] = None
+        self._highscores: Optional[Dict[str, Any]] = None
+    
+    async def async_remove(self) -> None:
+        """Drop the stored snapshot."""
+        self._state = self._highscores = None
+    
+    async def async_load_snapshot(self) -> Snapshot:
+        """Load copies of the stored snapshot."""
+        return await self.hass.async_add_executor_job(
+            copy.deepcopy, (self._state, self._highscores)
+        )
+    
+    async def async_save_snapshot(
+        self,
+        state: Optional[Dict[str, Any]],
+        highscores: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Store copies of the snapshot."""
+        state, highscores = await self.hass.async_add_executor_job(
+            copy.deepcopy, (state, highscores)
+        )
+        if state:
+            self._state = state
+        if highscores is not None:
+            self._highscores = highscores
+
+
+class JsonStoreBackend(StorageBackend):
+    """Rewrites two Home Assistant JSON stores on every save."""
+    
+    name = STORAGE_BACKEND_JSON
+    
+    def __init__(self, hass: HomeAssistant, key: str) -> None:
+        """Initialize the backend."""
+        super().__init__(hass, key)
+        self._store_state = Store(
+            hass, STORAGE_VERSION, f"{key}.{STORAGE_KEY_GAME_STATE}"
+        )
+        self._store_highscores = Store(
+            hass, STORAGE_VERSION, f"{key}.{STORAGE_KEY_HIGHSCORES}"
+        )
+    
+    @property
+    def paths(self) -> List[str]:
+        """Get the files the backend writes to."""
+        return [self._store_state.path, self._store_highscores.path]
+    
+    async def async_remove(self) -> None:
+        """Delete both stores."""
+        await self._store_state.async_remove()
+        await self._store_highscores.async_remove()
+    
+    async def async_load_snapshot(self) -> Snapshot:
+        """Load both stores."""
+        return (
+            await self._store_state.async_load(),
+            await self._store_highscores.async_load(),
+        )
+    
+    async def async_save_snapshot(
+        self,
+        state: Optional[Dict[str, Any]],
+        highscores: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Rewrite the stores."""
+        if state:
+            await self._store_state.async_save(state)
+        if highscores is not None:
+            await self._store_highscores.async_save(highscores)
+
+
+class JournalBackend(StorageBackend):
+    """Appends changes to a JSON lines journal next to a full snapshot file.
+    
+    Each save appends one line instead of rewriting the history. The journal
+    is replayed on top of the snapshot when loading and folded back into the
+    snapshot once it holds ``JOURNAL_COMPACT_RECORDS`` lines. A torn final
+    line left by a crash is skipped on replay.
+    """
+    
+    name = STORAGE_BACKEND_JOURNAL
+    incremental = True
+    
+    def __init__(self, hass: HomeAssistant, key: str) -> None:
+        """Initialize the backend."""
+        super().__init__(hass, key)
+        self.snapshot_path = hass.config.path(STORAGE_DIR, f"{key}.snapshot.json")
+        self.journal_path = hass.config.path(STORAGE_DIR, f"{key}.journal")
+        self._state: Optional[Dict[str, Any]] = None
+        self._highscores: Optional[Dict[str, Any]] = None
+        self._records = 0
+    
+    @property
+    def paths(self) -> List[str]:
+        """Get the files the backend writes to."""
+        return [self.snapshot_path, self.journal_path]
+    
+    async def async_setup(self) -> None:
+        """Load the snapshot and replay the journal."""
+        await self.hass.async_add_executor_job(self._setup)
+    
+    async def async_remove(self) -> None:
+        """Delete the snapshot and the journal."""
+        self._state = self._highscores = None
+        self._records = 0
+        await super().async_remove()
+    
+    async def async_load_snapshot(self) -> Snapshot:
+        """Load copies of the replayed snapshot."""
+        return await self.hass.async_add_executor_job(
+            copy.deepcopy, (self._state, self._highscores)
+        )
+    
+    async def async_save_snapshot(
+        self,
+        state: Optional[Dict[str, Any]],
+        highscores: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Replace the snapshot and truncate the journal."""
+        state, highscores = await self.hass.async_add_executor_job(
+            copy.deepcopy, (state, highscores)
+        )
+        if state:
+            self._state = state
+        if highscores is not None:
+            self._highscores = highscores
+        await self.hass.async_add_executor_job(self._compact)
+    
+    async def async_save_game(self, state: Optional[Dict[str, Any]]) -> None:
+        """Journal the current game without its rounds."""
+        if not state:
+            return
+        game = {key: value for key, value in state.items() if key != "rounds_played"}
+        await self._async_write({"game": game})
+    
+    async def async_append_round(
+        self,
+        game_id: str,
+        round_data: Dict[str, Any],
+        highscore_entries: List[Dict[str, Any]],
+    ) -> None:
+        """Journal a finished round and its highscore entries."""
+        await self._async_write({
+            "game_id": game_id,
+            "round": round_data,
+            "highscores": highscore_entries,
+        })
+    
+    async def _async_write(self, record: Dict[str, Any]) -> None:
+        """Apply a record and append it to the journal."""
+        self._apply(copy.deepcopy(record))
+        if self._records >= JOURNAL_COMPACT_RECORDS:
+            await self.hass.async_add_executor_job(self._compact)
+        else:
+            await self.hass.async_add_executor_job(self._append, json_bytes(record))
+    
+    def _setup(self) -> None:
+        """Read the snapshot and the journal (executor)."""
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "rb") as file:
+                snapshot = json_loads(file.read())
+            self._state = snapshot.get("state")
+            self._highscores = snapshot.get("highscores")
+        
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, "rb") as file:
+            for line in file:
+                try:
+                    record = json_loads(line)
+                except ValueError:
+                    _LOGGER.warning("Skipping unreadable journal record in %s", self.journal_path)
+                    continue
+                self._apply(record)
+    
+    def _apply(self, record: Dict[str, Any]) -> None:
+        """Apply a journal record to the in-memory snapshot."""
+        self._records += 1
+        if "game" in record:
+            game = record["game"]
+            rounds = []
+            if self._state and self._state["game_id"] == game["game_id"]:
+                rounds = self._state["rounds_played"]
+            self._state = {**game, "rounds_played": rounds}
+            return
+        
+        if self._state and self._state["game_id"] == record["game_id"]:
+            round_number = record["round"]["round_number"]
+            self._state["rounds_played"] = [
+                round_data for round_data in self._state["rounds_played"]
+                if round_data["round_number"] != round_number
+            ] + [record["round"]]
+        self._highscores = _merge_highscores(self._highscores, record["highscores"])
+    
+    def _append(self, line: bytes) -> None:
+        """Append a line to the journal (executor)."""
+        with open(self.journal_path, "ab") as file:
+            file.write(line + b"\n")
+    
+    def _compact(self) -> None:
+        """Write the snapshot and truncate the journal (executor)."""
+        if self._highscores:
+            self._highscores = _trim_highscores(self._highscores)
+        write_utf8_file_atomic(
+            self.snapshot_path,
+            json_bytes({"state": self._state, "highscores": self._highscores}),
+            mode="wb",
+        )
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self._records = 0
+
+
+def parse_timestamp(timestamp: str) -> datetime:
+    """Parse an ISO timestamp as UTC; timestamps without an offset are local."""
+    return dt_util.as_utc(datetime.fromisoformat(timestamp))
+
+
+def in_period(timestamp: str, since: Optional[str], until: Optional[str]) -> bool:
+    """Check whether an ISO timestamp falls on or after ``since`` and before ``until``."""
+    moment = parse_timestamp(timestamp)
+    return (
+        (since is None or moment >= parse_timestamp(since))
+        and (until is None or moment < parse_timestamp(until))
+    )
+
+
+def _merge_highscores(
+    highscores: Optional[Dict[str, Any]], entries: Iterable[Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """Add highscore entries to serialized highscore tables."""
+    for entry in entries:
+        if highscores is None:
+            highscores = {"all_time_best": None, "by_round": {}, "leaderboard": []}
+        # Each table gets its own copy, as it would after a JSON round trip
+        highscores["by_round"].setdefault(str(entry["rounds_played"]), []).append(dict(entry))
+        highscores.setdefault("leaderboard", []).append(dict(entry))
+        best = highscores.get("all_time_best")
+        if not best or entry["score_per_round"] > best["score_per_round"]:
+            highscores["all_time_best"] = dict(entry)
+    return highscores
+
+
+def _trim_highscores(highscores: Dict[str, Any]) -> Dict[str, Any]:
+    """Cut serialized highscore tables down to the sizes the tracker keeps."""
+    score = itemgetter("score_per_round")
+    by_round = {
+        round_num: sorted(entries, key=score, reverse=True)[:MAX_HIGHSCORES_PER_ROUND]
+        for round_num, entries in highscores.get("by_round", {}).items()
+    }
+    
+    tables: Dict[Tuple[Any, ...], List[Dict[str, Any]]] = {}
+    for entry in highscores.get("leaderboard", []):
+        key = (
+            entry["playlist_id"],
+            entry["rounds_played"],
+            timer_bucket(entry.get("timer_seconds")),
+            entry.get("team_count") or 0,
+        )
+        tables.setdefault(key, []).append(entry)
+    leaderboard = [
+        entry
+        for entries in tables.values()
+        for entry in sorted(entries, key=score, reverse=True)[:LEADERBOARD_TOP_K]
+    ]
+    
+    return {**highscores, "by_round": by_round, "leaderboard": leaderboard}
+
+
+def _file_sizes(paths: Iterable[str]) -> int:
+    """Sum the sizes of the files that exist."""
+    return sum(os.path.getsize(path) for path in paths if os.path.exists(path))
+
+
+def _remove_files(paths: Iterable[str]) -> None:
+    """Delete the files that exist."""
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def storage_backend(options: Mapping[str, Any]) -> str:
+    """Get the configured storage backend.
+    
+    Entries set to the memory backend, which only the benchmark uses, get
+    the default backend instead.
+    """
+    kind = options.get(CONF_STORAGE_BACKEND, DEFAULT_STORAGE_BACKEND)
+    return kind if kind in PERSISTENT_STORAGE_BACKENDS else DEFAULT_STORAGE_BACKEND
+
+
+def create_backend(hass: HomeAssistant, kind: str, key: str) -> StorageBackend:
+    """Create the storage backend of the given kind."""
+    from .sqlite_store import SQLiteStore
+    
+    backends = {
+        backend.name: backend
+        for backend in (MemoryBackend, JsonStoreBackend, JournalBackend, SQLiteStore)
+    }
+    return backends.get(kind, JsonStoreBackend)(hass, key)
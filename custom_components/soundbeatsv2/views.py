@@ -0,0 +1,74 @@
+"""HTTP views for Soundbeats."""
+from __future__ import annotations
+
+from http import HTTPStatus
+
+from aiohttp import web
+
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+from homeassistant.const import CONTENT_TYPE_JSON
+
+from .const import DOMAIN, URL_HIGHSCORES, URL_SNIPPETS
+from .game_manager import GameManager
+from .snippets import SnippetStore
+
+
+class SoundbeatsHighscoresView(HomeAssistantView):
+    """Serve the highscores of a Soundbeats config entry.
+    
+    Returns the same encoded payload as the ``get_highscores`` websocket
+    command, for screens that poll over HTTP.
+    """
+    
+    url = URL_HIGHSCORES
+    name = f"api:{DOMAIN}:highscores"
+    
+    async def get(self, request: web.Request) -> web.Response:
+        """Handle a highscores request."""
+        hass = request.app[KEY_HASS]
+        
+        config_entry_id = request.query.get("config_entry_id")
+        if not config_entry_id:
+            entries = hass.config_entries.async_entries(DOMAIN)
+            if not entries:
+                return self.json_message(
+                    "No Soundbeats integration configured", HTTPStatus.NOT_FOUND
+                )
+            config_entry_id = entries[0].entry_id
+        
+        if config_entry_id not in hass.data.get(DOMAIN, {}):
+            return self.json_message(
+                "Configuration entry not found", HTTPStatus.NOT_FOUND
+            )
+        
+        game_manager: GameManager = hass.data[DOMAIN][config_entry_id]["game_manager"]
+        await game_manager.async_wait_ready()
+        return web.Response(
+            body=game_manager.get_highscores_json(), content_type=CONTENT_TYPE_JSON
+        )
+
+
+class SoundbeatsSnippetView(HomeAssistantView):
+    """Serve a config entry's local snippets to media players.
+    
+    Players fetch the signed URLs handed out by ``SnippetStore.url``.
+    ``FileResponse`` answers range requests and sends the file with
+    ``sendfile``, so seeking players and large files cost no copies.
+    """
+    
+    url = URL_SNIPPETS + "/{config_entry_id}/{filename}"
+    name = f"api:{DOMAIN}:snippets"
+    
+    async def get(
+        self, request: web.Request, config_entry_id: str, filename: str
+    ) -> web.StreamResponse:
+        """Handle a snippet request."""
+        hass = request.app[KEY_HASS]
+        
+        entry_data = hass.data.get(DOMAIN, {}).get(config_entry_id, {})
+        snippet_store: SnippetStore | None = entry_data.get("snippet_store")
+        path = snippet_store.path(filename) if snippet_store else None
+        if path is None:
+            return self.json_message("Snippet not found", HTTPStatus.NOT_FOUND)
+        
+        return web.FileResponse(path)
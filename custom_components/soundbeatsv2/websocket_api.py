@@ -1,16 +1,40 @@
 """WebSocket API handlers for Soundbeats."""
 import logging
+from datetime import datetime
 from typing import Any, Dict
 
 import voluptuous as vol
 
 from homeassistant.components import websocket_api
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.components.websocket_api.messages import construct_result_message
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
 
-from .const import CONF_MEDIA_PLAYER, DOMAIN
+from .const import (
+    AUTO_ADVANCE_ACTIONS,
+    AUTO_ADVANCE_PAUSE,
+    AUTO_ADVANCE_START,
+    AUTO_ADVANCE_STOP,
+    BENCHMARK_HISTORY_SIZES,
+    CONF_MEDIA_PLAYER,
+    MAX_REVEAL_SECONDS,
+    MAX_TIMER_SECONDS,
+    MIN_REVEAL_SECONDS,
+    MIN_TIMER_SECONDS,
+    DEFAULT_MAX_TEAMS,
+    DOMAIN,
+    EXPORT_CHUNK_SIZE,
+    EXPORT_FORMAT_JSONL,
+    EXPORT_FORMATS,
+    STATE_FIELD_MEDIA_PLAYER,
+    STATE_FIELDS,
+    STATE_PROFILE_PLAYER,
+    STATE_PROFILES,
+    STORAGE_BACKENDS,
+)
+from .export import async_export_games
 from .game_manager import GameManager
-from .media_controller import MediaController
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,9 +42,11 @@ _LOGGER = logging.getLogger(__name__)
 @websocket_api.websocket_command({
     vol.Required("type"): "soundbeatsv2/get_game_state",
     vol.Optional("config_entry_id"): str,
+    vol.Exclusive("profile", "projection"): vol.In(list(STATE_PROFILES)),
+    vol.Exclusive("fields", "projection"): [vol.In(STATE_FIELDS)],
 })
-@callback
-def websocket_get_game_state(
+@websocket_api.async_response
+async def websocket_get_game_state(
     hass: HomeAssistant, 
     connection: websocket_api.ActiveConnection, 
     msg: Dict[str, Any]
@@ -49,21 +75,35 @@ def websocket_get_game_state(
         return
     
     game_manager: GameManager = hass.data[DOMAIN][config_entry_id]["game_manager"]
+    await game_manager.async_wait_ready()
+    
+    # Only build the fields the client asked for
+    fields = msg.get("fields")
+    if "profile" in msg:
+        fields = STATE_PROFILES[msg["profile"]]
     
     # Check user permissions and get appropriate state
     user = connection.user
     if user and not user.is_admin:
         # Return filtered state for non-admin users
-        state = game_manager.get_filtered_state(user.id)
+        state = game_manager.get_filtered_state(user.id, fields)
     else:
         # Return full state for admin users
-        state = game_manager.get_state()
+        state = game_manager.get_state(fields)
+    
+    # The player profile is built around the user's own team
+    if msg.get("profile") == STATE_PROFILE_PLAYER and state["active"] and not state["team"]:
+        connection.send_error(
+            msg["id"],
+            websocket_api.ERR_NOT_FOUND,
+            "No team is assigned to this user"
+        )
+        return
     
-    # Add media player state
-    media_player_id = hass.data[DOMAIN][config_entry_id].get("media_player")
-    if media_player_id:
-        media_controller = MediaController(hass, media_player_id)
-        state["media_player"] = media_controller.get_current_state()
+    # Add the mirrored media player state
+    media_mirror = hass.data[DOMAIN][config_entry_id].get("media_mirror")
+    if media_mirror and (fields is None or STATE_FIELD_MEDIA_PLAYER in fields):
+        state["media_player"] = media_mirror.snapshot
     
     connection.send_result(msg["id"], state)
 
@@ -114,6 +154,7 @@ async def websocket_new_game(
     
     try:
         game_manager: GameManager = hass.data[DOMAIN][config_entry_id]["game_manager"]
+        await game_manager.async_wait_ready()
         
         game_state = await game_manager.new_game(
             team_count=msg["team_count"],
@@ -173,6 +214,7 @@ async def websocket_submit_guess(
     
     try:
         game_manager: GameManager = hass.data[DOMAIN][config_entry_id]["game_manager"]
+        await game_manager.async_wait_ready()
         
         # Check if user can control this team
         user = connection.user
@@ -213,7 +255,7 @@ async def websocket_submit_guess(
 
 @websocket_api.websocket_command({
     vol.Required("type"): "soundbeatsv2/start_round",
-    vol.Required("song"): dict,
+    vol.Optional("song"): dict,
     vol.Optional("config_entry_id"): str,
 })
 @websocket_api.async_response
@@ -222,7 +264,10 @@ async def websocket_start_round(
     connection: websocket_api.ActiveConnection,
     msg: Dict[str, Any]
 ) -> None:
-    """Handle start round command."""
+    """Handle start round command.
+    
+    Without a song, the round plays the one prefetched during the reveal.
+    """
     # Check admin permissions
     if not connection.user.is_admin:
         connection.send_error(
@@ -255,23 +300,20 @@ async def websocket_start_round(
     
     try:
         game_manager: GameManager = hass.data[DOMAIN][config_entry_id]["game_manager"]
+        await game_manager.async_wait_ready()
         
         # Start the round
-        await game_manager.start_round(msg["song"])
+        song = msg.get("song") or await game_manager.async_next_song()
+        media_controller = hass.data[DOMAIN][config_entry_id].get("media_controller")
+        await game_manager.start_round(song, with_playback=media_controller is not None)
         
-        # Start music playback if media player is configured
-        media_player_id = hass.data[DOMAIN][config_entry_id].get("media_player")
-        if media_player_id:
-            media_controller = MediaController(hass, media_player_id)
-            result = await media_controller.play_snippet(
-                track_url=msg["song"]["url"],
-                duration=game_manager._game_state.timer_seconds
+        # Start music playback in the background if media player is configured
+        if media_controller:
+            game_manager.start_playback(
+                media_controller, game_manager.track_url(song, media_controller)
             )
-            
-            if not result.success:
-                _LOGGER.warning("Failed to start music playback: %s", result.error)
         
-        connection.send_result(msg["id"], {"success": True})
+        connection.send_result(msg["id"], {"success": True, "song": song})
         
     except Exception as err:
         _LOGGER.error("Error starting round: %s", err)
@@ -325,6 +367,7 @@ async def websocket_next_round(
     
     try:
         game_manager: GameManager = hass.data[DOMAIN][config_entry_id]["game_manager"]
+        await game_manager.async_wait_ready()
         await game_manager.next_round()
         
         connection.send_result(msg["id"], {"success": True})
@@ -338,6 +381,80 @@ async def websocket_next_round(
         )
 
 
+@websocket_api.websocket_command({
+    vol.Required("type"): "soundbeatsv2/auto_advance",
+    vol.Required("action"): vol.In(AUTO_ADVANCE_ACTIONS),
+    vol.Optional("reveal_seconds"): vol.All(
+        vol.Coerce(int), vol.Range(min=MIN_REVEAL_SECONDS, max=MAX_REVEAL_SECONDS)
+    ),
+    vol.Optional("config_entry_id"): str,
+})
+@websocket_api.async_response
+async def websocket_auto_advance(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: Dict[str, Any]
+) -> None:
+    """Handle auto-advance command: start, pause, resume or stop the pipeline."""
+    # Check admin permissions
+    if not connection.user.is_admin:
+        connection.send_error(
+            msg["id"],
+            websocket_api.ERR_UNAUTHORIZED,
+            "Admin access required to control auto-advance"
+        )
+        return
+    
+    # Get config entry
+    config_entry_id = msg.get("config_entry_id")
+    if not config_entry_id:
+        entries = hass.config_entries.async_entries(DOMAIN)
+        if not entries:
+            connection.send_error(
+                msg["id"],
+                websocket_api.ERR_NOT_FOUND,
+                "No Soundbeats integration configured"
+            )
+            return
+        config_entry_id = entries[0].entry_id
+    
+    if config_entry_id not in hass.data.get(DOMAIN, {}):
+        connection.send_error(
+            msg["id"],
+            websocket_api.ERR_NOT_FOUND,
+            "Configuration entry not found"
+        )
+        return
+    
+    try:
+        game_manager: GameManager = hass.data[DOMAIN][config_entry_id]["game_manager"]
+        await game_manager.async_wait_ready()
+        
+        action = msg["action"]
+        if action == AUTO_ADVANCE_PAUSE:
+            await game_manager.pause_auto_advance()
+        elif action == AUTO_ADVANCE_STOP:
+            await game_manager.stop_auto_advance()
+        else:
+            # Resuming a stopped pipeline starts it again
+            await game_manager.start_auto_advance(
+                msg.get("reveal_seconds") if action == AUTO_ADVANCE_START else None
+            )
+        
+        connection.send_result(msg["id"], {
+            "success": True,
+            "auto_advance": game_manager.auto_advance,
+        })
+        
+    except Exception as err:
+        _LOGGER.error("Error controlling auto-advance: %s", err)
+        connection.send_error(
+            msg["id"],
+            "auto_advance_failed",
+            str(err)
+        )
+
+
 @websocket_api.websocket_command({
     vol.Required("type"): "soundbeatsv2/update_team_name",
     vol.Required("team_id"): str,
@@ -374,6 +491,7 @@ async def websocket_update_team_name(
     
     try:
         game_manager: GameManager = hass.data[DOMAIN][config_entry_id]["game_manager"]
+        await game_manager.async_wait_ready()
         
         # Check if user can control this team
         user = connection.user
@@ -449,6 +567,7 @@ async def websocket_assign_user_to_team(
     
     try:
         game_manager: GameManager = hass.data[DOMAIN][config_entry_id]["game_manager"]
+        await game_manager.async_wait_ready()
         
         await game_manager.assign_user_to_team(
             team_id=msg["team_id"],
@@ -470,8 +589,8 @@ async def websocket_assign_user_to_team(
     vol.Required("type"): "soundbeatsv2/get_highscores",
     vol.Optional("config_entry_id"): str,
 })
-@callback
-def websocket_get_highscores(
+@websocket_api.async_response
+async def websocket_get_highscores(
     hass: HomeAssistant,
     connection: websocket_api.ActiveConnection,
     msg: Dict[str, Any]
@@ -499,9 +618,269 @@ def websocket_get_highscores(
         return
     
     game_manager: GameManager = hass.data[DOMAIN][config_entry_id]["game_manager"]
-    highscores = game_manager.get_highscores()
+    await game_manager.async_wait_ready()
+    
+    # Highscores change only when a round ends; send the cached encoding
+    connection.send_message(
+        construct_result_message(msg["id"], game_manager.get_highscores_json())
+    )
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "soundbeatsv2/leaderboard",
+    vol.Optional("playlist_id"): str,
+    vol.Optional("rounds"): vol.All(int, vol.Range(min=1)),
+    vol.Optional("min_rounds"): vol.All(int, vol.Range(min=1)),
+    vol.Optional("max_rounds"): vol.All(int, vol.Range(min=1)),
+    vol.Optional("timer_seconds"): vol.All(
+        int, vol.Range(min=MIN_TIMER_SECONDS, max=MAX_TIMER_SECONDS)
+    ),
+    vol.Optional("team_count"): vol.All(int, vol.Range(min=1, max=DEFAULT_MAX_TEAMS)),
+    vol.Optional("offset", default=0): vol.All(int, vol.Range(min=0)),
+    vol.Optional("limit", default=10): vol.All(int, vol.Range(min=1, max=100)),
+    vol.Optional("config_entry_id"): str,
+})
+@websocket_api.async_response
+async def websocket_leaderboard(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: Dict[str, Any]
+) -> None:
+    """Handle leaderboard command."""
+    # Get config entry
+    config_entry_id = msg.get("config_entry_id")
+    if not config_entry_id:
+        entries = hass.config_entries.async_entries(DOMAIN)
+        if not entries:
+            connection.send_error(
+                msg["id"],
+                websocket_api.ERR_NOT_FOUND,
+                "No Soundbeats integration configured"
+            )
+            return
+        config_entry_id = entries[0].entry_id
+    
+    if config_entry_id not in hass.data.get(DOMAIN, {}):
+        connection.send_error(
+            msg["id"],
+            websocket_api.ERR_NOT_FOUND,
+            "Configuration entry not found"
+        )
+        return
+    
+    game_manager: GameManager = hass.data[DOMAIN][config_entry_id]["game_manager"]
+    await game_manager.async_wait_ready()
+    leaderboard = game_manager.get_leaderboard(
+        offset=msg["offset"],
+        limit=msg["limit"],
+        playlist_id=msg.get("playlist_id"),
+        rounds=msg.get("rounds"),
+        min_rounds=msg.get("min_rounds"),
+        max_rounds=msg.get("max_rounds"),
+        timer_seconds=msg.get("timer_seconds"),
+        team_count=msg.get("team_count"),
+    )
+    
+    connection.send_result(msg["id"], leaderboard)
+
+
+def _utc_isoformat(value: datetime) -> str:
+    """Convert a datetime to an ISO string in UTC; naive times are local."""
+    return dt_util.as_utc(value).isoformat()
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "soundbeatsv2/export_history",
+    vol.Optional("format", default=EXPORT_FORMAT_JSONL): vol.In(EXPORT_FORMATS),
+    vol.Optional("playlist_id"): str,
+    vol.Optional("since"): vol.All(cv.datetime, _utc_isoformat),
+    vol.Optional("until"): vol.All(cv.datetime, _utc_isoformat),
+    vol.Optional("chunk_size", default=EXPORT_CHUNK_SIZE): vol.All(
+        int, vol.Range(min=1024, max=256 * 1024)
+    ),
+    vol.Optional("config_entry_id"): str,
+})
+@websocket_api.async_response
+async def websocket_export_history(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: Dict[str, Any]
+) -> None:
+    """Handle export history subscription.
+    
+    The export is streamed as ``{"chunk": ...}`` events followed by a
+    ``{"done": true}`` event; unsubscribing cancels it.
+    """
+    # Check admin permissions
+    if not connection.user.is_admin:
+        connection.send_error(
+            msg["id"],
+            websocket_api.ERR_UNAUTHORIZED,
+            "Admin access required to export history"
+        )
+        return
+    
+    # Get config entry
+    config_entry_id = msg.get("config_entry_id")
+    if not config_entry_id:
+        entries = hass.config_entries.async_entries(DOMAIN)
+        if not entries:
+            connection.send_error(
+                msg["id"],
+                websocket_api.ERR_NOT_FOUND,
+                "No Soundbeats integration configured"
+            )
+            return
+        config_entry_id = entries[0].entry_id
+    
+    if config_entry_id not in hass.data.get(DOMAIN, {}):
+        connection.send_error(
+            msg["id"],
+            websocket_api.ERR_NOT_FOUND,
+            "Configuration entry not found"
+        )
+        return
+    
+    game_manager: GameManager = hass.data[DOMAIN][config_entry_id]["game_manager"]
+    await game_manager.async_wait_ready()
+    games = game_manager.async_iter_history(
+        playlist_id=msg.get("playlist_id"),
+        since=msg.get("since"),
+        until=msg.get("until"),
+    )
+    
+    async def stream_export() -> None:
+        """Send export chunks as subscription events."""
+        chunks = 0
+        try:
+            async for chunk in async_export_games(games, msg["format"], msg["chunk_size"]):
+                connection.send_message(
+                    websocket_api.event_message(msg["id"], {"chunk": chunk})
+                )
+                chunks += 1
+        except Exception as err:
+            _LOGGER.error("Error exporting history: %s", err)
+            connection.send_message(
+                websocket_api.event_message(msg["id"], {"error": str(err)})
+            )
+            return
+        
+        connection.send_message(websocket_api.event_message(msg["id"], {
+            "done": True,
+            "format": msg["format"],
+            "chunks": chunks,
+        }))
+    
+    connection.send_result(msg["id"])
+    task = hass.async_create_background_task(
+        stream_export(), f"{DOMAIN}_export_history_{msg['id']}"
+    )
+    connection.subscriptions[msg["id"]] = task.cancel
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "soundbeatsv2/storage_benchmark",
+    vol.Optional("history_sizes"): [vol.All(int, vol.Range(min=1, max=5000))],
+    vol.Optional("backends"): [vol.In(STORAGE_BACKENDS)],
+    vol.Optional("config_entry_id"): str,
+})
+@websocket_api.async_response
+async def websocket_storage_benchmark(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: Dict[str, Any]
+) -> None:
+    """Handle storage benchmark command."""
+    # Check admin permissions
+    if not connection.user.is_admin:
+        connection.send_error(
+            msg["id"],
+            websocket_api.ERR_UNAUTHORIZED,
+            "Admin access required to benchmark storage"
+        )
+        return
+    
+    # Get config entry
+    config_entry_id = msg.get("config_entry_id")
+    if not config_entry_id:
+        entries = hass.config_entries.async_entries(DOMAIN)
+        if not entries:
+            connection.send_error(
+                msg["id"],
+                websocket_api.ERR_NOT_FOUND,
+                "No Soundbeats integration configured"
+            )
+            return
+        config_entry_id = entries[0].entry_id
+    
+    if config_entry_id not in hass.data.get(DOMAIN, {}):
+        connection.send_error(
+            msg["id"],
+            websocket_api.ERR_NOT_FOUND,
+            "Configuration entry not found"
+        )
+        return
+    
+    try:
+        game_manager: GameManager = hass.data[DOMAIN][config_entry_id]["game_manager"]
+        await game_manager.async_wait_ready()
+        
+        results = await game_manager.async_benchmark_storage(
+            history_sizes=msg.get("history_sizes", BENCHMARK_HISTORY_SIZES),
+            backends=msg.get("backends", STORAGE_BACKENDS),
+        )
+        
+        connection.send_result(msg["id"], {
+            "storage_backend": game_manager.storage_backend,
+            "results": results,
+        })
+        
+    except Exception as err:
+        _LOGGER.error("Error benchmarking storage: %s", err)
+        connection.send_error(
+            msg["id"],
+            "storage_benchmark_failed",
+            str(err)
+        )
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "soundbeatsv2/round_stats",
+    vol.Optional("config_entry_id"): str,
+})
+@websocket_api.async_response
+async def websocket_round_stats(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: Dict[str, Any]
+) -> None:
+    """Handle round statistics command."""
+    # Get config entry
+    config_entry_id = msg.get("config_entry_id")
+    if not config_entry_id:
+        entries = hass.config_entries.async_entries(DOMAIN)
+        if not entries:
+            connection.send_error(
+                msg["id"],
+                websocket_api.ERR_NOT_FOUND,
+                "No Soundbeats integration configured"
+            )
+            return
+        config_entry_id = entries[0].entry_id
+    
+    if config_entry_id not in hass.data.get(DOMAIN, {}):
+        connection.send_error(
+            msg["id"],
+            websocket_api.ERR_NOT_FOUND,
+            "Configuration entry not found"
+        )
+        return
+    
+    game_manager: GameManager = hass.data[DOMAIN][config_entry_id]["game_manager"]
+    await game_manager.async_wait_ready()
+    stats = game_manager.get_round_stats()
     
-    connection.send_result(msg["id"], highscores)
+    connection.send_result(msg["id"], stats)
 
 
 @websocket_api.websocket_command({
@@ -547,9 +926,9 @@ async def websocket_media_control(
         )
         return
     
-    # Get media player
-    media_player_id = hass.data[DOMAIN][config_entry_id].get("media_player")
-    if not media_player_id:
+    # Get media controller
+    media_controller = hass.data[DOMAIN][config_entry_id].get("media_controller")
+    if not media_controller:
         connection.send_error(
             msg["id"],
             "no_media_player",
@@ -558,7 +937,6 @@ async def websocket_media_control(
         return
     
     try:
-        media_controller = MediaController(hass, media_player_id)
         action = msg["action"]
         
         if action == "play":
@@ -0,0 +1,148 @@
+"""Tests for archive.py"""
+import os
+import pytest
+from unittest.mock import MagicMock
+
+from custom_components.soundbeatsv2 import archive
+from custom_components.soundbeatsv2.archive import GameArchive
+
+
+def _state(game_id, playlist_id="80s", created_at="2025-01-01T19:55:00", rounds=3):
+    """Create a stored game state dict."""
+    return {
+        "game_id": game_id,
+        "teams": [
+            {"id": "team_0", "name": "Team A", "score": 10, "current_guess": None,
+             "has_bet": False, "assigned_user": None},
+            {"id": "team_1", "name": "Team B", "score": 25, "current_guess": None,
+             "has_bet": False, "assigned_user": None},
+        ],
+        "current_round": rounds,
+        "rounds_played": [
+            {
+                "round_number": number,
+                "song_id": number,
+                "actual_year": 1985,
+                "timestamp": created_at,
+                "team_guesses": {"team_0": 1984, "team_1": 1985},
+                "team_bets": {"team_0": False, "team_1": False},
+                "team_scores": {"team_0": 5, "team_1": 10},
+            }
+            for number in range(1, rounds + 1)
+        ],
+        "playlist_id": playlist_id,
+        "played_song_ids": list(range(1, rounds + 1)),
+        "timer_seconds": 30,
+        "is_active": True,
+        "created_at": created_at,
+    }
+
+
+@pytest.fixture
+def mock_hass(tmp_path):
+    """Mock Home Assistant instance with a temporary config directory."""
+    hass = MagicMock()
+    hass.config.path = lambda *parts: str(tmp_path.joinpath(*parts))
+    (tmp_path / ".storage").mkdir()
+
+    async def run_inline(func, *args):
+        return func(*args)
+
+    hass.async_add_executor_job = run_inline
+    return hass
+
+
+class TestGameArchive:
+    """Test GameArchive class."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("compression", ["zlib", "lzma"])
+    async def test_archive_round_trip(self, mock_hass, compression):
+        """Test an archived game is indexed and read back unchanged."""
+        game_archive = GameArchive(mock_hass, "key", compression=compression)
+        await game_archive.async_setup()
+
+        row = await game_archive.async_archive(_state("game1"))
+
+        assert row["winner"] == "Team B"
+        assert row["rounds"] == 3
+        assert await game_archive.async_load_game("game1") == _state("game1")
+        assert await game_archive.async_load_game("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_replace_game(self, mock_hass):
+        """Test a replaced game is read back in its new version."""
+        game_archive = GameArchive(mock_hass, "key")
+        await game_archive.async_setup()
+        await game_archive.async_archive(_state("game1"))
+        await game_archive.async_archive(_state("game2"))
+
+        rescored = _state("game1")
+        rescored["teams"][0]["score"] = 40
+        await game_archive.async_replace(rescored)
+        await game_archive.async_replace(_state("missing"))
+
+        reloaded = GameArchive(mock_hass, "key")
+        await reloaded.async_setup()
+        assert await reloaded.async_load_game("game1") == rescored
+        assert await reloaded.async_load_game("game2") == _state("game2")
+        assert [row["game_id"] for row in reloaded.games()] == ["game2", "game1"]
+        assert reloaded.games()[1]["winner"] == "Team A"
+
+    @pytest.mark.asyncio
+    async def test_index_survives_reload(self, mock_hass):
+        """Test the index is read back from disk."""
+        game_archive = GameArchive(mock_hass, "key")
+        await game_archive.async_setup()
+        await game_archive.async_archive(_state("game1"))
+        await game_archive.async_archive(_state("game2"))
+
+        reloaded = GameArchive(mock_hass, "key")
+        await reloaded.async_setup()
+
+        assert [row["game_id"] for row in reloaded.games()] == ["game2", "game1"]
+        assert await reloaded.async_load_game("game1") == _state("game1")
+
+    @pytest.mark.asyncio
+    async def test_games_filters(self, mock_hass):
+        """Test index rows can be filtered by playlist, team and date."""
+        game_archive = GameArchive(mock_hass, "key")
+        await game_archive.async_setup()
+        await game_archive.async_archive(_state("game1", "80s", "2025-01-01T19:55:00"))
+        await game_archive.async_archive(_state("game2", "rock", "2025-03-01T19:55:00"))
+
+        assert [row["game_id"] for row in game_archive.games(playlist_id="rock")] == ["game2"]
+        assert [row["game_id"] for row in game_archive.games(since="2025-02-01")] == ["game2"]
+        assert [row["game_id"] for row in game_archive.games(until="2025-02-01")] == ["game1"]
+        assert game_archive.games(team_name="Team C") == []
+        assert len(game_archive.games(limit=1)) == 1
+
+        games = [game async for game in game_archive.async_iter_games(playlist_id="80s")]
+        assert [game["game_id"] for game in games] == ["game1"]
+
+    @pytest.mark.asyncio
+    async def test_segments_rotate(self, mock_hass, monkeypatch):
+        """Test a full segment is closed and a new one started."""
+        monkeypatch.setattr(archive, "ARCHIVE_SEGMENT_BYTES", 1)
+        game_archive = GameArchive(mock_hass, "key")
+        await game_archive.async_setup()
+        first = await game_archive.async_archive(_state("game1"))
+        second = await game_archive.async_archive(_state("game2"))
+
+        assert first["segment"] != second["segment"]
+        assert await game_archive.async_load_game("game1") == _state("game1")
+
+    @pytest.mark.asyncio
+    async def test_retention_drops_oldest_games(self, mock_hass, monkeypatch):
+        """Test games beyond the limit leave the index and their segments go."""
+        monkeypatch.setattr(archive, "ARCHIVE_SEGMENT_BYTES", 1)
+        game_archive = GameArchive(mock_hass, "key", max_games=2)
+        await game_archive.async_setup()
+        rows = [
+            await game_archive.async_archive(_state(f"game{number}"))
+            for number in range(1, 4)
+        ]
+
+        assert [row["game_id"] for row in game_archive.games()] == ["game3", "game2"]
+        assert not os.path.exists(os.path.join(game_archive.directory, rows[0]["segment"]))
+        assert await game_archive.async_load_game("game1") is None
@@ -0,0 +1,97 @@
+"""Tests for catalog.py"""
+import json
+
+import pytest
+from unittest.mock import MagicMock
+
+from custom_components.soundbeatsv2.catalog import SONGS_PATH, SongCatalog
+
+
+SONGS = [
+    {"id": 1, "url": "a", "year": 1975, "playlist_ids": ["default", "rock"]},
+    {"id": 2, "url": "b", "year": 1982, "playlist_ids": ["default", "80s"]},
+    {"id": 3, "url": "c", "year": 1991, "playlist_ids": ["default", "rock"]},
+]
+
+PLAYLISTS = {
+    "default": {"id": "default", "name": "Default Mix"},
+    "rock": {"id": "rock", "name": "Rock"},
+    "80s": {"id": "80s", "name": "80s Hits"},
+}
+
+
+@pytest.fixture
+def mock_hass():
+    """Mock Home Assistant instance running executor jobs inline."""
+    hass = MagicMock()
+
+    async def _executor(func, *args):
+        return func(*args)
+
+    hass.async_add_executor_job = _executor
+    return hass
+
+
+@pytest.fixture
+def catalog(mock_hass, tmp_path):
+    """Create a catalog over a small song and playlist list."""
+    path = tmp_path / "songs.json"
+    path.write_text(json.dumps(SONGS))
+    playlists_path = tmp_path / "playlists.json"
+    playlists_path.write_text(json.dumps(PLAYLISTS))
+    return SongCatalog(mock_hass, str(path), str(playlists_path))
+
+
+class TestSongCatalog:
+    """Test picking round songs."""
+
+    @pytest.mark.asyncio
+    async def test_pick_from_playlist_skipping_played(self, catalog):
+        """Test only unplayed songs from the playlist are picked."""
+        assert await catalog.async_pick("rock", [1]) == SONGS[2]
+        assert await catalog.async_pick("rock", [1, 3]) is None
+
+    @pytest.mark.asyncio
+    async def test_default_playlist_has_all_songs(self, catalog):
+        """Test the default playlist draws from every song."""
+        picked = {
+            (await catalog.async_pick("default", []))["id"] for _ in range(50)
+        }
+        assert picked == {1, 2, 3}
+
+    @pytest.mark.asyncio
+    async def test_unknown_playlist_has_all_songs(self, catalog):
+        """Test a playlist missing from the playlist list draws from every song."""
+        picked = {
+            (await catalog.async_pick("jazz", [2]))["id"] for _ in range(50)
+        }
+        assert picked == {1, 3}
+
+    @pytest.mark.asyncio
+    async def test_songs_loaded_once(self, catalog, tmp_path):
+        """Test the song list is read on first use only."""
+        await catalog.async_songs()
+        (tmp_path / "songs.json").unlink()
+
+        assert len(await catalog.async_songs()) == 3
+
+    @pytest.mark.asyncio
+    async def test_missing_catalog(self, mock_hass, tmp_path):
+        """Test a missing song list yields no songs."""
+        catalog = SongCatalog(mock_hass, str(tmp_path / "missing.json"))
+
+        assert await catalog.async_pick("default") is None
+
+    @pytest.mark.asyncio
+    async def test_bundled_catalog(self, mock_hass):
+        """Test the panel's song list loads."""
+        songs = await SongCatalog(mock_hass, SONGS_PATH).async_songs()
+
+        assert songs and all("url" in song and "year" in song for song in songs)
+
+    @pytest.mark.asyncio
+    async def test_bundled_playlists(self, mock_hass):
+        """Test the panel's playlist list loads."""
+        playlists = await SongCatalog(mock_hass).async_playlists()
+
+        assert "default" in playlists
@@ -0,0 +1,35 @@
+"""Tests for codec.py"""
+import json
+import pytest
+
+from custom_components.soundbeatsv2 import codec
+from custom_components.soundbeatsv2.codec import json_bytes, json_loads
+
+
+DATA = {"team": "Équipe", "scores": [10, 0, -10], "by_round": {"1": None}, "ok": True}
+
+
+@pytest.fixture(params=["orjson", "json"])
+def encoder(request, monkeypatch):
+    """Run a test with and without orjson."""
+    if request.param == "json":
+        monkeypatch.setattr(codec, "orjson", None)
+    elif codec.orjson is None:
+        pytest.skip("orjson is not installed")
+    return request.param
+
+
+class TestCodec:
+    """Test JSON codec helpers."""
+
+    def test_round_trip(self, encoder):
+        """Test data survives encoding and decoding."""
+        assert json_loads(json_bytes(DATA)) == DATA
+
+    def test_compact_utf8_output(self, encoder):
+        """Test output is compact UTF-8 readable by the standard library."""
+        payload = json_bytes(DATA)
+
+        assert isinstance(payload, bytes)
+        assert b" " not in payload.replace("Équipe".encode("utf-8"), b"")
+        assert json.loads(payload.decode("utf-8")) == DATA
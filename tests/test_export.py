@@ -0,0 +1,90 @@
+"""Tests for export.py"""
+import csv
+import io
+import json
+import pytest
+
+from custom_components.soundbeatsv2.export import CSV_COLUMNS, async_export_games
+
+
+def _game(game_id, rounds=2):
+    """Create a stored game state dict."""
+    return {
+        "game_id": game_id,
+        "teams": [
+            {"id": "team_0", "name": "Team A", "score": 15, "current_guess": None,
+             "has_bet": False, "assigned_user": None},
+            {"id": "team_1", "name": "Team B", "score": 0, "current_guess": None,
+             "has_bet": False, "assigned_user": None},
+        ],
+        "current_round": rounds,
+        "rounds_played": [
+            {
+                "round_number": number,
+                "song_id": number,
+                "actual_year": 1985,
+                "timestamp": "2025-01-01T20:00:00",
+                "team_guesses": {"team_0": 1985},
+                "team_bets": {"team_0": number == 2},
+                "team_scores": {"team_0": 10 if number == 1 else 20},
+            }
+            for number in range(1, rounds + 1)
+        ],
+        "playlist_id": "80s",
+        "played_song_ids": list(range(1, rounds + 1)),
+        "timer_seconds": 30,
+        "is_active": False,
+        "created_at": "2025-01-01T19:55:00",
+    }
+
+
+async def _games(*games):
+    """Yield games asynchronously."""
+    for game in games:
+        yield game
+
+
+async def _export(games, export_format, chunk_size=1024):
+    """Collect all exported chunks."""
+    return [chunk async for chunk in async_export_games(games, export_format, chunk_size)]
+
+
+class TestExportGames:
+    """Test async_export_games function."""
+
+    @pytest.mark.asyncio
+    async def test_csv_has_one_row_per_answer(self):
+        """Test CSV output has a header and a row per answered round."""
+        chunks = await _export(_games(_game("game1"), _game("game2")), "csv")
+
+        rows = list(csv.reader(io.StringIO("".join(chunks))))
+        assert tuple(rows[0]) == CSV_COLUMNS
+        assert len(rows) == 5
+        assert rows[1][:4] == ["game1", "2025-01-01T19:55:00", "80s", "1"]
+        assert rows[2][-4:] == ["Team A", "1985", "True", "20"]
+
+    @pytest.mark.asyncio
+    async def test_jsonl_has_game_and_round_records(self):
+        """Test JSON lines output has a game record followed by its rounds."""
+        chunks = await _export(_games(_game("game1")), "jsonl")
+
+        records = [json.loads(line) for line in "".join(chunks).splitlines()]
+        assert [record["type"] for record in records] == ["game", "round", "round"]
+        assert "rounds_played" not in records[0]
+        assert records[2]["game_id"] == "game1"
+        assert records[2]["team_scores"] == {"team_0": 20}
+
+    @pytest.mark.asyncio
+    async def test_chunks_have_fixed_size(self):
+        """Test every chunk but the last has exactly the chunk size."""
+        chunks = await _export(_games(*(_game(f"game{i}", 20) for i in range(5))), "jsonl", 1024)
+
+        assert len(chunks) > 2
+        assert all(len(chunk) == 1024 for chunk in chunks[:-1])
+        assert 0 < len(chunks[-1]) <= 1024
+
+    @pytest.mark.asyncio
+    async def test_empty_history(self):
+        """Test exporting no games yields only the CSV header."""
+        assert await _export(_games(), "jsonl") == []
+        assert await _export(_games(), "csv") == [",".join(CSV_COLUMNS) + "\n"]
@@ -1,18 +1,36 @@
 """Tests for game_manager.py"""
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
-from datetime import datetime
+from datetime import datetime, timedelta
 import asyncio
+import json
+from array import array
 
+from homeassistant.util import dt as dt_util
+
+from custom_components.soundbeatsv2.const import (
+    CONF_TIMER_ON_AUDIO,
+    POINTS_EXACT_WITH_BET,
+    POINTS_EXACT_YEAR,
+    POINTS_WITHIN_3_YEARS,
+    POINTS_WRONG_WITH_BET,
+    SPOTIFY_KEEPALIVE_IDLE_TIMEOUT,
+    STATE_PROFILE_PLAYER,
+    STATE_PROFILE_TIMER,
+    STATE_PROFILES,
+)
+from custom_components.soundbeatsv2.media_controller import MediaController, PlaybackResult
+from custom_components.soundbeatsv2.scoring import ScoringEngine, ScoringRules
 from custom_components.soundbeatsv2.game_manager import (
     GameManager,
     Team,
+    GameRound,
     GameState,
     HighscoreEntry,
     HighscoreTracker,
-    POINTS_EXACT,
-    POINTS_CLOSE,
-    POINTS_BET_MULTIPLIER,
+    apply_scores,
+    carry_over_highscores,
+    rescore_game,
 )
 
 
@@ -33,6 +51,7 @@ def mock_config_entry():
     entry = MagicMock()
     entry.entry_id = "test_entry"
     entry.data = {}
+    entry.options = {}
     return entry
 
 
@@ -114,6 +133,111 @@ class TestGameState:
         assert state.current_round == 0
 
 
+class TestGameRound:
+    """Test GameRound class."""
+
+    def test_models_use_slots(self):
+        """Test data models do not carry a per-instance __dict__."""
+        assert not hasattr(Team(id="t", name="T"), "__dict__")
+        assert not hasattr(GameRound(round_number=1, song_id=1), "__dict__")
+
+    def test_record_results_by_ordinal(self):
+        """Test per-team results are stored in parallel arrays."""
+        round_data = GameRound.for_teams(3, round_number=1, song_id=7, actual_year=1985)
+        round_data.record(0, 1985, False, 10)
+        round_data.record(2, 1983, True, 0)
+
+        team_ids = ["team_0", "team_1", "team_2"]
+        assert list(round_data.scores) == [10, 0, 0]
+        assert round_data.team_guesses(team_ids) == {"team_0": 1985, "team_2": 1983}
+        assert round_data.team_bets(team_ids) == {"team_0": False, "team_2": True}
+        assert round_data.team_scores(team_ids) == {"team_0": 10, "team_2": 0}
+
+    def test_dict_round_trip(self):
+        """Test the legacy dict layout survives a round trip."""
+        team_ids = ["team_0", "team_1"]
+        data = {
+            "round_number": 2,
+            "song_id": 3,
+            "team_guesses": {"team_1": 1990},
+            "team_bets": {"team_1": True},
+            "team_scores": {"team_1": 20},
+            "actual_year": 1990,
+            "timestamp": datetime.now(),
+        }
+
+        round_data = GameRound.from_dict(data, team_ids)
+
+        assert list(round_data.guesses) == [0, 1990]
+        assert round_data.as_dict(team_ids) == data
+
+    def test_stored_layout_round_trip(self):
+        """Test the stored layout keeps the timestamp string it was loaded with."""
+        team_ids = ["team_0"]
+        data = {
+            "round_number": 1,
+            "song_id": 3,
+            "team_guesses": {"team_0": 1990},
+            "team_bets": {"team_0": False},
+            "team_scores": {"team_0": 10},
+            "actual_year": 1990,
+            "timestamp": "2025-01-01T20:00:00+00:00",
+        }
+
+        round_data = GameRound.from_dict(data, team_ids)
+
+        assert round_data.timestamp == datetime.fromisoformat(data["timestamp"])
+        assert round_data.to_dict(team_ids) == data
+
+
+class TestModelCodecs:
+    """Test to_dict/from_dict codecs of the data models."""
+
+    def test_game_state_round_trip(self, sample_teams):
+        """Test a game state survives the stored layout."""
+        round_data = GameRound.for_teams(3, round_number=1, song_id=1, actual_year=1985)
+        round_data.record(1, 1984, True, -10)
+        state = GameState(
+            game_id="game1",
+            teams=sample_teams,
+            current_round=1,
+            rounds_played=[round_data],
+            playlist_id="default",
+            played_song_ids=[1],
+        )
+
+        data = state.to_dict()
+        restored = GameState.from_dict(data)
+
+        assert data["created_at"] == state.created_at.isoformat()
+        assert data["teams"][0] == {
+            "id": "team_0", "name": "Team Alpha", "score": 0,
+            "current_guess": None, "has_bet": False, "assigned_user": None,
+        }
+        assert restored.to_dict() == data
+        assert list(restored.rounds_played[0].scores) == [0, -10, 0]
+
+    def test_highscore_entry_round_trip(self):
+        """Test an entry keeps its date string and drops the cache on compare."""
+        data = {
+            "team_name": "Team A",
+            "score_per_round": 7.5,
+            "rounds_played": 2,
+            "date": "2025-01-01T20:00:00+00:00",
+            "playlist_id": "default",
+            "game_id": "game1",
+            "timer_seconds": 30,
+            "team_count": 2,
+        }
+
+        entry = HighscoreEntry.from_dict(data)
+
+        assert entry.to_dict() == data
+        assert entry == HighscoreEntry(
+            "Team A", 7.5, 2, datetime.fromisoformat(data["date"]), "default", "game1", 30, 2
+        )
+
+
 class TestHighscoreTracker:
     """Test HighscoreTracker class."""
 
@@ -152,6 +276,802 @@ class TestHighscoreTracker:
         assert round_1_scores[1].score == 80   # Team B, round 1
 
 
+class TestRescoreGames:
+    """Test re-scoring stored history."""
+
+    def test_rescore_rebuilds_highscores(self):
+        """Test entries of re-scored games are rebuilt and others kept."""
+        now = datetime.now()
+        round_data = GameRound.for_teams(1, round_number=1, song_id=1, actual_year=1990, timestamp=now)
+        round_data.record(0, 1992, False, 5)
+        game = GameState(
+            game_id="game1",
+            teams=[Team(id="team_0", name="Team A", score=5)],
+            current_round=1,
+            rounds_played=[round_data],
+            playlist_id="default",
+            played_song_ids=[1],
+        )
+        tracker = HighscoreTracker()
+        tracker.add(HighscoreEntry("Team A", 5.0, 1, now, "default", "game1"))
+        tracker.add(HighscoreEntry("Legacy", 4.0, 1, now, "default"))
+
+        engine = ScoringEngine(ScoringRules(within_3_years=8))
+        scores, entries = rescore_game(engine, game)
+        rebuilt = HighscoreTracker()
+        for entry in entries:
+            rebuilt.add(entry)
+        carry_over_highscores(tracker, rebuilt, {"game1"})
+
+        assert list(scores[0]) == [8]
+        assert game.teams[0].score == 5
+        assert [entry.team_name for entry in rebuilt.by_round[1]] == ["Team A", "Legacy"]
+        assert rebuilt.by_round[1].best.score_per_round == 8.0
+        assert rebuilt.all_time_best.score_per_round == 8.0
+
+    def test_apply_scores_updates_totals(self):
+        """Test re-scored rounds update the team totals."""
+        rounds = []
+        for number in (1, 2):
+            round_data = GameRound.for_teams(2, round_number=number, song_id=number, actual_year=1990)
+            round_data.record(0, 1990, False, 10)
+            rounds.append(round_data)
+        game = GameState(
+            game_id="game1",
+            teams=[Team(id="team_0", name="Team A", score=20), Team(id="team_1", name="Team B")],
+            current_round=2,
+            rounds_played=rounds,
+            playlist_id="default",
+            played_song_ids=[1, 2],
+        )
+
+        apply_scores(game, [array("h", [3, 1]), array("h", [4, 0])])
+
+        assert [team.score for team in game.teams] == [7, 1]
+        assert list(game.rounds_played[1].scores) == [4, 0]
+
+    @pytest.mark.asyncio
+    async def test_set_scoring_rules_rescores_stored_and_archived_games(self, game_manager, mock_hass):
+        """Test past games are re-scored and written back with the current one."""
+        async def executor(func, *args):
+            return func(*args)
+
+        mock_hass.async_add_executor_job = executor
+        game_manager.hass.bus.async_fire = MagicMock()
+        game_manager._ready.set()
+
+        def game(game_id, guess):
+            round_data = GameRound.for_teams(
+                1, round_number=1, song_id=1, actual_year=1990, timestamp=datetime(2025, 1, 1)
+            )
+            round_data.record(0, guess, False, 5)
+            return GameState(
+                game_id=game_id,
+                teams=[Team(id="team_0", name=f"Team {game_id}", score=5)],
+                current_round=1,
+                rounds_played=[round_data],
+                playlist_id="default",
+                played_song_ids=[1],
+                created_at=datetime(2025, 1, 1),
+            )
+
+        game_manager._game_state = game("current", 1992)
+        stored = game("stored", 1992).to_dict()
+        archived = game("archived", 1992).to_dict()
+        game_manager._storage = AsyncMock()
+        game_manager._storage.incremental = True
+        game_manager._storage.async_query_history.return_value = [
+            game_manager._game_state.to_dict(), stored,
+        ]
+        game_manager._archive = MagicMock()
+        game_manager._archive.games.return_value = [{"game_id": "archived"}]
+        game_manager._archive.async_read = AsyncMock(return_value=archived)
+        game_manager._archive.async_replace = AsyncMock()
+        tracker = HighscoreTracker()
+        tracker.add(HighscoreEntry("Legacy", 4.0, 1, datetime(2024, 1, 1), "default"))
+        game_manager._highscores = tracker
+
+        await game_manager.async_set_scoring_rules(ScoringRules(within_3_years=8))
+
+        replaced = game_manager._storage.async_replace_game.await_args_list
+        assert [call.args[0]["game_id"] for call in replaced] == ["stored", "current"]
+        assert replaced[0].args[0]["rounds_played"][0]["team_scores"] == {"team_0": 8}
+        assert replaced[0].args[1][0]["score_per_round"] == 8.0
+        rewritten = game_manager._archive.async_replace.await_args.args[0]
+        assert rewritten["teams"][0]["score"] == 8
+        assert game_manager._game_state.teams[0].score == 8
+        scores = {
+            entry.team_name: entry.score_per_round
+            for entry in game_manager._highscores.by_round[1]
+        }
+        assert scores == {
+            "Team current": 8.0, "Team stored": 8.0, "Team archived": 8.0, "Legacy": 4.0,
+        }
+
+
+class TestGameManagerStartup:
+    """Test loading stored state in the background."""
+
+    @pytest.mark.asyncio
+    async def test_save_skipped_until_loaded(self, game_manager):
+        """Test saving before loading leaves stored data alone."""
+        game_manager._storage = AsyncMock()
+
+        await game_manager.save_state()
+
+        assert not game_manager.ready
+        game_manager._storage.async_save_snapshot.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_load_marks_ready_and_defers_highscores(self, game_manager):
+        """Test loading sets readiness and keeps highscores raw until used."""
+        game_manager._storage = AsyncMock()
+        game_manager._storage.async_is_empty.return_value = False
+        game_manager._storage.async_load_snapshot.return_value = (None, {
+            "all_time_best": None,
+            "by_round": {"1": [{
+                "team_name": "Team A",
+                "score_per_round": 10.0,
+                "rounds_played": 1,
+                "date": "2025-01-01T20:00:00",
+                "playlist_id": "default",
+            }]},
+        })
+        game_manager._archive = AsyncMock()
+
+        await game_manager.load_state()
+        await game_manager.async_wait_ready()
+
+        assert game_manager.ready
+        assert game_manager._highscore_tracker is None
+        assert game_manager.get_highscores()["all_time_best"]["team_name"] == "Team A"
+        assert game_manager._highscore_data is None
+
+    @pytest.mark.asyncio
+    async def test_failed_load_still_marks_ready(self, game_manager):
+        """Test waiters are released when loading fails."""
+        game_manager._storage = AsyncMock()
+        game_manager._storage.async_setup.side_effect = OSError("disk error")
+
+        await game_manager.load_state()
+
+        assert game_manager.ready
+
+
+class TestHistory:
+    """Test iterating over stored and archived games."""
+
+    def _game(self, game_id, created_at):
+        """Create a stored game dict."""
+        return {"game_id": game_id, "created_at": created_at}
+
+    def _setup(self, game_manager, stored, archived):
+        """Back the game manager with paged storage and an archive."""
+        calls = []
+
+        async def query_history(limit=None, after=None, **filters):
+            calls.append(after)
+            start = 0
+            if after is not None:
+                start = [game["game_id"] for game in stored].index(after[1]) + 1
+            return stored[start:start + limit]
+
+        game_manager._storage = MagicMock()
+        game_manager._storage.async_query_history = query_history
+        game_manager._archive = MagicMock()
+        game_manager._archive.games.return_value = archived
+        game_manager._archive.async_read = AsyncMock(
+            side_effect=lambda row: {"game_id": row["game_id"], "archived": True}
+        )
+        return calls
+
+    @pytest.mark.asyncio
+    async def test_merges_pages_and_archive(self, game_manager):
+        """Test games come newest first, stored games a page at a time."""
+        calls = self._setup(game_manager, [
+            self._game("g5", "2025-01-05T20:00:00"),
+            self._game("g3", "2025-01-03T20:00:00"),
+            self._game("g2", "2025-01-02T20:00:00"),
+        ], [
+            {"game_id": "g4", "date": "2025-01-04T20:00:00"},
+            {"game_id": "g2", "date": "2025-01-02T20:00:00"},
+            {"game_id": "g1", "date": "2025-01-01T20:00:00"},
+        ])
+
+        with patch("custom_components.soundbeatsv2.game_manager.HISTORY_PAGE_SIZE", 2):
+            games = await game_manager.async_query_history()
+
+        assert [game["game_id"] for game in games] == ["g5", "g4", "g3", "g2", "g1"]
+        assert "archived" not in games[3]
+        assert calls == [None, ("2025-01-03T20:00:00", "g3")]
+        assert game_manager._archive.async_read.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_limit_stops_reading(self, game_manager):
+        """Test a limit stops before further pages and archived games are read."""
+        calls = self._setup(game_manager, [
+            self._game("g3", "2025-01-03T20:00:00"),
+            self._game("g2", "2025-01-02T20:00:00"),
+            self._game("g1", "2025-01-01T20:00:00"),
+        ], [{"game_id": "g0", "date": "2024-12-31T20:00:00"}])
+
+        with patch("custom_components.soundbeatsv2.game_manager.HISTORY_PAGE_SIZE", 2):
+            games = await game_manager.async_query_history(limit=2)
+
+        assert [game["game_id"] for game in games] == ["g3", "g2"]
+        assert calls == [None]
+        game_manager._archive.async_read.assert_not_awaited()
+
+
+class TestHighscoresPayload:
+    """Test the cached highscore response."""
+
+    @pytest.mark.asyncio
+    async def test_payload_reused_until_highscores_change(self, game_manager, sample_teams):
+        """Test the encoded payload is built once and rebuilt after a round."""
+        game_manager._game_state = GameState(
+            game_id="game1",
+            teams=sample_teams,
+            current_round=1,
+            rounds_played=[],
+            playlist_id="default",
+            played_song_ids=[],
+        )
+        sample_teams[0].score = 20
+
+        first = game_manager.get_highscores_json()
+        assert game_manager.get_highscores_json() is first
+        assert json.loads(first) == {"all_time_best": None, "by_round": {}}
+
+        await game_manager._update_highscores()
+        payload = game_manager.get_highscores_json()
+
+        assert payload is not first
+        assert json.loads(payload) == json.loads(json.dumps(game_manager.get_highscores()))
+        assert json.loads(payload)["all_time_best"]["team_name"] == "Team Alpha"
+
+    def test_payload_cleared_when_highscores_replaced(self, game_manager):
+        """Test replacing the highscore tables drops the cached payload."""
+        first = game_manager.get_highscores_json()
+
+        game_manager._highscores = HighscoreTracker()
+
+        assert game_manager.get_highscores_json() is not first
+
+
+class TestStateProjection:
+    """Test projecting the game state onto requested fields."""
+
+    @pytest.fixture
+    def active_game(self, game_manager, sample_teams):
+        """Set up a running game with a user assigned to the second team."""
+        sample_teams[1].assigned_user = "user_1"
+        game_manager._game_state = GameState(
+            game_id="game1",
+            teams=sample_teams,
+            current_round=2,
+            rounds_played=[],
+            playlist_id="default",
+            played_song_ids=[],
+        )
+        game_manager._round_active = True
+        game_manager._timer_remaining = 12
+        return game_manager
+
+    def test_default_state_unchanged(self, active_game):
+        """Test the state without a projection keeps every field."""
+        state = active_game.get_state()
+
+        assert list(state) == [
+            "active", "game_id", "teams", "current_round", "round_active",
+            "timer_remaining", "timer_seconds", "playback_status", "next_song_ready",
+            "auto_advance", "playlist_id", "current_song", "highscore_current_round",
+        ]
+
+    def test_timer_profile(self, active_game):
+        """Test the timer profile only carries the countdown."""
+        state = active_game.get_state(STATE_PROFILES[STATE_PROFILE_TIMER])
+
+        assert state == {
+            "active": True,
+            "game_id": "game1",
+            "current_round": 2,
+            "round_active": True,
+            "timer_remaining": 12,
+            "timer_seconds": 30,
+            "playback_status": None,
+        }
+
+    def test_player_profile_only_includes_own_team(self, active_game):
+        """Test the player profile returns the user's team instead of all teams."""
+        state = active_game.get_filtered_state(
+            "user_1", STATE_PROFILES[STATE_PROFILE_PLAYER]
+        )
+
+        assert "teams" not in state
+        assert state["team"]["id"] == "team_1"
+        assert state["can_control_teams"] == ["team_1"]
+
+    def test_round_properties(self, active_game):
+        """Test the read-only round properties mirror the state fields."""
+        assert active_game.round_active is True
+        assert active_game.timer_remaining == 12
+        assert active_game.playback_status is None
+        assert active_game.next_song_ready is False
+        assert active_game.get_user_team("user_1").id == "team_1"
+        assert active_game.get_user_team("admin") is None
+
+    def test_fields_always_include_active(self, active_game):
+        """Test a field list gets the active flag and skips unknown fields."""
+        assert active_game.get_state(["game_id", "media_player"]) == {
+            "active": True,
+            "game_id": "game1",
+        }
+
+
+class TestBackgroundPlayback:
+    """Test playing the round's snippet as a background job."""
+
+    @pytest.fixture
+    def playing_game(self, game_manager, mock_hass, mock_config_entry, sample_teams):
+        """Set up a running game whose background tasks run on the loop."""
+        mock_hass.bus.async_fire = MagicMock()
+        mock_config_entry.async_create_background_task = (
+            lambda hass, target, name: asyncio.create_task(target)
+        )
+        game_manager._game_state = GameState(
+            game_id="game1",
+            teams=sample_teams,
+            current_round=1,
+            rounds_played=[],
+            playlist_id="default",
+            played_song_ids=[],
+        )
+        return game_manager
+
+    def _actions(self, mock_hass):
+        """Get the broadcast state change actions, in order."""
+        return [call.args[1]["action"] for call in mock_hass.bus.async_fire.call_args_list]
+
+    @pytest.mark.asyncio
+    async def test_playback_reports_progress(self, playing_game, mock_hass):
+        """Test the job broadcasts starting, then started."""
+        controller = MagicMock(playback_timeout=10, queued_commands=0)
+        controller.play_snippet = AsyncMock(
+            return_value=PlaybackResult(success=True, media_player_state="playing")
+        )
+
+        playing_game.start_playback(controller, "track")
+        assert playing_game._playback_task is not None
+        await playing_game._playback_task
+
+        controller.play_snippet.assert_awaited_once_with(track_url="track", duration=30)
+        assert self._actions(mock_hass) == ["playback_starting", "playback_started"]
+        assert playing_game.get_state(["playback_status"])["playback_status"] == "playback_started"
+
+    @pytest.mark.asyncio
+    async def test_playback_failure_reported(self, playing_game, mock_hass):
+        """Test a failed snippet is broadcast with its error."""
+        controller = MagicMock(playback_timeout=10, queued_commands=0)
+        controller.play_snippet = AsyncMock(
+            return_value=PlaybackResult(success=False, error="Media player is unavailable")
+        )
+
+        playing_game.start_playback(controller, "track")
+        await playing_game._playback_task
+
+        assert self._actions(mock_hass)[-1] == "playback_failed"
+        assert mock_hass.bus.async_fire.call_args.args[1]["error"] == "Media player is unavailable"
+
+    @pytest.mark.asyncio
+    async def test_new_playback_abandons_previous(self, playing_game):
+        """Test starting playback again cancels the previous job."""
+        never_played = asyncio.Event()
+
+        async def _play(**kwargs):
+            await never_played.wait()
+
+        controller = MagicMock(playback_timeout=10, queued_commands=0)
+        controller.play_snippet = _play
+
+        playing_game.start_playback(controller, "first")
+        first = playing_game._playback_task
+        await asyncio.sleep(0)
+        playing_game.start_playback(controller, "second")
+        await asyncio.sleep(0)
+
+        assert first.cancelled()
+        playing_game._playback_task.cancel()
+
+
+class TestTimerOnAudio:
+    """Test starting the round timer when the snippet starts playing."""
+
+    @pytest.fixture
+    def audio_game(self, game_manager, mock_hass, mock_config_entry, sample_teams):
+        """Set up a running game with the timer waiting for audio."""
+        mock_hass.bus.async_fire = MagicMock()
+        mock_config_entry.options = {CONF_TIMER_ON_AUDIO: True}
+        mock_config_entry.async_create_background_task = (
+            lambda hass, target, name: asyncio.create_task(target)
+        )
+        game_manager._game_state = GameState(
+            game_id="game1",
+            teams=sample_teams,
+            current_round=0,
+            rounds_played=[],
+            playlist_id="default",
+            played_song_ids=[],
+        )
+        game_manager._run_timer = AsyncMock()
+        return game_manager
+
+    def _controller(self, result):
+        """Create a media controller returning the given result."""
+        controller = MagicMock(playback_timeout=10, queued_commands=0)
+        controller.play_snippet = AsyncMock(return_value=result)
+        return controller
+
+    @pytest.mark.asyncio
+    async def test_timer_anchored_to_playback(self, audio_game, sample_song):
+        """Test the countdown starts from when the player began playing."""
+        await audio_game.start_round(sample_song, with_playback=True)
+        assert audio_game._timer_task is None
+
+        started_at = dt_util.utcnow() - timedelta(seconds=2)
+        audio_game.start_playback(
+            self._controller(PlaybackResult(success=True, started_at=started_at)), "track"
+        )
+        await audio_game._playback_task
+
+        assert audio_game._timer_task is not None
+        assert audio_game._timer_remaining == 28
+
+    @pytest.mark.asyncio
+    async def test_timer_starts_when_playback_fails(self, audio_game, sample_song):
+        """Test the countdown falls back to starting when playback isn't confirmed."""
+        await audio_game.start_round(sample_song, with_playback=True)
+        audio_game.start_playback(
+            self._controller(PlaybackResult(success=False, error="timeout")), "track"
+        )
+        await audio_game._playback_task
+
+        assert audio_game._timer_task is not None
+        assert audio_game._timer_remaining == 30
+
+    @pytest.mark.asyncio
+    async def test_timer_starts_when_playback_hangs(self, audio_game, sample_song, mock_hass):
+        """Test the countdown starts once a stuck play command times out."""
+        async def _play(**kwargs):
+            await asyncio.Event().wait()
+
+        controller = MagicMock(playback_timeout=0.01, queued_commands=0)
+        controller.play_snippet = _play
+        controller.stop_playback = AsyncMock()
+
+        await audio_game.start_round(sample_song, with_playback=True)
+        audio_game.start_playback(controller, "track")
+        await audio_game._playback_task
+
+        assert audio_game._timer_task is not None
+        assert audio_game.playback_status == "playback_failed"
+        assert "did not start" in mock_hass.bus.async_fire.call_args.args[1]["error"]
+        controller.stop_playback.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_no_play_after_timeout(self, audio_game, sample_song, mock_hass):
+        """Test a snippet queued behind a stuck command never plays once abandoned."""
+        mock_hass.loop = asyncio.get_running_loop()
+        mock_hass.async_create_background_task = (
+            lambda target, name: asyncio.create_task(target)
+        )
+        mock_hass.states.get.return_value = MagicMock(state="idle", attributes={})
+        released = asyncio.Event()
+        services = []
+
+        async def _call(domain, service, data, blocking=False):
+            services.append(service)
+            if service == "volume_set":
+                await released.wait()
+
+        mock_hass.services.async_call = _call
+        controller = MediaController(mock_hass, "media_player.test", playback_timeout=0.01)
+        volume = asyncio.create_task(controller.set_volume(0.5))
+        await asyncio.sleep(0)
+
+        await audio_game.start_round(sample_song, with_playback=True)
+        audio_game.start_playback(controller, "track")
+        await audio_game._playback_task
+        released.set()
+        await volume
+        while controller.queued_commands:
+            await asyncio.sleep(0)
+
+        assert audio_game.playback_status == "playback_failed"
+        assert "play_media" not in services
+        assert services[-1] == "media_stop"
+
+    @pytest.mark.asyncio
+    async def test_timer_starts_without_playback(self, audio_game, sample_song):
+        """Test rounds without a media player start the timer right away."""
+        await audio_game.start_round(sample_song)
+
+        assert audio_game._timer_task is not None
+
+
+class TestPrefetch:
+    """Test preparing the next round during the reveal."""
+
+    @pytest.fixture
+    def reveal_game(self, game_manager, mock_hass, mock_config_entry, sample_teams):
+        """Set up a game whose catalog holds two songs, one already played."""
+        mock_hass.bus.async_fire = MagicMock()
+        mock_config_entry.async_create_background_task = (
+            lambda hass, target, name: asyncio.create_task(target)
+        )
+        game_manager._game_state = GameState(
+            game_id="game1",
+            teams=sample_teams,
+            current_round=1,
+            rounds_played=[],
+            playlist_id="80s",
+            played_song_ids=[1],
+        )
+        game_manager._catalog._songs = [
+            {"id": 1, "url": "played", "year": 1985, "playlist_ids": ["80s"]},
+            {"id": 2, "url": "spotify:track:next", "year": 1986, "playlist_ids": ["80s"]},
+            {"id": 3, "url": "other", "year": 1995, "playlist_ids": ["90s"]},
+        ]
+        game_manager._catalog._playlists = {"80s": {"id": "80s"}, "90s": {"id": "90s"}}
+        return game_manager
+
+    def _controller(self, mock_hass, state="idle", success=True):
+        """Register a media controller for the entry."""
+        controller = MagicMock()
+        controller.prepare_snippet = AsyncMock(return_value=PlaybackResult(success=success))
+        controller.stop_playback = AsyncMock(return_value=PlaybackResult(success=True))
+        controller.get_current_state.return_value = {"state": state}
+        mock_hass.data = {"soundbeatsv2": {"test_entry": {"media_controller": controller}}}
+        return controller
+
+    @pytest.mark.asyncio
+    async def test_prefetch_picks_and_prepares(self, reveal_game, mock_hass):
+        """Test the next song is picked from the playlist and the player prepared."""
+        controller = self._controller(mock_hass)
+
+        reveal_game.start_prefetch()
+        await reveal_game._prefetch_task
+
+        controller.prepare_snippet.assert_awaited_once_with("spotify:track:next")
+        assert await reveal_game.async_next_song() == reveal_game._catalog._songs[1]
+        assert reveal_game.get_state(["next_song_ready"])["next_song_ready"] is True
+        event = mock_hass.bus.async_fire.call_args.args[1]
+        assert event["action"] == "next_song_ready"
+        assert event["prepared"] is True
+        assert "spotify:track:next" not in str(event)
+
+    @pytest.mark.asyncio
+    async def test_prefetch_without_media_player(self, reveal_game, mock_hass):
+        """Test the song is still picked when no media player is configured."""
+        reveal_game.start_prefetch()
+        await reveal_game._prefetch_task
+
+        assert reveal_game._next_song["id"] == 2
+        assert mock_hass.bus.async_fire.call_args.args[1]["prepared"] is False
+
+    @pytest.mark.asyncio
+    async def test_start_round_consumes_prefetched_song(self, reveal_game, mock_hass):
+        """Test starting the round clears the prefetched song."""
+        reveal_game._run_timer = AsyncMock()
+        reveal_game.start_prefetch()
+        await reveal_game._prefetch_task
+
+        await reveal_game.start_round(await reveal_game.async_next_song())
+
+        assert reveal_game._next_song is None
+        assert reveal_game._game_state.played_song_ids == [1, 2]
+        with pytest.raises(ValueError):
+            await reveal_game.async_next_song()
+
+    @pytest.mark.asyncio
+    async def test_start_round_rejects_active_round(self, reveal_game):
+        """Test a round can't start on top of one still being played."""
+        reveal_game._run_timer = AsyncMock()
+        await reveal_game.start_round({"id": 2, "url": "second", "year": 1995})
+
+        with pytest.raises(ValueError):
+            await reveal_game.start_round({"id": 3, "url": "third", "year": 2005})
+        assert reveal_game._game_state.current_round == 2
+        assert reveal_game._current_song["id"] == 2
+
+    @pytest.mark.asyncio
+    async def test_keepalive_stops_when_idle(self, reveal_game, mock_hass):
+        """Test the keepalive runs from a round until no round started for a while."""
+        controller = self._controller(mock_hass)
+        reveal_game._run_timer = AsyncMock()
+
+        with patch(
+            "custom_components.soundbeatsv2.game_manager.async_call_later"
+        ) as mock_call_later:
+            await reveal_game.start_round({"id": 2, "url": "second", "year": 1986})
+
+        controller.start_keepalive.assert_called_once()
+        assert mock_call_later.call_args.args[1] == SPOTIFY_KEEPALIVE_IDLE_TIMEOUT
+        controller.stop_keepalive.assert_not_called()
+
+        mock_call_later.call_args.args[2](dt_util.utcnow())
+        controller.stop_keepalive.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_next_round_stops_revealed_track(self, reveal_game, mock_hass):
+        """Test the revealed track is stopped before the next round starts."""
+        controller = self._controller(mock_hass, state="playing")
+
+        await reveal_game.next_round()
+        await asyncio.sleep(0)
+
+        controller.stop_playback.assert_awaited_once()
+
+
+class TestTrackUrl:
+    """Test choosing where a round's snippet is played from."""
+
+    def _store(self, mock_hass, url):
+        """Register a snippet store for the entry."""
+        store = MagicMock()
+        store.url.return_value = url
+        mock_hass.data = {"soundbeatsv2": {"test_entry": {"snippet_store": store}}}
+        return store
+
+    def test_local_snippet(self, game_manager, mock_hass, sample_song):
+        """Test a player that accepts direct URLs gets the local snippet."""
+        store = self._store(mock_hass, "http://ha.local/snippet.wav")
+        controller = MagicMock()
+        controller.supports_spotify.return_value = False
+
+        assert game_manager.track_url(sample_song, controller) == "http://ha.local/snippet.wav"
+        store.url.assert_called_once_with(sample_song["id"])
+
+    def test_falls_back_to_song_url(self, game_manager, mock_hass, sample_song):
+        """Test songs without a local snippet are streamed."""
+        self._store(mock_hass, None)
+        controller = MagicMock()
+        controller.supports_spotify.return_value = False
+
+        assert game_manager.track_url(sample_song, controller) == sample_song["url"]
+
+    def test_spotify_player_streams(self, game_manager, mock_hass, sample_song):
+        """Test Spotify players keep streaming the song."""
+        store = self._store(mock_hass, "http://ha.local/snippet.wav")
+        controller = MagicMock()
+        controller.supports_spotify.return_value = True
+
+        assert game_manager.track_url(sample_song, controller) == sample_song["url"]
+        store.url.assert_not_called()
+
+    def test_local_snippets_disabled(self, game_manager, sample_song):
+        """Test the song URL is used without a snippet store."""
+        controller = MagicMock()
+        controller.supports_spotify.return_value = False
+
+        assert game_manager.track_url(sample_song, controller) == sample_song["url"]
+
+
+class TestAutoAdvance:
+    """Test the auto-advance round pipeline."""
+
+    @pytest.fixture
+    def pipeline_game(self, game_manager, mock_hass, mock_config_entry, sample_teams):
+        """Set up a game with two songs left whose rounds end right away."""
+        mock_hass.bus.async_fire = MagicMock()
+        mock_config_entry.async_create_background_task = (
+            lambda hass, target, name: asyncio.create_task(target)
+        )
+        game_manager._game_state = GameState(
+            game_id="game1",
+            teams=sample_teams,
+            current_round=0,
+            rounds_played=[],
+            playlist_id="default",
+            played_song_ids=[],
+        )
+        game_manager._catalog._songs = [
+            {"id": 1, "url": "first", "year": 1985},
+            {"id": 2, "url": "second", "year": 1995},
+        ]
+        game_manager._storage = MagicMock(incremental=False)
+        game_manager._update_highscores = AsyncMock(return_value=[])
+
+        async def _save_state():
+            await asyncio.sleep(0)
+
+        async def _expire_timer():
+            await asyncio.sleep(0)
+            await game_manager.end_round()
+
+        game_manager.save_state = _save_state
+        game_manager._run_timer = _expire_timer
+        return game_manager
+
+    async def _settle(self):
+        """Let the pipeline's tasks run."""
+        for _ in range(50):
+            await asyncio.sleep(0)
+
+    @pytest.mark.asyncio
+    async def test_plays_rounds_until_out_of_songs(self, pipeline_game, mock_hass):
+        """Test rounds start, end and advance without admin actions."""
+        await pipeline_game.start_auto_advance(reveal_seconds=0)
+        assert pipeline_game.auto_advance == "running"
+        await pipeline_game._auto_advance_task
+
+        assert pipeline_game._game_state.current_round == 2
+        assert sorted(pipeline_game._game_state.played_song_ids) == [1, 2]
+        assert len(pipeline_game._game_state.rounds_played) == 2
+        assert pipeline_game.auto_advance is None
+        assert mock_hass.bus.async_fire.call_args.args[1] == {
+            "game_id": "game1", "action": "auto_advance_changed", "auto_advance": None,
+        }
+
+    @pytest.mark.asyncio
+    async def test_pause_holds_next_round(self, pipeline_game):
+        """Test a paused pipeline finishes the round but starts no new one."""
+        await pipeline_game.start_auto_advance(reveal_seconds=0)
+        while not pipeline_game._round_active:
+            await asyncio.sleep(0)
+        await pipeline_game.pause_auto_advance()
+        await self._settle()
+
+        assert pipeline_game.auto_advance == "paused"
+        assert pipeline_game._game_state.current_round == 1
+        assert not pipeline_game._round_active
+
+        await pipeline_game.start_auto_advance()
+        await pipeline_game._auto_advance_task
+        assert pipeline_game._game_state.current_round == 2
+
+    @pytest.mark.asyncio
+    async def test_round_started_by_hand_while_picking(self, pipeline_game):
+        """Test the pipeline plays out a round started while it picked a song."""
+        next_song = pipeline_game.async_next_song
+        calls = []
+
+        async def _next_song():
+            song = await next_song()
+            if not calls:
+                await pipeline_game.start_round({"id": 2, "url": "second", "year": 1995})
+            calls.append(song)
+            return song
+
+        pipeline_game.async_next_song = _next_song
+        await pipeline_game.start_auto_advance(reveal_seconds=0)
+        await pipeline_game._auto_advance_task
+
+        assert pipeline_game._game_state.current_round == 2
+        assert pipeline_game._game_state.played_song_ids == [2, 1]
+        assert len(pipeline_game._game_state.rounds_played) == 2
+
+    @pytest.mark.asyncio
+    async def test_stop_cancels_pipeline(self, pipeline_game):
+        """Test stopping leaves the game as it is."""
+        await pipeline_game.start_auto_advance(reveal_seconds=60)
+        await self._settle()
+        task = pipeline_game._auto_advance_task
+
+        await pipeline_game.stop_auto_advance()
+        await asyncio.sleep(0)
+
+        assert task.cancelled()
+        assert pipeline_game.auto_advance is None
+        assert pipeline_game._game_state.current_round == 1
+
+    @pytest.mark.asyncio
+    async def test_requires_active_game(self, game_manager):
+        """Test the pipeline can't start without a game."""
+        with pytest.raises(ValueError):
+            await game_manager.start_auto_advance()
+
+
 class TestGameManager:
     """Test GameManager class."""
 
@@ -218,7 +1138,7 @@ class TestGameManager:
         await game_manager.submit_guess("team_0", 1985)
         
         score = game_manager._calculate_score("team_0")
-        assert score == POINTS_EXACT
+        assert score == POINTS_EXACT_YEAR
 
     @pytest.mark.asyncio
     async def test_calculate_score_close_match(self, game_manager, sample_song):
@@ -228,7 +1148,7 @@ class TestGameManager:
         await game_manager.submit_guess("team_0", 1984)  # Off by 1
         
         score = game_manager._calculate_score("team_0")
-        assert score == POINTS_CLOSE
+        assert score == POINTS_WITHIN_3_YEARS
 
     @pytest.mark.asyncio
     async def test_calculate_score_with_bet_exact(self, game_manager, sample_song):
@@ -238,7 +1158,7 @@ class TestGameManager:
         await game_manager.submit_guess("team_0", 1985, has_bet=True)
         
         score = game_manager._calculate_score("team_0")
-        expected = POINTS_EXACT * POINTS_BET_MULTIPLIER
+        expected = POINTS_EXACT_WITH_BET
         assert score == expected
 
     @pytest.mark.asyncio
@@ -249,7 +1169,7 @@ class TestGameManager:
         await game_manager.submit_guess("team_0", 1990, has_bet=True)  # Wrong
         
         score = game_manager._calculate_score("team_0")
-        assert score == -POINTS_EXACT  # Penalty for wrong bet
+        assert score == POINTS_WRONG_WITH_BET  # Penalty for wrong bet
 
     @pytest.mark.asyncio
     async def test_end_round_updates_scores(self, game_manager, sample_song):
@@ -266,8 +1186,8 @@ class TestGameManager:
         result = await game_manager.end_round()
         
         assert result["success"] is True
-        assert game_manager.current_state.teams[0].score == POINTS_EXACT
-        assert game_manager.current_state.teams[1].score == POINTS_CLOSE
+        assert game_manager.current_state.teams[0].score == POINTS_EXACT_YEAR
+        assert game_manager.current_state.teams[1].score == POINTS_WITHIN_3_YEARS
         assert game_manager.current_state.current_round == 2
 
     @pytest.mark.asyncio
@@ -0,0 +1,79 @@
+"""Tests for latency.py"""
+import pytest
+from unittest.mock import MagicMock
+
+from custom_components.soundbeatsv2.latency import (
+    LatencyProfiles,
+    expected_latency,
+    latency_stats,
+    profile_timeout,
+)
+
+
+PROFILE = {
+    "entity_id": "media_player.kitchen",
+    "play": {"min": 0.4, "median": 0.8, "p90": 1.5, "max": 1.6},
+    "pause": None,
+}
+
+
+@pytest.fixture
+def mock_hass(tmp_path):
+    """Mock Home Assistant instance storing files under tmp_path."""
+    hass = MagicMock()
+    hass.config.path = lambda *parts: str(tmp_path.joinpath(*parts))
+    return hass
+
+
+class TestLatencyStats:
+    """Test summarizing latency samples."""
+
+    def test_stats(self):
+        """Test min, median, 90th percentile and max."""
+        samples = [0.1 * n for n in range(10, 0, -1)]
+
+        assert latency_stats(samples) == {"min": 0.1, "median": 0.55, "p90": 0.9, "max": 1.0}
+
+    def test_no_samples(self):
+        """Test an operation without samples has no stats."""
+        assert latency_stats([]) is None
+
+
+class TestProfileUse:
+    """Test deriving timeouts and latencies from a profile."""
+
+    def test_timeout_from_profile(self):
+        """Test the timeout is a multiple of the 90th percentile."""
+        assert profile_timeout(PROFILE, "play", 10) == pytest.approx(4.5)
+
+    def test_timeout_capped_by_fallback(self):
+        """Test a slow player never waits longer than configured."""
+        assert profile_timeout(PROFILE, "play", 3) == 3
+
+    def test_timeout_without_measurement(self):
+        """Test operations without a measurement use the fallback."""
+        assert profile_timeout(PROFILE, "pause", 10) == 10
+        assert profile_timeout(None, "play", 10) == 10
+
+    def test_expected_latency(self):
+        """Test the typical latency is the median."""
+        assert expected_latency(PROFILE, "play") == 0.8
+        assert expected_latency(None, "play") is None
+
+
+class TestLatencyProfiles:
+    """Test storing latency profiles."""
+
+    @pytest.mark.asyncio
+    async def test_profiles_persist(self, mock_hass, tmp_path):
+        """Test a saved profile is loaded again by entity ID."""
+        (tmp_path / ".storage").mkdir()
+        profiles = LatencyProfiles(mock_hass, "soundbeatsv2.test_entry")
+        await profiles.async_load()
+        assert profiles.get("media_player.kitchen") is None
+
+        await profiles.async_save_profile(PROFILE)
+        reloaded = LatencyProfiles(mock_hass, "soundbeatsv2.test_entry")
+        await reloaded.async_load()
+
+        assert reloaded.get("media_player.kitchen") == PROFILE
@@ -0,0 +1,108 @@
+"""Tests for leaderboard.py"""
+from custom_components.soundbeatsv2.leaderboard import (
+    LeaderboardIndex,
+    LeaderboardKey,
+    TopK,
+    timer_bucket,
+)
+
+
+def _identity(value):
+    """Rank plain numbers by themselves."""
+    return value
+
+
+class TestTopK:
+    """Test TopK class."""
+
+    def test_keeps_best_items_in_order(self):
+        """Test only the best items are kept, best first."""
+        table = TopK(3, _identity)
+        for value in [5, 1, 9, 7, 3]:
+            table.add(value)
+
+        assert table.as_list() == [9, 7, 5]
+        assert list(table) == [9, 7, 5]
+        assert table.best == 9
+        assert table.floor == 5
+
+    def test_rejects_items_at_or_below_floor(self):
+        """Test a full table rejects items that do not beat the floor."""
+        table = TopK(2, _identity)
+        assert table.add(4)
+        assert table.add(6)
+
+        assert not table.add(4)
+        assert not table.add(1)
+        assert table.add(5)
+        assert table.as_list() == [6, 5]
+
+    def test_earlier_items_win_ties(self):
+        """Test equal scores keep insertion order."""
+        table = TopK(3, lambda item: item[0])
+        for item in [(5, "a"), (5, "b"), (7, "c"), (5, "d")]:
+            table.add(item)
+
+        assert table.as_list() == [(7, "c"), (5, "a"), (5, "b")]
+
+    def test_empty_table(self):
+        """Test an empty table."""
+        table = TopK(3, _identity)
+        assert table.best is None
+        assert table.floor is None
+        assert len(table) == 0
+
+
+def _index(items):
+    """Build an index over (playlist, rounds, timer, teams, score) tuples."""
+    index = LeaderboardIndex(
+        2,
+        lambda item: LeaderboardKey(item[0], item[1], timer_bucket(item[2]), item[3]),
+        lambda item: item[4],
+    )
+    for item in items:
+        index.add(item)
+    return index
+
+
+class TestLeaderboardIndex:
+    """Test LeaderboardIndex class."""
+
+    def test_timer_bucket(self):
+        """Test timer lengths map to bucket upper bounds."""
+        assert timer_bucket(10) == 15
+        assert timer_bucket(30) == 30
+        assert timer_bucket(45) == 60
+        assert timer_bucket(300) == 300
+        assert timer_bucket(None) == 0
+
+    def test_query_by_dimensions(self):
+        """Test queries only visit matching tables."""
+        index = _index([
+            ("80s", 10, 10, 2, 8.0),
+            ("80s", 10, 300, 2, 9.0),
+            ("80s", 5, 10, 2, 9.5),
+            ("rock", 10, 10, 2, 7.0),
+        ])
+
+        best_ten_rounds = index.query(playlist_id="80s", rounds=10)
+        assert [item[4] for item in best_ten_rounds] == [9.0, 8.0]
+
+        short_timer = index.query(timer_bucket=15, team_count=2)
+        assert [item[4] for item in short_timer] == [9.5, 8.0, 7.0]
+
+        assert index.query(playlist_id="90s") == []
+
+    def test_round_range_and_pagination(self):
+        """Test round ranges and offset/limit paging."""
+        index = _index([("80s", rounds, 30, 3, float(rounds)) for rounds in range(1, 8)])
+
+        assert [item[1] for item in index.query(min_rounds=3, max_rounds=5)] == [5, 4, 3]
+        assert [item[1] for item in index.query(offset=2, limit=2)] == [5, 4]
+
+    def test_tables_are_bounded(self):
+        """Test each key keeps only its top K."""
+        index = _index([("80s", 10, 30, 2, float(score)) for score in range(5)])
+
+        assert len(index) == 2
+        assert [item[4] for item in index.query()] == [4.0, 3.0]
@@ -2,11 +2,13 @@
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 import asyncio
+from datetime import datetime, timedelta, timezone
+
+from homeassistant.exceptions import HomeAssistantError
 
 from custom_components.soundbeatsv2.media_controller import (
     MediaController,
     PlaybackResult,
-    MediaPlayerError,
 )
 
 
@@ -38,8 +40,12 @@ def mock_media_player_state():
 
 
 @pytest.fixture
-def media_controller(mock_hass):
-    """Create MediaController instance."""
+async def media_controller(mock_hass):
+    """Create MediaController instance running its command queue on the loop."""
+    mock_hass.loop = asyncio.get_running_loop()
+    mock_hass.async_create_background_task = (
+        lambda target, name: asyncio.create_task(target)
+    )
     return MediaController(mock_hass, "media_player.test")
 
 
@@ -338,4 +344,415 @@ class TestMediaController:
             task = asyncio.create_task(change_state())
             success = await media_controller._wait_for_playback_state("playing", timeout=1)
             await task
-            assert success is True
\ No newline at end of file
+            assert success is True
+
+def _player_state(state, **attributes):
+    """Create a mock media player state updated now."""
+    mock_state = MagicMock()
+    mock_state.state = state
+    mock_state.attributes = attributes
+    mock_state.last_updated = datetime.now(timezone.utc)
+    return mock_state
+
+
+class TestStateConfirmation:
+    """Test waiting for media player state changes instead of sleeping."""
+
+    @pytest.fixture
+    async def tracked(self, mock_hass):
+        """Capture the state change listener the controller registers."""
+        mock_hass.loop = asyncio.get_running_loop()
+        mock_hass.async_create_background_task = (
+            lambda target, name: asyncio.create_task(target)
+        )
+        listeners = []
+        unsub = MagicMock()
+
+        def _track(hass, entity_ids, action):
+            listeners.append(action)
+            return unsub
+
+        with patch(
+            "custom_components.soundbeatsv2.media_controller.async_track_state_change_event",
+            side_effect=_track,
+        ):
+            yield listeners, unsub
+
+    @pytest.mark.asyncio
+    async def test_play_returns_when_playing(self, mock_hass, tracked):
+        """Test playback is confirmed as soon as the player reports playing."""
+        listeners, unsub = tracked
+        controller = MediaController(mock_hass, "media_player.test", playback_timeout=5)
+        mock_hass.states.get.return_value = _player_state("idle")
+
+        task = asyncio.create_task(controller.play_snippet("track", duration=0))
+        while not listeners:
+            await asyncio.sleep(0)
+        event = MagicMock()
+        event.data = {"new_state": _player_state("playing")}
+        listeners[0](event)
+        result = await asyncio.wait_for(task, 1)
+
+        assert result.success is True
+        assert result.media_player_state == "playing"
+        unsub.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_play_gives_up_after_timeout(self, mock_hass, tracked):
+        """Test the latest state is reported when the player never starts."""
+        listeners, unsub = tracked
+        controller = MediaController(mock_hass, "media_player.test", playback_timeout=0.01)
+        mock_hass.states.get.return_value = _player_state("idle")
+
+        result = await controller.play_snippet("track", duration=0)
+
+        assert result.success is True
+        assert result.media_player_state == "idle"
+        unsub.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_matching_state_skips_listener(self, mock_hass, tracked):
+        """Test no listener is registered when the state already matches."""
+        listeners, _ = tracked
+        controller = MediaController(mock_hass, "media_player.test")
+        mock_hass.states.get.return_value = _player_state("idle", source="Kitchen")
+
+        ready, error = await controller._ensure_media_player_ready()
+        selected = await controller._ensure_spotify_source()
+
+        assert ready and error is None
+        assert selected
+        assert listeners == []
+
+
+class TestCommandQueue:
+    """Test the serialized media command queue."""
+
+    @pytest.fixture
+    async def controller(self, mock_hass):
+        """Create a controller whose player starts playing on play_media."""
+        mock_hass.loop = asyncio.get_running_loop()
+        mock_hass.async_create_background_task = (
+            lambda target, name: asyncio.create_task(target)
+        )
+        mock_hass.states.get.return_value = _player_state("idle")
+
+        async def _call(domain, service, data, blocking=False):
+            if service == "play_media":
+                mock_hass.states.get.return_value = _player_state("playing")
+
+        mock_hass.services.async_call.side_effect = _call
+        controller = MediaController(mock_hass, "media_player.test", playback_timeout=5)
+        yield controller
+        await controller.async_shutdown()
+
+    def _services(self, mock_hass):
+        """Get the media player services called, in order."""
+        return [call.args[1] for call in mock_hass.services.async_call.call_args_list]
+
+    @pytest.mark.asyncio
+    async def test_repeated_pause_merged(self, controller, mock_hass):
+        """Test two queued pauses make one service call."""
+        first, second = await asyncio.gather(
+            controller.pause_playback(), controller.pause_playback()
+        )
+
+        assert first.success and second.success
+        assert self._services(mock_hass) == ["media_pause"]
+
+    @pytest.mark.asyncio
+    async def test_stop_before_play_merged(self, controller, mock_hass):
+        """Test a queued stop is dropped for the snippet that follows it."""
+        stopped, played = await asyncio.gather(
+            controller.stop_playback(), controller.play_snippet("track", duration=0)
+        )
+
+        assert stopped.success is False
+        assert "Superseded" in stopped.error
+        assert played.success
+        assert self._services(mock_hass) == ["play_media"]
+
+    @pytest.mark.asyncio
+    async def test_play_before_stop_superseded(self, controller, mock_hass):
+        """Test a queued snippet dropped for a stop reports it never played."""
+        played, stopped = await asyncio.gather(
+            controller.play_snippet("track", duration=0), controller.stop_playback()
+        )
+
+        assert played.success is False
+        assert "Superseded" in played.error
+        assert played.started_at is None
+        assert stopped.success
+        assert "play_media" not in self._services(mock_hass)
+
+    @pytest.mark.asyncio
+    async def test_stop_cancels_waiting_snippet(self, controller, mock_hass):
+        """Test a stop aborts a snippet still waiting for the player to start."""
+        mock_hass.services.async_call.side_effect = None
+        with patch(
+            "custom_components.soundbeatsv2.media_controller.async_track_state_change_event"
+        ) as mock_track:
+            play = asyncio.create_task(controller.play_snippet("track", duration=30))
+            while not mock_track.called:
+                await asyncio.sleep(0)
+
+            stopped = await controller.stop_playback()
+            played = await play
+
+        assert stopped.success
+        assert played.success is False
+        assert "Superseded" in played.error
+        assert controller._auto_pause_timer is None
+        mock_track.return_value.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_pause_cancels_earlier_auto_pause(self, controller, mock_hass):
+        """Test the controller keeps the auto-pause so a later pause can cancel it."""
+        await controller.play_snippet("track", duration=30)
+        auto_pause = controller._auto_pause_timer
+        assert auto_pause is not None
+
+        await controller.pause_playback()
+        await asyncio.sleep(0)
+
+        assert auto_pause.done()
+        assert controller._auto_pause_timer is None
+        assert self._services(mock_hass) == ["play_media", "media_pause"]
+
+
+class TestLatencyCalibration:
+    """Test measuring and using media player latency."""
+
+    @pytest.fixture
+    async def controller(self, mock_hass):
+        """Create a controller whose player follows each command."""
+        mock_hass.loop = asyncio.get_running_loop()
+        mock_hass.async_create_background_task = (
+            lambda target, name: asyncio.create_task(target)
+        )
+        mock_hass.states.get.return_value = _player_state("idle", source="Kitchen")
+        states = {"play_media": "playing", "media_pause": "paused", "media_stop": "idle"}
+
+        async def _call(domain, service, data, blocking=False):
+            if service in states:
+                mock_hass.states.get.return_value = _player_state(
+                    states[service], source="Kitchen"
+                )
+
+        mock_hass.services.async_call.side_effect = _call
+        controller = MediaController(mock_hass, "media_player.spotify_test", playback_timeout=5)
+        yield controller
+        await controller.async_shutdown()
+
+    @pytest.mark.asyncio
+    async def test_calibration_builds_profile(self, controller, mock_hass):
+        """Test starting playback is timed and summarized per player."""
+        profile = await controller.async_calibrate("track", samples=2)
+
+        assert profile is controller.latency_profile
+        assert profile["entity_id"] == "media_player.spotify_test"
+        assert profile["player_type"] == "spotify"
+        assert profile["samples"] == 2
+        assert profile["timeouts"] == 0
+        assert set(profile["play"]) == {"min", "median", "p90", "max"}
+        assert "stop" not in profile
+        services = [call.args[1] for call in mock_hass.services.async_call.call_args_list]
+        assert services == ["play_media", "media_stop"] * 2
+
+    @pytest.mark.asyncio
+    async def test_calibration_fails_without_playback(self, controller, mock_hass):
+        """Test a player that never plays raises and keeps no profile."""
+        mock_hass.services.async_call.side_effect = None
+        controller.playback_timeout = 0.01
+
+        with pytest.raises(HomeAssistantError):
+            await controller.async_calibrate("track", samples=1)
+
+        assert controller.latency_profile is None
+
+    @pytest.mark.asyncio
+    async def test_unconfirmed_start_uses_profile(self, controller, mock_hass):
+        """Test an unconfirmed snippet is assumed to start after the usual latency."""
+        mock_hass.services.async_call.side_effect = None
+        controller.playback_timeout = 0.01
+        controller.latency_profile = {
+            "play": {"min": 0.5, "median": 1.5, "p90": 1.8, "max": 2.0},
+        }
+        before = datetime.now(timezone.utc)
+
+        result = await controller.play_snippet("track", duration=0)
+
+        assert result.media_player_state == "idle"
+        assert result.started_at >= before + timedelta(seconds=1.5)
+
+
+class TestPrepareSnippet:
+    """Test getting the player ready ahead of the next snippet."""
+
+    @pytest.fixture
+    async def controller(self, mock_hass):
+        """Create a Spotify controller whose player is off without a source."""
+        mock_hass.loop = asyncio.get_running_loop()
+        mock_hass.async_create_background_task = (
+            lambda target, name: asyncio.create_task(target)
+        )
+        mock_hass.states.get.return_value = _player_state("off", source_list=["Kitchen"])
+
+        async def _call(domain, service, data, blocking=False):
+            current = mock_hass.states.get.return_value
+            if service == "turn_on":
+                mock_hass.states.get.return_value = _player_state(
+                    "idle", **current.attributes
+                )
+            elif service == "select_source":
+                mock_hass.states.get.return_value = _player_state(
+                    current.state, **{**current.attributes, "source": data["source"]}
+                )
+            elif service == "play_media":
+                mock_hass.states.get.return_value = _player_state(
+                    "playing", **current.attributes
+                )
+
+        mock_hass.services.async_call.side_effect = _call
+        controller = MediaController(mock_hass, "media_player.spotify", playback_timeout=5)
+        yield controller
+        await controller.async_shutdown()
+
+    def _services(self, mock_hass):
+        """Get the media player services called, in order."""
+        return [call.args[1] for call in mock_hass.services.async_call.call_args_list]
+
+    @pytest.mark.asyncio
+    async def test_prepared_snippet_only_plays(self, controller, mock_hass):
+        """Test a prepared snippet skips turning on and source selection."""
+        prepared = await controller.prepare_snippet("track")
+        assert prepared.success
+        assert self._services(mock_hass) == ["turn_on", "select_source"]
+
+        played = await controller.play_snippet("track", duration=0)
+
+        assert played.success
+        assert self._services(mock_hass) == ["turn_on", "select_source", "play_media"]
+
+    @pytest.mark.asyncio
+    async def test_other_track_not_prepared(self, controller, mock_hass):
+        """Test preparing one track does not skip checks for another."""
+        await controller.prepare_snippet("track")
+        mock_hass.states.get.return_value = _player_state("off", source_list=["Kitchen"])
+
+        played = await controller.play_snippet("other", duration=0)
+
+        assert played.success
+        assert self._services(mock_hass) == [
+            "turn_on", "select_source", "turn_on", "play_media",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_play_supersedes_queued_prepare(self, controller, mock_hass):
+        """Test a snippet queued behind a prepare takes over its work."""
+        prepared, played = await asyncio.gather(
+            controller.prepare_snippet("track"), controller.play_snippet("track", duration=0)
+        )
+
+        assert prepared.success is False
+        assert "Superseded" in prepared.error
+        assert played.success
+        assert self._services(mock_hass) == ["turn_on", "select_source", "play_media"]
+
+
+class TestSpotifySourceCache:
+    """Test the known-good Spotify source and its keepalive."""
+
+    @pytest.fixture
+    async def controller(self, mock_hass):
+        """Create a Spotify controller whose player has two idle devices."""
+        mock_hass.loop = asyncio.get_running_loop()
+        mock_hass.async_create_background_task = (
+            lambda target, name: asyncio.create_task(target)
+        )
+        mock_hass.states.get.return_value = _player_state(
+            "idle", source_list=["Living Room", "Kitchen"]
+        )
+
+        async def _call(domain, service, data, blocking=False):
+            current = mock_hass.states.get.return_value
+            if service == "select_source":
+                mock_hass.states.get.return_value = _player_state(
+                    current.state, **{**current.attributes, "source": data["source"]}
+                )
+            elif service == "play_media":
+                mock_hass.states.get.return_value = _player_state(
+                    "playing", **current.attributes
+                )
+
+        mock_hass.services.async_call.side_effect = _call
+        controller = MediaController(mock_hass, "media_player.spotify", playback_timeout=5)
+        yield controller
+        await controller.async_shutdown()
+
+    def _drop_source(self, mock_hass):
+        """Make Spotify forget the selected device."""
+        mock_hass.states.get.return_value = _player_state(
+            "idle", source_list=["Living Room", "Kitchen"]
+        )
+
+    def _selected(self, mock_hass):
+        """Get the sources selected, in order."""
+        return [
+            call.args[2]["source"]
+            for call in mock_hass.services.async_call.call_args_list
+            if call.args[1] == "select_source"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_known_source_skips_selection(self, controller, mock_hass):
+        """Test rounds after the first one don't select a source."""
+        await controller.play_snippet("first", duration=0)
+        self._drop_source(mock_hass)
+
+        result = await controller.play_snippet("second", duration=0)
+
+        assert result.success
+        assert self._selected(mock_hass) == ["Living Room"]
+
+    @pytest.mark.asyncio
+    async def test_expired_source_reselected(self, controller, mock_hass):
+        """Test an expired source is checked again, preferring the known device."""
+        controller._spotify_sources["media_player.spotify"] = ("Kitchen", 0.0)
+
+        await controller.play_snippet("track", duration=0)
+
+        assert self._selected(mock_hass) == ["Kitchen"]
+
+    @pytest.mark.asyncio
+    async def test_keepalive_reselects_dropped_device(self, controller, mock_hass):
+        """Test the keepalive puts the known device back once Spotify drops it."""
+        with patch(
+            "custom_components.soundbeatsv2.media_controller.async_track_time_interval"
+        ) as mock_track:
+            controller.start_keepalive()
+            controller.start_keepalive()
+        mock_track.assert_called_once()
+        tick = mock_track.call_args.args[1]
+        for _ in range(10):
+            await asyncio.sleep(0)
+        controller._spotify_sources["media_player.spotify"] = ("Kitchen", 0.0)
+        self._drop_source(mock_hass)
+
+        await tick(None)
+
+        assert self._selected(mock_hass) == ["Living Room", "Kitchen"]
+        assert controller._known_spotify_source() == "Kitchen"
+
+        await controller.async_shutdown()
+        mock_track.return_value.assert_called_once()
+
+    def test_keepalive_only_for_spotify(self, mock_hass):
+        """Test other players don't get a keepalive."""
+        controller = MediaController(mock_hass, "media_player.kitchen")
+        with patch(
+            "custom_components.soundbeatsv2.media_controller.async_track_time_interval"
+        ) as mock_track:
+            controller.start_keepalive()
+
+        mock_track.assert_not_called()
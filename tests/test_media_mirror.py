@@ -0,0 +1,99 @@
+"""Tests for media_mirror.py"""
+import pytest
+from unittest.mock import MagicMock, patch
+
+from custom_components.soundbeatsv2.const import EVENT_MEDIA_UPDATE
+from custom_components.soundbeatsv2.media_mirror import MediaMirror
+
+
+def _state(state="idle", **attributes):
+    """Create a mock media player state."""
+    mock_state = MagicMock()
+    mock_state.state = state
+    mock_state.attributes = {
+        "volume_level": 0.5,
+        "source": "Living Room",
+        "source_list": ["Living Room"],
+        "media_title": "Test Song",
+        **attributes,
+    }
+    return mock_state
+
+
+def _event(new_state):
+    """Create a mock state change event."""
+    event = MagicMock()
+    event.data = {"entity_id": "media_player.test", "new_state": new_state}
+    return event
+
+
+@pytest.fixture
+def mock_hass():
+    """Mock Home Assistant instance."""
+    hass = MagicMock()
+    hass.states.get.return_value = _state()
+    return hass
+
+
+@pytest.fixture
+def mirror(mock_hass):
+    """Create a started MediaMirror."""
+    with patch(
+        "custom_components.soundbeatsv2.media_mirror.async_track_state_change_event"
+    ) as mock_track:
+        mirror = MediaMirror(mock_hass, "media_player.test")
+        mirror.async_start()
+    mirror.unsub = mock_track.return_value
+    return mirror
+
+
+class TestMediaMirror:
+    """Test MediaMirror class."""
+
+    def test_initial_snapshot(self, mirror, mock_hass):
+        """Test starting takes a versioned snapshot."""
+        assert mirror.version == 1
+        assert mirror.snapshot["state"] == "idle"
+        assert mirror.snapshot["volume_level"] == 0.5
+        mock_hass.states.get.reset_mock()
+
+        mirror.snapshot
+
+        mock_hass.states.get.assert_not_called()
+
+    def test_change_pushes_delta(self, mirror, mock_hass):
+        """Test a relevant change bumps the version and fires only the changes."""
+        mirror._async_state_changed(_event(_state("playing", volume_level=0.7)))
+
+        assert mirror.version == 2
+        assert mirror.snapshot["is_playing"]
+        mock_hass.bus.async_fire.assert_called_once_with(EVENT_MEDIA_UPDATE, {
+            "entity_id": "media_player.test",
+            "version": 2,
+            "changes": {"state": "playing", "is_playing": True, "volume_level": 0.7},
+        })
+
+    def test_irrelevant_change_ignored(self, mirror, mock_hass):
+        """Test attribute updates outside the snapshot don't push anything."""
+        snapshot = mirror.snapshot
+
+        mirror._async_state_changed(_event(_state(media_position=42)))
+
+        assert mirror.snapshot is snapshot
+        mock_hass.bus.async_fire.assert_not_called()
+
+    def test_removed_entity(self, mirror, mock_hass):
+        """Test removing the entity reports it as unavailable."""
+        mirror._async_state_changed(_event(None))
+
+        changes = mock_hass.bus.async_fire.call_args[0][1]["changes"]
+        assert changes["available"] is False
+        assert changes["error"] == "Entity not found"
+        assert changes["state"] is None
+
+    def test_stop_unsubscribes(self, mirror):
+        """Test stopping removes the state listener."""
+        mirror.async_stop()
+        mirror.async_stop()
+
+        mirror.unsub.assert_called_once()
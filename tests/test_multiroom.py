@@ -0,0 +1,156 @@
+"""Tests for multiroom.py"""
+import asyncio
+from datetime import timedelta
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.soundbeatsv2.media_controller import PlaybackResult
+from custom_components.soundbeatsv2.multiroom import MediaGroup, media_player_ids
+
+
+@pytest.fixture
+def mock_hass():
+    """Mock Home Assistant instance running background tasks on the loop."""
+    hass = MagicMock()
+    hass.async_create_background_task = (
+        lambda target, name: asyncio.create_task(target)
+    )
+    return hass
+
+
+def _controller(entity_id, median=None, result=None):
+    """Create a mock controller with an optional calibrated play latency."""
+    controller = MagicMock()
+    controller.media_player_entity_id = entity_id
+    controller.latency_profile = (
+        {"play": {"min": median, "median": median, "p90": median, "max": median}}
+        if median is not None else None
+    )
+    controller.play_snippet = AsyncMock(
+        return_value=result or PlaybackResult(success=True, started_at=dt_util.utcnow())
+    )
+    controller.stop_playback = AsyncMock(return_value=PlaybackResult(success=True))
+    controller.async_shutdown = AsyncMock()
+    return controller
+
+
+class TestMediaPlayerIds:
+    """Test reading the configured media players."""
+
+    def test_single_entity(self):
+        """Test entries from before multi-room hold one entity ID."""
+        assert media_player_ids("media_player.kitchen") == ["media_player.kitchen"]
+
+    def test_list_deduplicated(self):
+        """Test a list keeps its order without duplicates."""
+        assert media_player_ids(["media_player.a", "media_player.b", "media_player.a"]) == [
+            "media_player.a", "media_player.b",
+        ]
+
+    def test_none(self):
+        """Test no media player configured."""
+        assert media_player_ids(None) == []
+        assert media_player_ids("") == []
+
+
+class TestMediaGroup:
+    """Test playing snippets across several players."""
+
+    @pytest.mark.asyncio
+    async def test_faster_players_held_back(self, mock_hass):
+        """Test each player is delayed by how much faster it is than the slowest."""
+        slow = _controller("media_player.slow", median=1.5)
+        fast = _controller("media_player.fast", median=0.5)
+        unknown = _controller("media_player.unknown")
+        group = MediaGroup(mock_hass, [slow, fast, unknown])
+        delays = {}
+
+        async def _play_member(controller, delay, generation, **kwargs):
+            delays[controller.media_player_entity_id] = delay
+            return PlaybackResult(success=True)
+
+        group._async_play_member = _play_member
+
+        result = await group.play_snippet("track", duration=30)
+        await group._skew_task
+
+        assert result.success
+        assert delays == {
+            "media_player.slow": 0.0,
+            "media_player.fast": 1.0,
+            "media_player.unknown": 1.5,
+        }
+
+    @pytest.mark.asyncio
+    async def test_slow_player_does_not_block(self, mock_hass):
+        """Test the group returns once the first player plays."""
+        started_at = dt_util.utcnow()
+        first = _controller(
+            "media_player.first", result=PlaybackResult(success=True, started_at=started_at)
+        )
+        stuck = _controller("media_player.stuck")
+        release = asyncio.Event()
+
+        async def _play(**kwargs):
+            await release.wait()
+            return PlaybackResult(success=True, started_at=started_at + timedelta(seconds=0.4))
+
+        stuck.play_snippet = _play
+        group = MediaGroup(mock_hass, [first, stuck])
+
+        result = await asyncio.wait_for(group.play_snippet("track"), 1)
+
+        assert result.started_at == started_at
+        assert not group._skew_task.done()
+
+        release.set()
+        await group._skew_task
+        assert group.last_skew == {"media_player.first": 0.0, "media_player.stuck": 0.4}
+        assert group.expected_latency(stuck) == pytest.approx(0.4, abs=0.05)
+
+    @pytest.mark.asyncio
+    async def test_all_players_failing(self, mock_hass):
+        """Test a snippet fails only when no player started."""
+        group = MediaGroup(mock_hass, [
+            _controller("media_player.a", result=PlaybackResult(success=False, error="off")),
+            _controller("media_player.b", result=PlaybackResult(success=False, error="gone")),
+        ])
+
+        result = await group.play_snippet("track")
+
+        assert result.success is False
+        assert set(result.error.split("; ")) == {"off", "gone"}
+
+    @pytest.mark.asyncio
+    async def test_stop_skips_held_back_players(self, mock_hass):
+        """Test a player still held back doesn't start once the group is stopped."""
+        fast = _controller("media_player.fast", median=0.0)
+        slow = _controller("media_player.slow", median=0.05)
+        group = MediaGroup(mock_hass, [slow, fast])
+
+        await group.play_snippet("track")
+        await group.stop_playback()
+        await group._skew_task
+
+        slow.play_snippet.assert_awaited_once()
+        fast.play_snippet.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_commands_fan_out(self, mock_hass):
+        """Test other commands go to every player and report any failure."""
+        a = _controller("media_player.a")
+        b = _controller("media_player.b")
+        b.stop_playback.return_value = PlaybackResult(success=False, error="Stop failed")
+        group = MediaGroup(mock_hass, [a, b])
+
+        result = await group.stop_playback()
+        await group.async_shutdown()
+
+        a.stop_playback.assert_awaited_once()
+        assert result.success is False
+        assert result.error == "Stop failed"
+        a.async_shutdown.assert_awaited_once()
+        b.async_shutdown.assert_awaited_once()
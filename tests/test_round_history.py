@@ -0,0 +1,60 @@
+"""Tests for round_history.py"""
+import pytest
+
+from custom_components.soundbeatsv2.game_manager import GameRound
+from custom_components.soundbeatsv2.round_history import RoundHistory
+
+
+TEAM_IDS = ["team_0", "team_1"]
+
+
+@pytest.fixture
+def history():
+    """Create a history with two teams and three rounds."""
+    rounds = []
+    for number, (year, results) in enumerate([
+        (1985, [(1985, True, 20), (1980, False, 2)]),
+        (1991, [(1990, False, 5), (0, False, 0)]),
+        (1987, [(1987, False, 10), (1987, True, 20)]),
+    ], start=1):
+        round_data = GameRound.for_teams(2, round_number=number, song_id=number, actual_year=year)
+        for ordinal, (guess, has_bet, score) in enumerate(results):
+            if guess:
+                round_data.record(ordinal, guess, has_bet, score)
+        rounds.append(round_data)
+    return RoundHistory.from_rounds(2, rounds)
+
+
+class TestRoundHistory:
+    """Test RoundHistory class."""
+
+    def test_columns(self, history):
+        """Test rounds are stored column by column."""
+        assert len(history) == 3
+        assert list(history.actual_year) == [1985, 1991, 1987]
+        assert list(history.team_column(history.scores, 1)) == [2, 0, 20]
+
+    def test_accuracy_ignores_unanswered_rounds(self, history):
+        """Test accuracy only counts rounds the team answered."""
+        assert history.accuracy() == [pytest.approx(2 / 3), 0.5]
+
+    def test_mean_abs_error(self, history):
+        """Test mean absolute year error."""
+        assert history.mean_abs_error() == [pytest.approx(1 / 3), 2.5]
+
+    def test_bet_success_rate(self, history):
+        """Test bet success rate."""
+        assert history.bet_success_rate() == [1.0, 1.0]
+
+    def test_decade_performance(self, history):
+        """Test statistics grouped by decade."""
+        decades = history.decade_performance()
+
+        assert list(decades) == [1980, 1990]
+        assert decades[1980]["rounds"] == 2
+        assert decades[1980]["teams"][0]["average_score"] == 15
+        assert decades[1990]["teams"][1]["mean_abs_error"] is None
+
+    def test_summary_empty(self):
+        """Test summary of an empty history."""
+        assert RoundHistory(2).summary(TEAM_IDS)["teams"]["team_0"]["accuracy"] is None
@@ -0,0 +1,67 @@
+"""Tests for scoring.py"""
+from array import array
+
+import pytest
+
+from custom_components.soundbeatsv2.const import (
+    POINTS_EXACT_WITH_BET,
+    POINTS_EXACT_YEAR,
+    POINTS_WITHIN_3_YEARS,
+    POINTS_WITHIN_5_YEARS,
+    POINTS_WRONG_WITH_BET,
+)
+from custom_components.soundbeatsv2.scoring import ScoringEngine, ScoringRules
+
+
+@pytest.fixture
+def engine():
+    """Create a ScoringEngine with the default rules."""
+    return ScoringEngine()
+
+
+class TestScoringEngine:
+    """Test ScoringEngine class."""
+
+    @pytest.mark.parametrize("guess,has_bet,expected", [
+        (1985, False, POINTS_EXACT_YEAR),
+        (1983, False, POINTS_WITHIN_3_YEARS),
+        (1988, False, POINTS_WITHIN_3_YEARS),
+        (1980, False, POINTS_WITHIN_5_YEARS),
+        (1979, False, 0),
+        (1950, False, 0),
+        (1985, True, POINTS_EXACT_WITH_BET),
+        (1986, True, POINTS_WRONG_WITH_BET),
+    ])
+    def test_score(self, engine, guess, has_bet, expected):
+        """Test single guesses against the rule bands."""
+        assert engine.score(guess, 1985, has_bet) == expected
+
+    def test_score_round(self, engine):
+        """Test all teams are scored in one pass, skipping non-answers."""
+        scores = engine.score_round(
+            array("H", [1985, 0, 1983, 1985]),
+            array("B", [0, 0, 0, 1]),
+            1985,
+        )
+        assert list(scores) == [
+            POINTS_EXACT_YEAR, 0, POINTS_WITHIN_3_YEARS, POINTS_EXACT_WITH_BET
+        ]
+
+    def test_custom_rules(self):
+        """Test the table is compiled from the given rules."""
+        engine = ScoringEngine(ScoringRules(exact_year=3, within_5_years=1, wrong_with_bet=-5))
+        assert engine.score(2000, 2000, False) == 3
+        assert engine.score(2004, 2000, False) == 1
+        assert engine.score(2001, 2000, True) == -5
+
+    def test_rules_from_options(self):
+        """Test named and custom profiles are read from options."""
+        assert ScoringRules.from_options({}) == ScoringRules()
+        assert ScoringRules.from_options({"scoring_profile": "strict"}).wrong_with_bet == -10
+
+        custom = ScoringRules.from_options({
+            "scoring_profile": "custom",
+            "points_exact_year": 12.0,
+        })
+        assert custom.exact_year == 12
+        assert custom.within_3_years == POINTS_WITHIN_3_YEARS
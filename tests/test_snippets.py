@@ -0,0 +1,261 @@
+"""Tests for snippets.py"""
+import asyncio
+import math
+import os
+import struct
+import wave
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from custom_components.soundbeatsv2.const import DOMAIN, URL_SNIPPETS
+from custom_components.soundbeatsv2.snippets import SnippetStore
+from custom_components.soundbeatsv2.views import SoundbeatsSnippetView
+
+
+def sine_wav(path, seconds=0.5, frequency=440, rate=8000):
+    """Write a mono 16-bit sine wave and return its size in bytes."""
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(b"".join(
+            struct.pack("<h", int(32767 * math.sin(2 * math.pi * frequency * i / rate)))
+            for i in range(int(seconds * rate))
+        ))
+    return os.path.getsize(path)
+
+
+@pytest.fixture
+def mock_hass(tmp_path):
+    """Mock Home Assistant instance with its config directory in tmp_path."""
+    hass = MagicMock()
+    hass.data = {}
+    hass.config.path = lambda *parts: str(tmp_path.joinpath(*parts))
+    hass.config.internal_url = "http://homeassistant.local:8123"
+
+    def _executor(func, *args):
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(func(*args))
+        return future
+
+    hass.async_add_executor_job = _executor
+    return hass
+
+
+@pytest.fixture
+def snippet_dir(tmp_path):
+    """Create the entry's snippet directory."""
+    path = tmp_path / DOMAIN / "snippets" / "entry"
+    path.mkdir(parents=True)
+    return path
+
+
+def snippet(snippet_dir, name, mtime, seconds=0.5):
+    """Write a sine wave snippet last played at mtime."""
+    size = sine_wav(snippet_dir / name, seconds)
+    os.utime(snippet_dir / name, (mtime, mtime))
+    return size
+
+
+class TestSnippetStore:
+    """Test storing snippets."""
+
+    @pytest.mark.asyncio
+    async def test_setup_indexes_snippets(self, mock_hass, snippet_dir):
+        """Test that snippets on disk are indexed and other files ignored."""
+        size = snippet(snippet_dir, "1.wav", 1000)
+        snippet(snippet_dir, "2.wav", 2000)
+        (snippet_dir / "notes.txt").write_text("not audio")
+
+        store = SnippetStore(mock_hass, "entry", 10 * size)
+        await store.async_setup()
+
+        assert 1 in store
+        assert "2" in store
+        assert "notes" not in store
+        assert store.size == 2 * size
+
+    @pytest.mark.asyncio
+    async def test_setup_creates_directory(self, mock_hass, tmp_path):
+        """Test that a missing snippet directory is created."""
+        store = SnippetStore(mock_hass, "entry", 1024)
+        await store.async_setup()
+
+        assert (tmp_path / DOMAIN / "snippets" / "entry").is_dir()
+        assert store.size == 0
+
+    @pytest.mark.asyncio
+    async def test_setup_keeps_newest_file_per_song(self, mock_hass, snippet_dir):
+        """Test that a file shadowed by a newer one for the same song is deleted."""
+        snippet(snippet_dir, "1.mp3", 1000)
+        size = snippet(snippet_dir, "1.wav", 2000)
+
+        store = SnippetStore(mock_hass, "entry", 10 * size)
+        await store.async_setup()
+
+        assert store.path("1.wav") == str(snippet_dir / "1.wav")
+        assert store.path("1.mp3") is None
+        assert not (snippet_dir / "1.mp3").exists()
+        assert store.size == size
+
+    @pytest.mark.asyncio
+    async def test_entries_keep_separate_snippets(self, mock_hass, snippet_dir):
+        """Test that each entry indexes only its own directory."""
+        snippet(snippet_dir, "1.wav", 1000)
+
+        store = SnippetStore(mock_hass, "other", 1024 * 1024)
+        await store.async_setup()
+
+        assert "1" not in store
+        assert (snippet_dir / "1.wav").exists()
+
+    @pytest.mark.asyncio
+    async def test_setup_evicts_least_recently_played(self, mock_hass, snippet_dir):
+        """Test that the oldest snippets go once over the size limit."""
+        size = snippet(snippet_dir, "1.wav", 3000)
+        snippet(snippet_dir, "2.wav", 1000)
+        snippet(snippet_dir, "3.wav", 2000)
+
+        store = SnippetStore(mock_hass, "entry", 2 * size)
+        await store.async_setup()
+
+        assert "2" not in store
+        assert not (snippet_dir / "2.wav").exists()
+        assert "1" in store and "3" in store
+
+    @pytest.mark.asyncio
+    async def test_played_snippet_is_kept(self, mock_hass, snippet_dir, tmp_path):
+        """Test that playing a snippet protects it from eviction."""
+        size = snippet(snippet_dir, "1.wav", 1000)
+        snippet(snippet_dir, "2.wav", 2000)
+        store = SnippetStore(mock_hass, "entry", 2 * size)
+        await store.async_setup()
+
+        assert store.url(1) is not None
+        sine_wav(tmp_path / "3.wav")
+        await store.async_add(3, (tmp_path / "3.wav").read_bytes(), ".wav")
+
+        assert "1" in store and "3" in store
+        assert "2" not in store
+        assert not (snippet_dir / "2.wav").exists()
+        assert os.path.getmtime(snippet_dir / "1.wav") > 2000
+
+    @pytest.mark.asyncio
+    async def test_close_waits_for_played_snippets(self, mock_hass, snippet_dir):
+        """Test that closing waits until played snippets are touched on disk."""
+        snippet(snippet_dir, "1.wav", 1000)
+        store = SnippetStore(mock_hass, "entry", 1024 * 1024)
+        await store.async_setup()
+        touched = asyncio.get_running_loop().create_future()
+        mock_hass.async_add_executor_job = lambda func, *args: touched
+
+        store.url(1)
+        close = asyncio.create_task(store.async_close())
+        await asyncio.sleep(0)
+        assert not close.done()
+
+        touched.set_result(None)
+        await close
+        assert not store._touches
+
+    @pytest.mark.asyncio
+    async def test_add_replaces_previous_snippet(self, mock_hass, snippet_dir):
+        """Test that adding a snippet in another format replaces the old file."""
+        snippet(snippet_dir, "1.mp3", 1000)
+        store = SnippetStore(mock_hass, "entry", 1024 * 1024)
+        await store.async_setup()
+
+        await store.async_add(1, b"RIFF", ".wav")
+
+        assert (snippet_dir / "1.wav").read_bytes() == b"RIFF"
+        assert not (snippet_dir / "1.mp3").exists()
+        assert store.size == 4
+
+    @pytest.mark.asyncio
+    async def test_add_rejects_unknown_format(self, mock_hass, snippet_dir):
+        """Test that only audio formats are stored."""
+        store = SnippetStore(mock_hass, "entry", 1024)
+
+        with pytest.raises(ValueError):
+            await store.async_add(1, b"data", ".exe")
+
+    @pytest.mark.asyncio
+    async def test_url_is_signed_and_reused(self, mock_hass, snippet_dir):
+        """Test that snippet URLs are absolute, signed and stable."""
+        snippet(snippet_dir, "7.wav", 1000)
+        store = SnippetStore(mock_hass, "entry", 1024 * 1024)
+        await store.async_setup()
+
+        url = store.url(7)
+
+        assert url.startswith(f"http://homeassistant.local:8123{URL_SNIPPETS}/entry/7.wav")
+        assert "authSig=" in url
+        assert store.url("7") == url
+        assert store.url(8) is None
+
+    @pytest.mark.asyncio
+    async def test_url_without_base_url(self, mock_hass, snippet_dir):
+        """Test that no URL is handed out when Home Assistant has none."""
+        from homeassistant.helpers.network import NoURLAvailableError
+
+        snippet(snippet_dir, "7.wav", 1000)
+        store = SnippetStore(mock_hass, "entry", 1024 * 1024)
+        await store.async_setup()
+
+        with patch(
+            "custom_components.soundbeatsv2.snippets.get_url",
+            side_effect=NoURLAvailableError,
+        ):
+            assert store.url(7) is None
+
+    @pytest.mark.asyncio
+    async def test_path_only_serves_stored_snippets(self, mock_hass, snippet_dir):
+        """Test that only indexed file names resolve to a path."""
+        snippet(snippet_dir, "7.wav", 1000)
+        store = SnippetStore(mock_hass, "entry", 1024 * 1024)
+        await store.async_setup()
+
+        assert store.path("7.wav") == str(snippet_dir / "7.wav")
+        assert store.path("7.mp3") is None
+        assert store.path("../7.wav") is None
+        assert store.path("8.wav") is None
+
+
+class TestSnippetView:
+    """Test serving snippets over HTTP."""
+
+    @pytest.mark.asyncio
+    async def test_serves_snippet(self, mock_hass, snippet_dir):
+        """Test that a stored snippet is served as a file response."""
+        snippet(snippet_dir, "7.wav", 1000)
+        store = SnippetStore(mock_hass, "entry", 1024 * 1024)
+        await store.async_setup()
+        mock_hass.data[DOMAIN] = {"entry": {"snippet_store": store}}
+        request = MagicMock()
+        request.app = {"hass": mock_hass}
+
+        with patch(
+            "custom_components.soundbeatsv2.views.web.FileResponse"
+        ) as file_response:
+            response = await SoundbeatsSnippetView().get(request, "entry", "7.wav")
+
+        file_response.assert_called_once_with(str(snippet_dir / "7.wav"))
+        assert response is file_response.return_value
+
+    @pytest.mark.asyncio
+    async def test_unknown_snippet(self, mock_hass, snippet_dir):
+        """Test that unknown snippets and entries are not found."""
+        store = SnippetStore(mock_hass, "entry", 1024 * 1024)
+        await store.async_setup()
+        mock_hass.data[DOMAIN] = {
+            "entry": {"snippet_store": store},
+            "other": {"snippet_store": None},
+        }
+        request = MagicMock()
+        request.app = {"hass": mock_hass}
+        view = SoundbeatsSnippetView()
+
+        assert (await view.get(request, "entry", "7.wav")).status == 404
+        assert (await view.get(request, "other", "7.wav")).status == 404
+        assert (await view.get(request, "missing", "7.wav")).status == 404
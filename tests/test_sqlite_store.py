@@ -0,0 +1,275 @@
+"""Tests for sqlite_store.py"""
+import sqlite3
+
+import pytest
+from unittest.mock import MagicMock
+
+from custom_components.soundbeatsv2.sqlite_store import SQLiteStore
+
+
+def _entry(team_name, score, rounds, game_id="game1", date="2025-01-01T20:00:00"):
+    """Create a stored highscore entry dict."""
+    return {
+        "team_name": team_name,
+        "score_per_round": score,
+        "rounds_played": rounds,
+        "date": date,
+        "playlist_id": "80s",
+        "game_id": game_id,
+        "timer_seconds": 30,
+        "team_count": 2,
+    }
+
+
+def _round(number, scores):
+    """Create a stored round dict."""
+    return {
+        "round_number": number,
+        "song_id": number,
+        "actual_year": 1985,
+        "timestamp": "2025-01-01T20:00:00",
+        "team_guesses": {team_id: 1985 for team_id in scores},
+        "team_bets": {team_id: False for team_id in scores},
+        "team_scores": scores,
+    }
+
+
+@pytest.fixture
+def mock_hass():
+    """Mock Home Assistant instance running executor jobs inline."""
+    hass = MagicMock()
+
+    async def run_inline(func, *args):
+        return func(*args)
+
+    hass.async_add_executor_job = run_inline
+    return hass
+
+
+@pytest.fixture
+async def store(mock_hass, tmp_path):
+    """Create an open SQLiteStore."""
+    mock_hass.config.path = lambda *parts: str(tmp_path.joinpath(*parts))
+    (tmp_path / ".storage").mkdir()
+    store = SQLiteStore(mock_hass, "soundbeatsv2.test_entry")
+    await store.async_setup()
+    yield store
+    await store.async_close()
+
+
+@pytest.fixture
+def game_state():
+    """Create a stored game state dict."""
+    return {
+        "game_id": "game1",
+        "teams": [{"id": "team_0", "name": "Team A", "score": 10, "current_guess": None,
+                   "has_bet": False, "assigned_user": None}],
+        "current_round": 1,
+        "rounds_played": [_round(1, {"team_0": 10})],
+        "playlist_id": "80s",
+        "played_song_ids": [1],
+        "timer_seconds": 30,
+        "is_active": True,
+        "created_at": "2025-01-01T19:55:00",
+    }
+
+
+class TestSQLiteStore:
+    """Test SQLiteStore class."""
+
+    @pytest.mark.asyncio
+    async def test_uses_wal_mode(self, store):
+        """Test the database runs in WAL mode."""
+        assert store._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    @pytest.mark.asyncio
+    async def test_snapshot_round_trip(self, store, game_state):
+        """Test a saved snapshot loads back in the JSON layout."""
+        assert await store.async_is_empty()
+
+        await store.async_save_snapshot(game_state, {
+            "all_time_best": _entry("Team A", 10.0, 1),
+            "by_round": {"1": [_entry("Team A", 10.0, 1)]},
+        })
+        state, highscores = await store.async_load_snapshot()
+
+        assert state == game_state
+        assert highscores["all_time_best"]["team_name"] == "Team A"
+        assert [entry["team_name"] for entry in highscores["by_round"]["1"]] == ["Team A"]
+        assert not await store.async_is_empty()
+
+    @pytest.mark.asyncio
+    async def test_append_round(self, store, game_state):
+        """Test rounds and highscore entries are appended."""
+        await store.async_save_snapshot(game_state)
+        await store.async_append_round("game1", _round(2, {"team_0": 5}), [
+            _entry("Team A", 7.5, 2),
+        ])
+
+        state, highscores = await store.async_load_snapshot()
+
+        assert [r["round_number"] for r in state["rounds_played"]] == [1, 2]
+        assert highscores["by_round"]["2"][0]["score_per_round"] == 7.5
+
+    @pytest.mark.asyncio
+    async def test_highscores_keep_top_entries_per_round(self, store, game_state):
+        """Test only the best ten entries per round count are loaded."""
+        await store.async_save_snapshot(game_state)
+        await store.async_append_round("game1", _round(1, {"team_0": 10}), [
+            _entry(f"Team {score}", float(score), 1) for score in range(15)
+        ])
+
+        _, highscores = await store.async_load_snapshot()
+
+        scores = [entry["score_per_round"] for entry in highscores["by_round"]["1"]]
+        assert scores == [float(score) for score in range(14, 4, -1)]
+        assert highscores["all_time_best"]["score_per_round"] == 14.0
+
+    @pytest.mark.asyncio
+    async def test_replace_game_keeps_current_game(self, store, game_state):
+        """Test rewriting a past game leaves the current game alone."""
+        await store.async_save_snapshot(game_state)
+        await store.async_append_round("game1", _round(1, {"team_0": 10}), [
+            _entry("Team A", 10.0, 1),
+        ])
+        past = {**game_state, "game_id": "game0", "rounds_played": [_round(1, {"team_0": 4})]}
+
+        await store.async_replace_game(past, [_entry("Team A", 4.0, 1, game_id="game0")])
+        await store.async_replace_game(
+            {**past, "rounds_played": [_round(1, {"team_0": 8})]},
+            [_entry("Team A", 8.0, 1, game_id="game0")],
+        )
+
+        state, highscores = await store.async_load_snapshot()
+        assert state["game_id"] == "game1"
+        games = {game["game_id"]: game for game in await store.async_query_history()}
+        assert games["game0"]["rounds_played"][0]["team_scores"] == {"team_0": 8}
+        assert [entry["score_per_round"] for entry in highscores["by_round"]["1"]] == [10.0, 8.0]
+
+    @pytest.mark.asyncio
+    async def test_replace_game_drops_entries_with_other_keys(self, store, game_state):
+        """Test re-scored entries replace ones saved at another time or team name."""
+        await store.async_save_snapshot(game_state)
+        await store.async_append_round("game1", _round(1, {"team_0": 5}), [
+            _entry("A", 5.0, 1, date="2025-01-01T20:00:00.000300"),
+        ])
+
+        await store.async_replace_game(
+            {**game_state, "rounds_played": [_round(1, {"team_0": 8})]},
+            [_entry("B", 8.0, 1)],
+        )
+
+        rows = store._conn.execute(
+            "SELECT team_name, score_per_round FROM highscores"
+        ).fetchall()
+        assert [tuple(row) for row in rows] == [("B", 8.0)]
+
+    @pytest.mark.asyncio
+    async def test_legacy_entries_stored_once(self, store):
+        """Test entries without a game ID are not repeated per table."""
+        legacy = _entry("Legacy", 9.0, 1, game_id=None)
+        highscores = {
+            "all_time_best": legacy,
+            "by_round": {"1": [legacy]},
+            "leaderboard": [legacy],
+        }
+
+        await store.async_save_snapshot(None, highscores)
+        await store.async_save_snapshot(None, highscores)
+
+        assert store._conn.execute("SELECT COUNT(*) FROM highscores").fetchone()[0] == 1
+
+    @pytest.mark.asyncio
+    async def test_snapshot_upserts_highscores(self, store, game_state):
+        """Test rewriting highscores updates scores and keeps other entries."""
+        await store.async_save_snapshot(game_state)
+        await store.async_append_round("game1", _round(1, {"team_0": 10}), [
+            _entry(f"Team {score}", float(score), 1) for score in range(15)
+        ])
+
+        await store.async_save_snapshot(None, {
+            "by_round": {"1": [_entry("Team 0", 20.0, 1)]},
+        })
+
+        rows = store._conn.execute(
+            "SELECT team_name, score_per_round FROM highscores ORDER BY id"
+        ).fetchall()
+        assert len(rows) == 15
+        assert tuple(rows[0]) == ("Team 0", 20.0)
+
+    @pytest.mark.asyncio
+    async def test_migration_drops_duplicate_legacy_entries(self, mock_hass, tmp_path):
+        """Test databases written before the entry index are deduplicated."""
+        mock_hass.config.path = lambda *parts: str(tmp_path.joinpath(*parts))
+        conn = sqlite3.connect(tmp_path / "old.db")
+        conn.executescript("""
+            CREATE TABLE highscores (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                game_id TEXT,
+                team_name TEXT NOT NULL,
+                score_per_round REAL NOT NULL,
+                rounds_played INTEGER NOT NULL,
+                date TEXT NOT NULL,
+                playlist_id TEXT NOT NULL,
+                timer_seconds INTEGER,
+                team_count INTEGER,
+                UNIQUE (game_id, team_name, rounds_played, date)
+            );
+        """)
+        conn.executemany(
+            "INSERT INTO highscores (game_id, team_name, score_per_round, "
+            "rounds_played, date, playlist_id) VALUES (?, ?, ?, ?, ?, ?)",
+            [(None, "Legacy", 9.0, 1, "2024-01-01T20:00:00", "default")] * 3,
+        )
+        conn.commit()
+        conn.close()
+        store = SQLiteStore(mock_hass, "old")
+        store.path = str(tmp_path / "old.db")
+
+        await store.async_setup()
+        _, highscores = await store.async_load_snapshot()
+        await store.async_close()
+
+        assert len(highscores["by_round"]["1"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_query_history(self, store, game_state):
+        """Test games can be filtered by playlist, team name and date."""
+        await store.async_save_snapshot(game_state, {
+            "by_round": {"1": [_entry("Team A", 10.0, 1)]},
+        })
+
+        assert len(await store.async_query_history(playlist_id="80s")) == 1
+        assert await store.async_query_history(playlist_id="rock") == []
+        assert len(await store.async_query_history(team_name="Team A")) == 1
+        assert await store.async_query_history(since="2025-02-01") == []
+
+    @pytest.mark.asyncio
+    async def test_query_history_pages(self, store, game_state):
+        """Test games are paged newest first by creation time and game ID."""
+        for number, created_at in enumerate((
+            "2025-01-01T20:00:00+01:00",
+            "2025-01-01T19:30:00+00:00",
+            "2025-01-01T19:30:00+00:00",
+        )):
+            await store.async_save_snapshot({
+                **game_state, "game_id": f"game{number}", "created_at": created_at,
+            })
+
+        first = await store.async_query_history(limit=2)
+        rest = await store.async_query_history(
+            limit=2, after=(first[-1]["created_at"], first[-1]["game_id"])
+        )
+
+        assert [game["game_id"] for game in first] == ["game2", "game1"]
+        assert [game["game_id"] for game in rest] == ["game0"]
+
+    @pytest.mark.asyncio
+    async def test_query_history_compares_times_across_offsets(self, store, game_state):
+        """Test date filters compare moments, not strings."""
+        await store.async_save_snapshot(
+            {**game_state, "created_at": "2025-01-01T20:00:00+01:00"}
+        )
+
+        assert await store.async_query_history(since="2025-01-01T19:30:00+00:00") == []
+        assert len(await store.async_query_history(until="2025-01-01T19:30:00+00:00")) == 1
@@ -0,0 +1,247 @@
+"""Tests for storage.py"""
+import os
+import pytest
+from unittest.mock import MagicMock
+
+from custom_components.soundbeatsv2 import storage
+from custom_components.soundbeatsv2.benchmark import async_benchmark_backend
+from custom_components.soundbeatsv2.storage import (
+    JournalBackend,
+    MemoryBackend,
+    StorageBackend,
+    _trim_highscores,
+    create_backend,
+    storage_backend,
+)
+from custom_components.soundbeatsv2.sqlite_store import SQLiteStore
+
+
+def _entry(team_name, score, rounds, timer_seconds=30):
+    """Create a stored highscore entry dict."""
+    return {
+        "team_name": team_name,
+        "score_per_round": score,
+        "rounds_played": rounds,
+        "date": "2025-01-01T20:00:00",
+        "playlist_id": "80s",
+        "game_id": "game1",
+        "timer_seconds": timer_seconds,
+        "team_count": 2,
+    }
+
+
+def _round(number, score):
+    """Create a stored round dict."""
+    return {
+        "round_number": number,
+        "song_id": number,
+        "actual_year": 1985,
+        "timestamp": "2025-01-01T20:00:00",
+        "team_guesses": {"team_0": 1985},
+        "team_bets": {"team_0": False},
+        "team_scores": {"team_0": score},
+    }
+
+
+def _state(game_id="game1", rounds=1, score=10):
+    """Create a stored game state dict."""
+    return {
+        "game_id": game_id,
+        "teams": [{"id": "team_0", "name": "Team A", "score": score, "current_guess": None,
+                   "has_bet": False, "assigned_user": None}],
+        "current_round": rounds,
+        "rounds_played": [_round(number, 10) for number in range(1, rounds + 1)],
+        "playlist_id": "80s",
+        "played_song_ids": list(range(1, rounds + 1)),
+        "timer_seconds": 30,
+        "is_active": True,
+        "created_at": "2025-01-01T19:55:00",
+    }
+
+
+@pytest.fixture
+def mock_hass(tmp_path):
+    """Mock Home Assistant instance with a temporary config directory."""
+    hass = MagicMock()
+    hass.config.path = lambda *parts: str(tmp_path.joinpath(*parts))
+    (tmp_path / ".storage").mkdir()
+
+    async def run_inline(func, *args):
+        return func(*args)
+
+    hass.async_add_executor_job = run_inline
+    return hass
+
+
+class TestCreateBackend:
+    """Test create_backend function."""
+
+    def test_known_kinds(self, mock_hass):
+        """Test every backend kind maps to its class."""
+        assert isinstance(create_backend(mock_hass, "memory", "key"), MemoryBackend)
+        assert isinstance(create_backend(mock_hass, "journal", "key"), JournalBackend)
+        assert isinstance(create_backend(mock_hass, "sqlite", "key"), SQLiteStore)
+
+    def test_base_class_is_abstract(self, mock_hass):
+        """Test backends must implement loading and saving snapshots."""
+        with pytest.raises(TypeError):
+            StorageBackend(mock_hass, "key")
+
+
+class TestStorageBackendOption:
+    """Test storage_backend function."""
+
+    def test_configured_backend(self):
+        """Test the configured persistent backend is used."""
+        assert storage_backend({"storage_backend": "sqlite"}) == "sqlite"
+        assert storage_backend({}) == "json"
+
+    def test_memory_backend_not_used_for_entries(self):
+        """Test entries set to the memory backend keep their history on disk."""
+        assert storage_backend({"storage_backend": "memory"}) == "json"
+
+
+class TestMemoryBackend:
+    """Test MemoryBackend class."""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_is_copied(self, mock_hass):
+        """Test callers cannot mutate the stored snapshot."""
+        backend = MemoryBackend(mock_hass, "key")
+        assert await backend.async_is_empty()
+
+        state = _state()
+        await backend.async_save_snapshot(state, {"by_round": {}})
+        state["playlist_id"] = "changed"
+        loaded, _ = await backend.async_load_snapshot()
+        loaded["teams"].clear()
+
+        reloaded, highscores = await backend.async_load_snapshot()
+        assert reloaded["playlist_id"] == "80s"
+        assert len(reloaded["teams"]) == 1
+        assert highscores == {"by_round": {}}
+
+    @pytest.mark.asyncio
+    async def test_query_history_filters_current_game(self, mock_hass):
+        """Test the current game is matched against the filters."""
+        backend = MemoryBackend(mock_hass, "key")
+        await backend.async_save_snapshot(_state())
+
+        assert len(await backend.async_query_history(playlist_id="80s")) == 1
+        assert await backend.async_query_history(playlist_id="rock") == []
+        assert len(await backend.async_query_history(team_name="Team A")) == 1
+        assert await backend.async_query_history(team_name="Team B") == []
+        assert await backend.async_query_history(since="2025-02-01") == []
+
+
+class TestJournalBackend:
+    """Test JournalBackend class."""
+
+    @pytest.mark.asyncio
+    async def test_journal_is_replayed(self, mock_hass):
+        """Test rounds and games appended to the journal survive a reload."""
+        backend = JournalBackend(mock_hass, "key")
+        await backend.async_setup()
+        await backend.async_save_snapshot(_state(), None)
+        await backend.async_append_round("game1", _round(2, 5), [_entry("Team A", 7.5, 2)])
+        await backend.async_save_game(_state(rounds=2, score=15))
+
+        reloaded = JournalBackend(mock_hass, "key")
+        await reloaded.async_setup()
+        state, highscores = await reloaded.async_load_snapshot()
+
+        assert [r["round_number"] for r in state["rounds_played"]] == [1, 2]
+        assert state["teams"][0]["score"] == 15
+        assert highscores["by_round"]["2"][0]["score_per_round"] == 7.5
+        assert highscores["all_time_best"]["score_per_round"] == 7.5
+
+    @pytest.mark.asyncio
+    async def test_new_game_drops_previous_rounds(self, mock_hass):
+        """Test a game with another ID replaces the journaled rounds."""
+        backend = JournalBackend(mock_hass, "key")
+        await backend.async_setup()
+        await backend.async_save_snapshot(_state(rounds=3))
+        await backend.async_save_game(_state(game_id="game2", rounds=0))
+
+        state, _ = await backend.async_load_snapshot()
+
+        assert state["game_id"] == "game2"
+        assert state["rounds_played"] == []
+
+    @pytest.mark.asyncio
+    async def test_journal_is_compacted(self, mock_hass, monkeypatch):
+        """Test the journal is folded into the snapshot once it is long enough."""
+        monkeypatch.setattr(storage, "JOURNAL_COMPACT_RECORDS", 3)
+        backend = JournalBackend(mock_hass, "key")
+        await backend.async_setup()
+        await backend.async_save_snapshot(_state())
+        for number in range(2, 5):
+            await backend.async_append_round("game1", _round(number, 10), [])
+
+        assert not os.path.exists(backend.journal_path)
+
+        reloaded = JournalBackend(mock_hass, "key")
+        await reloaded.async_setup()
+        state, _ = await reloaded.async_load_snapshot()
+        assert len(state["rounds_played"]) == 4
+
+    @pytest.mark.asyncio
+    async def test_torn_record_is_skipped(self, mock_hass):
+        """Test a partially written last line does not break loading."""
+        backend = JournalBackend(mock_hass, "key")
+        await backend.async_setup()
+        await backend.async_save_snapshot(_state())
+        await backend.async_append_round("game1", _round(2, 5), [])
+        with open(backend.journal_path, "a", encoding="utf-8") as file:
+            file.write('{"game_id": "game1", "rou')
+
+        reloaded = JournalBackend(mock_hass, "key")
+        await reloaded.async_setup()
+        state, _ = await reloaded.async_load_snapshot()
+
+        assert len(state["rounds_played"]) == 2
+
+
+class TestTrimHighscores:
+    """Test _trim_highscores function."""
+
+    def test_tables_are_cut_to_size(self):
+        """Test per-round and leaderboard tables keep only the best entries."""
+        entries = [_entry(f"Team {score}", float(score), 1) for score in range(30)]
+        trimmed = _trim_highscores({
+            "all_time_best": entries[-1],
+            "by_round": {"1": entries},
+            "leaderboard": entries + [_entry("Slow", 1.0, 1, timer_seconds=120)],
+        })
+
+        assert [e["score_per_round"] for e in trimmed["by_round"]["1"]] == [
+            float(score) for score in range(29, 19, -1)
+        ]
+        assert len(trimmed["leaderboard"]) == 26
+        assert trimmed["all_time_best"]["score_per_round"] == 29.0
+
+
+class TestBenchmark:
+    """Test async_benchmark_backend function."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("kind", ["memory", "journal", "sqlite"])
+    async def test_benchmark_backend(self, mock_hass, kind):
+        """Test a benchmark run reports timings and cleans up after itself."""
+        updates = [
+            (_state(rounds=number), _round(number, 10), [_entry("Team A", 10.0, number)], None)
+            for number in range(3, 6)
+        ]
+
+        result = await async_benchmark_backend(
+            mock_hass, kind, "bench", _state(rounds=2), None, updates
+        )
+
+        assert result["backend"] == kind
+        assert result["rounds"] == 2
+        assert result["save_ms"] >= 0
+        assert result["load_ms"] >= 0
+        backend = create_backend(mock_hass, kind, "bench")
+        assert await backend.async_disk_usage() == 0
+        if kind != "memory":
+            assert result["disk_bytes"] > 0